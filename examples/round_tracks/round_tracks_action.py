@@ -23,13 +23,14 @@ import math
 import os
 import wx
 import time
-from copy import deepcopy
-from typing import Set
+from collections import defaultdict
 
 from kipy import KiCad
 from kipy.errors import ConnectionError
 from kipy.board_types import ArcTrack, Track, PadType, BoardLayer
+from kipy.connectivity import match_endpoints
 from kipy.geometry import Vector2
+from kipy.hittest import HitTester
 from kipy.util import from_mm
 
 from round_tracks_utils import (
@@ -37,7 +38,7 @@ from round_tracks_utils import (
     getTrackAngleDifference,
     reverseTrack,
     shortenTrack,
-    similarPoints,
+    tolerance,
     withinPad,
 )
 from ui.round_tracks_gui import RoundTracksDialog
@@ -135,10 +136,8 @@ class RoundTracks(RoundTracksDialog):
 
         commit = self.board.begin_commit()
 
-        self.allTracks = self.board.get_tracks()
-        self.allVias = self.board.get_vias()
-        self.allPads = self.board.get_pads()
         self.selected = self.board.get_selection()
+        self.hitTester = HitTester(self.board)
 
         avoid = self.avoid_junctions.IsChecked()
         classes = self.config["classes"]
@@ -164,6 +163,7 @@ class RoundTracks(RoundTracksDialog):
                         )
 
         self.board.push_commit(commit, "Round Tracks")
+        self.board.remove_edit_listener(self.hitTester)
 
         # if m_AutoRefillZones is set, we should skip here, but PCBNEW_SETTINGS is not exposed to swig
         # ZONE_FILLER has SetProgressReporter, but PROGRESS_REPORTER is also not available, so we can't use it
@@ -293,12 +293,26 @@ class RoundTracks(RoundTracksDialog):
         progressInterval = int(max(1, len(nets) / 100.0 ))
         lastReport = 0
 
+        # fetch only the items on this class's nets, and group them by net in a single pass
+        tracksByNet = defaultdict(list)
+        viasByNet = defaultdict(list)
+        padsByNet = defaultdict(list)
+        for t in self.board.get_tracks(net=nets):
+            tracksByNet[t.net.name].append(t)
+        for v in self.board.get_vias(net=nets):
+            viasByNet[v.net.name].append(v)
+        for p in self.board.get_pads(net=nets):
+            padsByNet[p.net.name].append(p)
+        # fetch the shapes of all these pads at once for the pad hit tests below
+        self.hitTester.prefetch_pads(p for pads in padsByNet.values() for p in pads)
+
         for net in nets:
-            tracksInNet = [t for t in self.allTracks if t.net == net]
-            viasInNet = [v for v in self.allVias if v.net == net]
+            tracksInNet = tracksByNet[net.name]
+            viasInNet = viasByNet[net.name]
 
             tracksPerLayer = {}
             viasPerLayer = {}
+
             # separate track by layer
             for t in tracksInNet:
                 layer = t.layer
@@ -324,8 +338,8 @@ class RoundTracks(RoundTracksDialog):
             FCuPadsInNet = []
             BCuPadsInNet = []
 
-            for p in self.allPads:
-                if p.net == net and (not onlySelection or p in self.selected):
+            for p in padsByNet[net.name]:
+                if not onlySelection or p in self.selected:
                     if p.pad_type in [PadType.PT_NPTH, PadType.PT_PTH]:
                         padsInNet.append(p)
                     else:
@@ -343,37 +357,24 @@ class RoundTracks(RoundTracksDialog):
                 else:
                     viaLocations = set()
 
-                # add all the possible intersections to a unique set, for iterating over later
-                intersections: Set[Vector2] = set()
-                for t1 in range(len(tracks)):
-                    for t2 in range(t1 + 1, len(tracks)):
-                        # check if these two tracks share an endpoint
-                        # reduce it to a 2-part tuple so there are not multiple objects of the same point in the set
-                        if (
-                            tracks[t1].start == tracks[t2].start
-                            or tracks[t1].end == tracks[t2].start
-                        ):
-                            intersections.add(deepcopy(tracks[t2].start))
-                        if (
-                            tracks[t1].start == tracks[t2].end
-                            or tracks[t1].end == tracks[t2].end
-                        ):
-                            intersections.add(deepcopy(tracks[t2].end))
+                # the points where two or more track ends meet on this layer, matched in one pass
+                # instead of comparing every pair of tracks
+                intersections = match_endpoints(tracks, tolerance)
 
                 # for each remaining intersection, shorten each track by the same amount, and place a track between.
                 trackLengths = {}
 
-                for ip in intersections:
+                for ip, endsHere in intersections:
                     (newX, newY) = (ip.x, ip.y)
                     tracksHere = []
-                    for t1 in tracks:
-                        if similarPoints(t1.start, ip):
-                            tracksHere.append(t1)
-                        elif similarPoints(t1.end, ip):
+                    for t1, _ in endsHere:
+                        # an earlier intersection may have flipped or shortened this track, so
+                        # check which of its ends is here now
+                        if (t1.end - ip).length() < (t1.start - ip).length():
                             # flip track such that all tracks start at the IP
                             reverseTrack(t1)
-                            tracksHere.append(t1)
                             tracksModified.append(t1)
+                        tracksHere.append(t1)
 
                     if len(tracksHere) == 0 or (
                         avoid_junctions and len(tracksHere) > 2
@@ -392,7 +393,7 @@ class RoundTracks(RoundTracksDialog):
 
                     # If the intersection is within a pad, but none of the tracks end within the pad, skip
                     for p in padsInNet:
-                        if withinPad(self.board, p, ip, tracksHere):
+                        if withinPad(self.hitTester, p, ip, tracksHere):
                             skip = True
                             break
 
@@ -401,12 +402,12 @@ class RoundTracks(RoundTracksDialog):
 
                     if layer == BoardLayer.BL_F_Cu:
                         for p in FCuPadsInNet:
-                            if withinPad(self.board, p, ip, tracksHere):
+                            if withinPad(self.hitTester, p, ip, tracksHere):
                                 skip = True
                                 break
                     elif layer == BoardLayer.BL_B_Cu:
                         for p in BCuPadsInNet:
-                            if withinPad(self.board, p, ip, tracksHere):
+                            if withinPad(self.hitTester, p, ip, tracksHere):
                                 skip = True
                                 break
 
@@ -5,6 +5,7 @@ from typing import Sequence, Union
 from kipy.geometry import Vector2
 from kipy.board import Board
 from kipy.board_types import Track, Arc, Pad
+from kipy.hittest import HitTester
 
 tolerance = 10  # in nanometres
 
@@ -15,15 +16,9 @@ def reverseTrack(track: Union[Track, Arc]):
     track.end = ep
 
 
-# determines whether 2 points are close enough to be considered identical
-def similarPoints(p1: Vector2, p2: Vector2):
-    return ((p1.x > p2.x - tolerance) and (p1.x < p2.x + tolerance)) and (
-        (p1.y > p2.y - tolerance) and (p1.y < p2.y + tolerance)
-    )
-
-
 # test if an intersection is within the bounds of a pad
-def withinPad(board: Board, pad: Pad, a: Vector2, tracks: Sequence[Track]):
+# (a HitTester answers locally; a Board asks KiCad for every test)
+def withinPad(board: Union[Board, HitTester], pad: Pad, a: Vector2, tracks: Sequence[Track]):
     if not board.hit_test(pad, a):
         return False
 
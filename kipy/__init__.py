@@ -18,6 +18,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from kipy.kicad import KiCad
+from kipy.kicad import AsyncKiCad, KiCad
 
-__all__ = ("KiCad",)
+__all__ = ("AsyncKiCad", "KiCad")
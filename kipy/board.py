@@ -18,9 +18,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from time import sleep
-from typing import List, Dict, Union, Iterable, Optional, Sequence, cast, overload
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import (
+    List, Dict, Union, Iterable, Iterator, Optional, Sequence, Set, Tuple, cast, overload
+)
+from google.protobuf.any_pb2 import Any as AnyProto
 from google.protobuf.empty_pb2 import Empty
+from google.protobuf.message import Message
 
 from kipy.board_types import (
     ArcTrack,
@@ -40,10 +47,12 @@ from kipy.board_types import (
     to_concrete_dimension,
     unwrap
 )
-from kipy.client import ApiError, KiCadClient
+from kipy.client import ApiError, AsyncKiCadClient, KiCadClient
+from kipy.errors import ConnectionError
 from kipy.common_types import Color, Commit, TitleBlockInfo, TextAttributes
 from kipy.geometry import Box2, PolygonWithHoles, Vector2
 from kipy.project import Project, NetClass
+from kipy.snapshot import BoardSnapshot
 from kipy.proto.board import board_types_pb2
 from kipy.proto.common.commands import editor_commands_pb2, project_commands_pb2
 from kipy.proto.common.envelope_pb2 import ApiStatusCode
@@ -251,11 +260,811 @@ class BoardStackup(Wrapper):
         """The stackup layers, in order from top to bottom of the board"""
         return [BoardStackupLayer(layer) for layer in self._proto.layers]
 
-class Board:
+class BoardEditListener:
+    """Receives notice of the edits made through a :class:`Board`, so that client-side views of
+    the board (such as :class:`BoardCache`) can be kept up to date without fetching it again.
+    Register with :meth:`Board.add_edit_listener`; the default implementations do nothing.
+
+    Only edits made by this client through the Board object are reported.  Changes made in the
+    KiCad editor or by other clients are not.
+
+    .. versionadded:: 0.6.0
+    """
+    def on_items_created(self, items: Sequence[Wrapper]):
+        """Called with the items that KiCad created, as returned by it"""
+        pass
+
+    def on_items_updated(self, items: Sequence[BoardItem]):
+        """Called with the items that KiCad updated, as returned by it"""
+        pass
+
+    def on_items_removed(self, item_ids: Sequence[str]):
+        """Called with the IDs of the items that were deleted"""
+        pass
+
+    def on_commit_begun(self, commit: Commit):
+        pass
+
+    def on_commit_pushed(self, commit: Commit):
+        pass
+
+    def on_commit_dropped(self, commit: Commit):
+        """Called when a commit is dropped; the edits reported since it began have been undone"""
+        pass
+
+    def on_board_changed(self):
+        """Called after an operation that may have changed any number of items in ways that
+        cannot be reported precisely, such as reverting the board, refilling zones, or an
+        interactive move"""
+        pass
+
+class _CommitJournal:
+    """Records whether any edits were reported while each commit was open, for the indexes that
+    hand out their items to be edited in place and so cannot keep the state to restore when a
+    commit is dropped"""
+    def __init__(self):
+        self._edited: Dict[str, bool] = {}
+
+    def begin(self, commit: Commit):
+        self._edited[commit.id.value] = False
+
+    def record_edit(self):
+        for commit_id in self._edited:
+            self._edited[commit_id] = True
+
+    def end(self, commit: Commit) -> bool:
+        """Forgets the commit, returning False if no edits were reported while it was open"""
+        return self._edited.pop(commit.id.value, True)
+
+    def clear(self):
+        self._edited.clear()
+
+# The object type of each board item proto, for sorting items returned by KiCad
+_PROTO_OBJECT_TYPES: Dict[type, KiCadObjectType.ValueType] = {
+    board_types_pb2.Track: KiCadObjectType.KOT_PCB_TRACE,
+    board_types_pb2.Arc: KiCadObjectType.KOT_PCB_ARC,
+    board_types_pb2.Via: KiCadObjectType.KOT_PCB_VIA,
+    board_types_pb2.Pad: KiCadObjectType.KOT_PCB_PAD,
+    board_types_pb2.FootprintInstance: KiCadObjectType.KOT_PCB_FOOTPRINT,
+    board_types_pb2.BoardGraphicShape: KiCadObjectType.KOT_PCB_SHAPE,
+    board_types_pb2.BoardText: KiCadObjectType.KOT_PCB_TEXT,
+    board_types_pb2.BoardTextBox: KiCadObjectType.KOT_PCB_TEXTBOX,
+    board_types_pb2.Dimension: KiCadObjectType.KOT_PCB_DIMENSION,
+    board_types_pb2.Zone: KiCadObjectType.KOT_PCB_ZONE,
+    board_types_pb2.Field: KiCadObjectType.KOT_PCB_FIELD,
+}
+
+class BoardCache(BoardEditListener):
+    """Keeps the items returned by :meth:`Board.get_items` (and so by the typed getters such as
+    :meth:`Board.get_tracks`) in memory, by object type, so that repeated queries do not need to
+    fetch and parse the items again.  Create one with :meth:`Board.enable_cache`.
+
+    The cache is patched as items are created, updated, and removed through the Board, restored
+    when a commit is dropped, and cleared entirely when the board is reverted or its zones are
+    refilled.  Edits made outside this client are not seen until :meth:`refresh` is called.
+
+    Queries return new wrapper objects each time, so modifying them does not affect the cache.
+
+    .. versionadded:: 0.6.0
+    """
+    def __init__(self, board: "Board"):
+        self._board = board
+        self._items: Dict[KiCadObjectType.ValueType, Dict[str, Wrapper]] = {}
+        self._snapshots: Dict[str, Dict[KiCadObjectType.ValueType, Dict[str, Wrapper]]] = {}
+
+    @property
+    def cached_types(self) -> List[KiCadObjectType.ValueType]:
+        """The object types whose items are currently held in the cache"""
+        return list(self._items.keys())
+
+    def invalidate(
+        self,
+        types: Optional[Union[KiCadObjectType.ValueType,
+                              Iterable[KiCadObjectType.ValueType]]] = None
+    ):
+        """Drops the given object types (or every type) from the cache, so that they are fetched
+        again the next time they are queried"""
+        if types is None:
+            self._items.clear()
+        elif isinstance(types, int):
+            self._items.pop(types, None)
+        else:
+            for t in types:
+                self._items.pop(t, None)
+
+    def refresh(self):
+        """Fetches every cached object type again, for example after the board was edited in
+        KiCad or by another client"""
+        types = self.cached_types
+        self._items.clear()
+        if types:
+            self._board.get_items(types)
+
+    def _missing(
+        self, types: Sequence[KiCadObjectType.ValueType]
+    ) -> List[KiCadObjectType.ValueType]:
+        return [t for t in types if t not in self._items]
+
+    def _store(self, types: Sequence[KiCadObjectType.ValueType], items: Iterable[Wrapper]):
+        for t in types:
+            self._items[t] = {}
+
+        for item in items:
+            by_id = self._items_like(item)
+            if by_id is not None:
+                by_id[item.proto.id.value] = item
+
+    def _items_like(self, item: Wrapper) -> Optional[Dict[str, Wrapper]]:
+        """Returns the cached items of the same type as the given one, if that type is cached"""
+        object_type = _PROTO_OBJECT_TYPES.get(type(item.proto))
+        return self._items.get(object_type) if object_type is not None else None
+
+    def _get(self, types: Sequence[KiCadObjectType.ValueType]) -> List[Wrapper]:
+        return [
+            type(item)(proto=item.proto)
+            for t in dict.fromkeys(types)
+            for item in self._items[t].values()
+        ]
+
+    def on_items_created(self, items: Sequence[Wrapper]):
+        self._patch(self._board._to_concrete_items(items))
+
+    def on_items_updated(self, items: Sequence[BoardItem]):
+        self._patch(items)
+
+    def _patch(self, items: Sequence[Wrapper]):
+        for item in items:
+            by_id = self._items_like(item)
+            if by_id is not None:
+                by_id[item.proto.id.value] = type(item)(proto=item.proto)
+
+    def on_items_removed(self, item_ids: Sequence[str]):
+        for by_id in self._items.values():
+            for item_id in item_ids:
+                by_id.pop(item_id, None)
+
+    def on_commit_begun(self, commit: Commit):
+        # Cached items are replaced rather than modified, so copying the dicts is enough
+        self._snapshots[commit.id.value] = {t: dict(d) for t, d in self._items.items()}
+
+    def on_commit_pushed(self, commit: Commit):
+        self._snapshots.pop(commit.id.value, None)
+
+    def on_commit_dropped(self, commit: Commit):
+        snapshot = self._snapshots.pop(commit.id.value, None)
+
+        if snapshot is None:
+            self._items.clear()
+            return
+
+        # Types first fetched during the commit are dropped, as they may include its edits
+        self._items = snapshot
+
+    def on_board_changed(self):
+        self._items.clear()
+
+# Item filters accepted by Board.get_items and the typed getters.  Nets are matched by name, or
+# by code when given as an int.
+_NetFilter = Union[Net, str, int, Sequence[Union[Net, str, int]]]
+_LayerFilter = Union[BoardLayer.ValueType, Sequence[BoardLayer.ValueType]]
+
+# The item types indexed by BoardIndex unless others are given
+_DEFAULT_INDEX_TYPES = [
+    KiCadObjectType.KOT_PCB_TRACE,
+    KiCadObjectType.KOT_PCB_ARC,
+    KiCadObjectType.KOT_PCB_VIA,
+    KiCadObjectType.KOT_PCB_PAD,
+    KiCadObjectType.KOT_PCB_ZONE,
+]
+
+# The object type, net name, and layers that an item was indexed under
+_IndexKeys = Tuple[KiCadObjectType.ValueType, Optional[str], Tuple[BoardLayer.ValueType, ...]]
+
+class BoardIndex(BoardEditListener):
+    """Looks up board items by net, layer, or ID without scanning the board.  Create one with
+    :meth:`Board.build_index`, which fetches the indexed item types once.
+
+    Like :class:`BoardCache`, the index is patched as items are created, updated, and removed
+    through the Board.  After a commit with edits is dropped, or the board is reverted or its
+    zones are refilled, it is rebuilt from the board the next time it is queried.  Edits made
+    outside this client are not seen until :meth:`refresh` is called.
+
+    Queries return the indexed item objects themselves rather than copies, so that they are cheap
+    enough to use in inner loops.  They should not be modified other than to pass them to
+    :meth:`Board.update_items`, which updates the index.
+
+    .. versionadded:: 0.6.0
+    """
+    def __init__(
+        self,
+        board: "Board",
+        types: Optional[Sequence[KiCadObjectType.ValueType]] = None
+    ):
+        self._board = board
+        self._types = list(types) if types is not None else list(_DEFAULT_INDEX_TYPES)
+        self._items: Dict[str, BoardItem] = {}
+        self._keys: Dict[str, _IndexKeys] = {}
+        self._by_net: Dict[str, Dict[KiCadObjectType.ValueType, Dict[str, BoardItem]]] = {}
+        self._by_layer: Dict[BoardLayer.ValueType, Dict[str, BoardItem]] = {}
+        self._commits = _CommitJournal()
+        self._stale = True
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._items)
+
+    def __contains__(self, item_id: Union[KIID, str]) -> bool:
+        self._ensure_built()
+        return (item_id if isinstance(item_id, str) else item_id.value) in self._items
+
+    @property
+    def types(self) -> List[KiCadObjectType.ValueType]:
+        """The object types that are indexed"""
+        return list(self._types)
+
+    @property
+    def nets(self) -> List[str]:
+        """The names of the nets that have at least one indexed item"""
+        self._ensure_built()
+        return list(self._by_net.keys())
+
+    def refresh(self):
+        """Fetches the indexed item types again and rebuilds the index, for example after the
+        board was edited in KiCad or by another client"""
+        self._rebuild(cast(Sequence[BoardItem], self._board.get_items(self._types)))
+
+    def get_item(self, item_id: Union[KIID, str]) -> Optional[BoardItem]:
+        """Returns the indexed item with the given ID, if there is one"""
+        self._ensure_built()
+        return self._items.get(item_id if isinstance(item_id, str) else item_id.value)
+
+    def get_items_on_net(
+        self,
+        net: Union[Net, str],
+        types: Optional[Union[KiCadObjectType.ValueType,
+                              Sequence[KiCadObjectType.ValueType]]] = None
+    ) -> List[BoardItem]:
+        """Returns the indexed items on the given net, optionally only those of the given types"""
+        self._ensure_built()
+        by_type = self._by_net.get(net.name if isinstance(net, Net) else net)
+
+        if by_type is None:
+            return []
+
+        if types is None:
+            return [item for items in by_type.values() for item in items.values()]
+
+        if isinstance(types, int):
+            types = [types]
+
+        return [item for t in types for item in by_type.get(t, {}).values()]
+
+    def get_tracks_on_net(self, net: Union[Net, str]) -> List[Union[Track, ArcTrack]]:
+        return cast(List[Union[Track, ArcTrack]], self.get_items_on_net(
+            net, [KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC]
+        ))
+
+    def get_vias_on_net(self, net: Union[Net, str]) -> List[Via]:
+        return cast(List[Via], self.get_items_on_net(net, KiCadObjectType.KOT_PCB_VIA))
+
+    def get_pads_on_net(self, net: Union[Net, str]) -> List[Pad]:
+        return cast(List[Pad], self.get_items_on_net(net, KiCadObjectType.KOT_PCB_PAD))
+
+    def get_zones_on_net(self, net: Union[Net, str]) -> List[Zone]:
+        return cast(List[Zone], self.get_items_on_net(net, KiCadObjectType.KOT_PCB_ZONE))
+
+    def get_items_on_layer(self, layer: BoardLayer.ValueType) -> List[BoardItem]:
+        """Returns the indexed items present on the given layer.  Vias and pads are present on
+        each layer of their padstack, and zones on each of their layers."""
+        self._ensure_built()
+        return list(self._by_layer.get(layer, {}).values())
+
+    def _ensure_built(self):
+        if self._stale:
+            self.refresh()
+
+    def _rebuild(self, items: Iterable[BoardItem]):
+        self._items = {}
+        self._keys = {}
+        self._by_net = {}
+        self._by_layer = {}
+        self._stale = False
+
+        for item in items:
+            self._add(item)
+
+    def _add(self, item: BoardItem):
+        object_type = _PROTO_OBJECT_TYPES.get(type(item.proto))
+
+        if object_type is None or object_type not in self._types:
+            return
+
+        item_id = item.id.value
+
+        if item_id in self._items:
+            self._remove(item_id)
+
+        net = getattr(item, 'net', None)
+        keys = (object_type, net.name if net is not None else None,
+                tuple(self._board._item_layers(item)))
+        self._index(item_id, item, keys)
+
+    def _index(self, item_id: str, item: BoardItem, keys: _IndexKeys):
+        object_type, net_name, layers = keys
+        self._items[item_id] = item
+        self._keys[item_id] = keys
+
+        if net_name is not None:
+            self._by_net.setdefault(net_name, {}).setdefault(object_type, {})[item_id] = item
+
+        for layer in layers:
+            self._by_layer.setdefault(layer, {})[item_id] = item
+
+    def _remove(self, item_id: str):
+        # Items are unindexed by the keys they were indexed under, in case they were modified
+        if self._items.pop(item_id, None) is None:
+            return
+
+        object_type, net_name, layers = self._keys.pop(item_id)
+
+        if net_name is not None:
+            by_type = self._by_net[net_name]
+            by_id = by_type[object_type]
+            del by_id[item_id]
+
+            if not by_id:
+                del by_type[object_type]
+            if not by_type:
+                del self._by_net[net_name]
+
+        for layer in layers:
+            self._by_layer[layer].pop(item_id, None)
+
+    def on_items_created(self, items: Sequence[Wrapper]):
+        self._commits.record_edit()
+        if not self._stale:
+            for item in self._board._to_concrete_items(items):
+                self._add(item)
+
+    def on_items_updated(self, items: Sequence[BoardItem]):
+        self._commits.record_edit()
+        if not self._stale:
+            for item in items:
+                self._add(item)
+
+    def on_items_removed(self, item_ids: Sequence[str]):
+        self._commits.record_edit()
+        if not self._stale:
+            for item_id in item_ids:
+                self._remove(item_id)
+
+    def on_commit_begun(self, commit: Commit):
+        self._commits.begin(commit)
+
+    def on_commit_pushed(self, commit: Commit):
+        self._commits.end(commit)
+
+    def on_commit_dropped(self, commit: Commit):
+        if self._commits.end(commit):
+            self._stale = True
+
+    def on_board_changed(self):
+        self._stale = True
+        self._commits.clear()
+
+class _BoardBase:
+    """Builds requests and parses responses for the board commands shared by Board and
+    AsyncBoard; subclasses only differ in how the requests are sent"""
+    _doc: DocumentSpecifier
+    _max_batch_items: int = 2000
+    _max_batch_bytes: int = 1 << 20
+
+    @property
+    def document(self) -> DocumentSpecifier:
+        """The document specifier for the board"""
+        return self._doc
+
+    @property
+    def name(self) -> str:
+        """Returns the file name of the board"""
+        return self._doc.board_filename
+
+    @property
+    def max_batch_items(self) -> int:
+        """The most items sent in a single request by :meth:`Board.create_items`,
+        :meth:`Board.update_items`, and :meth:`Board.remove_items`.  Larger batches are split
+        into several requests, which keeps each one well inside the client timeout.
+
+        .. versionadded:: 0.6.0"""
+        return self._max_batch_items
+
+    @max_batch_items.setter
+    def max_batch_items(self, count: int):
+        if count < 1:
+            raise ValueError("max_batch_items must be at least 1")
+        self._max_batch_items = count
+
+    @property
+    def max_batch_bytes(self) -> int:
+        """The approximate size limit, in bytes, of the items sent in a single request by
+        :meth:`Board.create_items`, :meth:`Board.update_items`, and :meth:`Board.remove_items`.
+        A single item larger than this is still sent, in a request of its own.
+
+        .. versionadded:: 0.6.0"""
+        return self._max_batch_bytes
+
+    @max_batch_bytes.setter
+    def max_batch_bytes(self, size: int):
+        if size < 1:
+            raise ValueError("max_batch_bytes must be at least 1")
+        self._max_batch_bytes = size
+
+    def _batches(self, encoded: Iterable[Tuple[Message, int]]) -> Iterator[List[Message]]:
+        """Groups (message, size) pairs into lists within the batch limits, consuming `encoded`
+        lazily"""
+        batch: List[Message] = []
+        size = 0
+
+        for message, message_size in encoded:
+            if batch and (len(batch) >= self._max_batch_items
+                          or size + message_size > self._max_batch_bytes):
+                yield batch
+                batch = []
+                size = 0
+
+            batch.append(message)
+            size += message_size
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _packed_items(items: Union[Wrapper, Iterable[Wrapper]]) -> Iterator[Tuple[Message, int]]:
+        for item in ((items,) if isinstance(items, Wrapper) else items):
+            packed = pack_any(item.proto)
+            yield packed, len(packed.value) + len(packed.type_url)
+
+    def _create_items_commands(
+        self, items: Union[Wrapper, Iterable[Wrapper]]
+    ) -> Iterator[CreateItems]:
+        for batch in self._batches(self._packed_items(items)):
+            command = CreateItems()
+            command.header.document.CopyFrom(self._doc)
+            command.items.extend(batch)
+            yield command
+
+    def _update_items_commands(
+        self, items: Union[BoardItem, Iterable[BoardItem]]
+    ) -> Iterator[UpdateItems]:
+        for batch in self._batches(self._packed_items(items)):
+            command = UpdateItems()
+            command.header.document.CopyFrom(self._doc)
+            command.items.extend(batch)
+            yield command
+
+    def _delete_items_commands(
+        self, items: Union[BoardItem, KIID, Iterable[Union[BoardItem, KIID]]]
+    ) -> Iterator[DeleteItems]:
+        if isinstance(items, (BoardItem, KIID)):
+            items = (items,)
+
+        ids = (item if isinstance(item, KIID) else item.id for item in items)
+
+        for batch in self._batches((item_id, len(item_id.value)) for item_id in ids):
+            command = DeleteItems()
+            command.header.document.CopyFrom(self._doc)
+            command.item_ids.extend(batch)
+            yield command
+
+    def _to_concrete_items(self, items: Sequence[Wrapper]) -> List[BoardItem]:
+        items_converted = []
+        for it in items:
+            if isinstance(it, BoardShape):
+                items_converted.append(to_concrete_board_shape(cast(BoardShape, it)))
+            elif isinstance(it, Dimension):
+                items_converted.append(to_concrete_dimension(cast(Dimension, it)))
+            else:
+                items_converted.append(it)
+        return items_converted
+
+    def _get_items_command(
+        self, types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+    ) -> GetItems:
+        command = GetItems()
+        command.header.document.CopyFrom(self._doc)
+
+        if isinstance(types, int):
+            command.types.append(types)
+        else:
+            command.types.extend(types)
+
+        return command
+
+    def _get_items_by_net_command(
+        self,
+        types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]],
+        net_codes: Iterable[int]
+    ) -> board_commands_pb2.GetItemsByNet:
+        command = board_commands_pb2.GetItemsByNet()
+        command.header.document.CopyFrom(self._doc)
+
+        if isinstance(types, int):
+            command.types.append(types)
+        else:
+            command.types.extend(types)
+
+        command.net_codes.extend(board_types_pb2.NetCode(value=code) for code in net_codes)
+        return command
+
+    @staticmethod
+    def _split_net_filter(net: _NetFilter) -> Tuple[Set[str], Set[int]]:
+        nets = [net] if isinstance(net, (Net, str, int)) else net
+        names: Set[str] = set()
+        codes: Set[int] = set()
+
+        for n in nets:
+            if isinstance(n, int):
+                codes.add(n)
+            elif isinstance(n, str):
+                names.add(n)
+            elif n.proto.code.value != 0:
+                # A net read from KiCad carries its code, so it needs no lookup by name
+                codes.add(n.proto.code.value)
+            else:
+                names.add(n.name)
+
+        return names, codes
+
+    @staticmethod
+    def _net_codes_for_names(nets: Iterable[Net], names: Set[str]) -> Set[int]:
+        return {net.proto.code.value for net in nets if net.name in names}
+
+    @staticmethod
+    def _item_layers(item: Wrapper) -> Sequence[BoardLayer.ValueType]:
+        if isinstance(item, (Pad, Via)):
+            return item.padstack.layers
+
+        if isinstance(item, Zone):
+            return item.layers
+
+        layer = getattr(item, 'layer', None)
+        return () if layer is None else (layer,)
+
+    @classmethod
+    def _filter_items(
+        cls,
+        items: Sequence[Wrapper],
+        nets: Optional[Tuple[Set[str], Set[int]]],
+        layers: Optional[_LayerFilter]
+    ) -> Sequence[Wrapper]:
+        if nets is None and layers is None:
+            return items
+
+        layer_set = None
+        if layers is not None:
+            layer_set = {layers} if isinstance(layers, int) else set(layers)
+
+        filtered = []
+
+        for item in items:
+            if nets is not None:
+                net = getattr(item, 'net', None)
+
+                if net is None or (net.name not in nets[0] and net.proto.code.value not in nets[1]):
+                    continue
+
+            if layer_set is not None and layer_set.isdisjoint(cls._item_layers(item)):
+                continue
+
+            filtered.append(item)
+
+        return filtered
+
+    @staticmethod
+    def _bound_items_locally(
+        items: Sequence[Wrapper], region: Box2
+    ) -> Tuple[Set[str], List[BoardItem]]:
+        """Returns the IDs of the tracks, arcs, vias and pads that overlap the region, and the
+        other items, whose bounding boxes have to come from KiCad"""
+        # kipy.spatial imports this module
+        from kipy.spatial import _PROTO_BOUNDS
+
+        pos, size = region.pos, region.size
+        min_x, min_y, max_x, max_y = pos.x, pos.y, pos.x + size.x, pos.y + size.y
+        hits: Set[str] = set()
+        unbounded: List[BoardItem] = []
+
+        for item in cast(Sequence[BoardItem], items):
+            function = _PROTO_BOUNDS.get(type(item))
+
+            if function is None:
+                unbounded.append(item)
+                continue
+
+            x0, y0, x1, y1 = function(item.proto)
+            if x0 <= max_x and min_x <= x1 and y0 <= max_y and min_y <= y1:
+                hits.add(item.id.value)
+
+        return hits, unbounded
+
+    @staticmethod
+    def _filter_items_in_region(
+        items: Sequence[Wrapper],
+        region: Box2,
+        hits: Set[str],
+        response: Optional[editor_commands_pb2.GetBoundingBoxResponse] = None
+    ) -> Sequence[Wrapper]:
+        if response is not None:
+            hits = hits | {
+                item_id.value
+                for item_id, box in zip(response.items, response.boxes)
+                if region.intersects(Box2.from_proto(box))
+            }
+        return [item for item in items if cast(BoardItem, item).id.value in hits]
+
+    def _get_nets_command(
+        self, netclass_filter: Optional[Union[str, Sequence[str]]] = None
+    ) -> board_commands_pb2.GetNets:
+        command = board_commands_pb2.GetNets()
+        command.board.CopyFrom(self._doc)
+
+        if isinstance(netclass_filter, str):
+            command.netclass_filter.append(netclass_filter)
+        elif netclass_filter is not None:
+            command.netclass_filter.extend(netclass_filter)
+
+        return command
+
+    def _get_bounding_box_command(
+        self, items: Union[BoardItem, Sequence[BoardItem]], include_text: bool
+    ) -> editor_commands_pb2.GetBoundingBox:
+        cmd = editor_commands_pb2.GetBoundingBox()
+        cmd.header.document.CopyFrom(self._doc)
+        cmd.mode = (
+            editor_commands_pb2.BoundingBoxMode.BBM_ITEM_AND_CHILD_TEXT
+            if include_text
+            else editor_commands_pb2.BoundingBoxMode.BBM_ITEM_ONLY
+        )
+
+        if isinstance(items, BoardItem):
+            cmd.items.append(items.id)
+        else:
+            cmd.items.extend([i.id for i in items])
+
+        return cmd
+
+    @staticmethod
+    def _parse_bounding_boxes(
+        items: Union[BoardItem, Sequence[BoardItem]],
+        response: editor_commands_pb2.GetBoundingBoxResponse
+    ) -> Union[Optional[Box2], List[Optional[Box2]]]:
+        if isinstance(items, BoardItem):
+            return Box2.from_proto(response.boxes[0]) if len(response.boxes) == 1 else None
+
+        item_to_bbox = {item.value: bbox for item, bbox in zip(response.items, response.boxes)}
+        return [
+            Box2.from_proto(box)
+            for box in (item_to_bbox.get(item.id.value, None) for item in items)
+            if box is not None
+        ]
+
+    def _get_pad_shapes_command(
+        self, pads: Union[Pad, Sequence[Pad]], layer: BoardLayer.ValueType
+    ) -> board_commands_pb2.GetPadShapeAsPolygon:
+        cmd = board_commands_pb2.GetPadShapeAsPolygon()
+        cmd.board.CopyFrom(self._doc)
+        cmd.layer = layer
+
+        if isinstance(pads, Pad):
+            cmd.pads.append(pads.id)
+        else:
+            cmd.pads.extend([pad.id for pad in pads])
+
+        return cmd
+
+    @staticmethod
+    def _parse_pad_shapes(
+        pads: Union[Pad, Sequence[Pad]], response: board_commands_pb2.PadShapeAsPolygonResponse
+    ) -> Union[Optional[PolygonWithHoles], List[Optional[PolygonWithHoles]]]:
+        if isinstance(pads, Pad):
+            return PolygonWithHoles(response.polygons[0]) if len(response.polygons) == 1 else None
+
+        pad_to_polygon = {pad.value: polygon for pad, polygon in zip(response.pads, response.polygons)}
+        return [
+            PolygonWithHoles(p) if p is not None else None
+            for p in (pad_to_polygon.get(pad.id.value, None) for pad in pads)
+        ]
+
+    def _padstack_presence_command(
+        self,
+        items: Union[BoardItem, Iterable[BoardItem]],
+        layers: Union[board_types_pb2.BoardLayer.ValueType, Iterable[board_types_pb2.BoardLayer.ValueType]],
+        items_map: Dict[str, BoardItem]
+    ) -> board_commands_pb2.CheckPadstackPresenceOnLayers:
+        cmd = board_commands_pb2.CheckPadstackPresenceOnLayers()
+        cmd.board.CopyFrom(self._doc)
+
+        if isinstance(items, BoardItem):
+            cmd.items.append(items.id)
+            items_map[items.id.value] = items
+        else:
+            cmd.items.extend([item.id for item in items])
+            items_map.update({item.id.value: item for item in items})
+
+        if isinstance(layers, int):
+            cmd.layers.append(layers)
+        else:
+            cmd.layers.extend(layers)
+
+        return cmd
+
+    @staticmethod
+    def _parse_padstack_presence(
+        items_map: Dict[str, BoardItem], response: board_commands_pb2.PadstackPresenceResponse
+    ) -> Dict[BoardItem, Dict[board_types_pb2.BoardLayer.ValueType, bool]]:
+        result = {}
+        for entry in response.entries:
+            if entry.item.value not in items_map:
+                continue
+
+            item = items_map[entry.item.value]
+            layer = entry.layer
+            presence = entry.presence is board_commands_pb2.PadstackPresence.PSP_PRESENT
+
+            if item not in result:
+                result[item] = {}
+
+            result[item][layer] = presence
+
+        return result
+
+    def _refill_zones_command(self) -> board_commands_pb2.RefillZones:
+        cmd = board_commands_pb2.RefillZones()
+        cmd.board.CopyFrom(self._doc)
+        return cmd
+
+    @staticmethod
+    def _refill_poll_delays(max_poll_seconds: float,
+                            poll_interval_seconds: float) -> Iterator[float]:
+        """Yields the delays to wait before each poll for the end of a zone refill: starting at a
+        few milliseconds and doubling up to `poll_interval_seconds`, until `max_poll_seconds` have
+        passed"""
+        deadline = time.monotonic() + max_poll_seconds
+        delay = min(0.005, poll_interval_seconds)
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            yield min(delay, remaining)
+            delay = min(delay * 2, poll_interval_seconds)
+
+    @staticmethod
+    def _still_refilling(error: Exception) -> bool:
+        """Returns whether an error from polling KiCad during a zone refill means that the refill
+        is still running"""
+        if isinstance(error, ApiError):
+            return error.code == ApiStatusCode.AS_BUSY
+
+        # transport-layer timeout, as KiCad does not answer while filling zones
+        return isinstance(error, (IOError, ConnectionError))
+
+    def _hit_test_command(self, item: Item, position: Vector2, tolerance: int) -> HitTest:
+        cmd = HitTest()
+        cmd.header.document.CopyFrom(self._doc)
+        cmd.id.CopyFrom(item.id)
+        cmd.position.CopyFrom(position.proto)
+        cmd.tolerance = tolerance
+        return cmd
+
+class Board(_BoardBase):
     def __init__(self, kicad: KiCadClient, document: DocumentSpecifier):
         """Represents an open board (.kicad_pcb) document in KiCad"""
         self._kicad = kicad
         self._doc = document
+        self._edit_listeners: List[BoardEditListener] = []
+        self._cache: Optional[BoardCache] = None
 
     def __repr__(self) -> str:
         return f"Board(filename={self.name})"
@@ -265,19 +1074,57 @@ class Board:
         """The KiCad client used to communicate with the API server"""
         return self._kicad
 
-    @property
-    def document(self) -> DocumentSpecifier:
-        """The document specifier for the board"""
-        return self._doc
-
     def get_project(self) -> Project:
         """Returns the project that this board is a part of"""
         return Project(self._kicad, self._doc)
 
+    def add_edit_listener(self, listener: BoardEditListener):
+        """Registers a listener to be told about edits made through this object
+
+        .. versionadded:: 0.6.0"""
+        self._edit_listeners.append(listener)
+
+    def remove_edit_listener(self, listener: BoardEditListener):
+        """.. versionadded:: 0.6.0"""
+        self._edit_listeners.remove(listener)
+
     @property
-    def name(self) -> str:
-        """Returns the file name of the board"""
-        return self._doc.board_filename
+    def cache(self) -> Optional[BoardCache]:
+        """The item cache, if enabled with :meth:`enable_cache`
+
+        .. versionadded:: 0.6.0"""
+        return self._cache
+
+    def enable_cache(self) -> BoardCache:
+        """Starts keeping the items returned by :meth:`get_items` and the typed getters in memory,
+        so that repeated queries are answered without a request to KiCad.  See
+        :class:`BoardCache` for when the cache is updated.
+
+        .. versionadded:: 0.6.0"""
+        if self._cache is None:
+            self._cache = BoardCache(self)
+            self.add_edit_listener(self._cache)
+        return self._cache
+
+    def disable_cache(self):
+        """.. versionadded:: 0.6.0"""
+        if self._cache is not None:
+            self.remove_edit_listener(self._cache)
+            self._cache = None
+
+    def build_index(
+        self, types: Optional[Sequence[KiCadObjectType.ValueType]] = None
+    ) -> BoardIndex:
+        """Fetches the items of the given types (by default tracks, arcs, vias, pads and zones)
+        and indexes them by net, layer, and ID; see :class:`BoardIndex`.  The index is kept up to
+        date with edits made through this object until it is passed to
+        :meth:`remove_edit_listener`.
+
+        .. versionadded:: 0.6.0"""
+        index = BoardIndex(self, types)
+        index.refresh()
+        self.add_edit_listener(index)
+        return index
 
     def save(self):
         command = editor_commands_pb2.SaveDocument()
@@ -303,6 +1150,11 @@ class Board:
         command = editor_commands_pb2.RevertDocument()
         command.document.CopyFrom(self._doc)
         self._kicad.send(command, Empty)
+        self._notify_board_changed()
+
+    def _notify_board_changed(self):
+        for listener in self._edit_listeners:
+            listener.on_board_changed()
 
     def begin_commit(self) -> Commit:
         """Begins a commit transaction on the board, returning a Commit object that can be used to
@@ -317,7 +1169,12 @@ class Board:
         step.
         """
         command = BeginCommit()
-        return Commit(self._kicad.send(command, BeginCommitResponse).id)
+        commit = Commit(self._kicad.send(command, BeginCommitResponse).id)
+
+        for listener in self._edit_listeners:
+            listener.on_commit_begun(commit)
+
+        return commit
 
     def push_commit(self, commit: Commit, message: str = ""):
         """If a commit is open, pushes the changes to the board and closes the commit.  This will
@@ -328,6 +1185,9 @@ class Board:
         command.message = message
         self._kicad.send(command, EndCommitResponse)
 
+        for listener in self._edit_listeners:
+            listener.on_commit_pushed(commit)
+
     def drop_commit(self, commit: Commit):
         """Cancel a commit, discarding any changes made since the commit was opened"""
         command = EndCommit()
@@ -335,106 +1195,274 @@ class Board:
         command.action = CommitAction.CMA_DROP
         self._kicad.send(command, EndCommitResponse)
 
+        for listener in self._edit_listeners:
+            listener.on_commit_dropped(commit)
+
     def create_items(self, items: Union[Wrapper, Iterable[Wrapper]]) -> List[Wrapper]:
-        command = CreateItems()
-        command.header.document.CopyFrom(self._doc)
+        """Creates one or more items on the board, returning the created items in the same order.
 
-        if isinstance(items, Wrapper):
-            command.items.append(pack_any(items.proto))
-        else:
-            command.items.extend([pack_any(i.proto) for i in items])
+        `items` may be a generator, in which case it is consumed one batch at a time (see
+        :attr:`max_batch_items` and :attr:`max_batch_bytes`), so the whole set of items never
+        needs to be held in memory as protobuf messages.  Batches are sent as separate requests;
+        open a commit first if they should be a single undo step.
 
-        return [
-            unwrap(result.item)
-            for result in self._kicad.send(command, CreateItemsResponse).created_items
-        ]
+        .. versionchanged:: 0.6.0
+            Large inputs are split into batches
+        """
+        created: List[Wrapper] = []
 
-    def _to_concrete_items(self, items: Sequence[Wrapper]) -> List[BoardItem]:
-        items_converted = []
-        for it in items:
-            if isinstance(it, BoardShape):
-                items_converted.append(to_concrete_board_shape(cast(BoardShape, it)))
-            elif isinstance(it, Dimension):
-                items_converted.append(to_concrete_dimension(cast(Dimension, it)))
-            else:
-                items_converted.append(it)
-        return items_converted
+        for command in self._create_items_commands(items):
+            batch = [
+                unwrap(result.item)
+                for result in self._kicad.send(command, CreateItemsResponse).created_items
+            ]
+
+            for listener in self._edit_listeners:
+                listener.on_items_created(batch)
+
+            created.extend(batch)
+
+        return created
 
     def get_items(
-        self, types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+        self,
+        types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]],
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
     ) -> Sequence[Wrapper]:
-        """Retrieves items from the board, optionally filtering to a single or set of types"""
-        command = GetItems()
-        command.header.document.CopyFrom(self._doc)
+        """Retrieves items from the board, optionally filtering to a single or set of types.
+
+        :param net: Only return items on this net or these nets, given as :class:`Net` objects,
+                    names, or net codes.  KiCad selects the items, so a query for one net costs
+                    in proportion to the size of that net rather than of the board.  Names are
+                    looked up with an extra request on every call; pass the :class:`Net` objects
+                    from :meth:`get_nets` instead when querying repeatedly.
+        :param layers: Only return items present on at least one of these layers
+        :param region: Only return items whose bounding box overlaps this box.  The boxes of
+                       tracks, arcs, vias and pads are calculated locally, and those of other
+                       items by KiCad.
+
+        .. versionchanged:: 0.6.0
+            Served from the :attr:`cache` when it is enabled
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters
+        """
+        cache = self._cache
+        nets = None if net is None else self._split_net_filter(net)
 
-        if isinstance(types, int):
-            command.types.append(types)
+        if cache is not None:
+            types = [types] if isinstance(types, int) else list(types)
+            missing = cache._missing(types)
+
+            if missing:
+                cache._store(missing, self._fetch_items(missing))
+
+            items: Sequence[Wrapper] = cache._get(types)
+        elif nets is not None:
+            items = self._fetch_items_by_net(types, nets)
+            nets = None
         else:
-            command.types.extend(types)
+            items = self._fetch_items(types)
 
-        return self._to_concrete_items(
-            [unwrap(item) for item in self._kicad.send(command, GetItemsResponse).items]
-        )
+        items = self._filter_items(items, nets, layers)
+
+        if region is not None and items:
+            hits, unbounded = self._bound_items_locally(items, region)
+            response = None
+
+            if unbounded:
+                command = self._get_bounding_box_command(unbounded, False)
+                response = self._kicad.send(command, editor_commands_pb2.GetBoundingBoxResponse)
+
+            items = self._filter_items_in_region(items, region, hits, response)
+
+        return items
+
+    def _fetch_items_by_net(
+        self,
+        types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]],
+        nets: Tuple[Set[str], Set[int]]
+    ) -> List[BoardItem]:
+        names, codes = nets
+
+        if names:
+            codes = codes | self._net_codes_for_names(self.get_nets(), names)
+
+        if not codes:
+            return []
+
+        command = self._get_items_by_net_command(types, codes)
+        response = self._kicad.send(command, GetItemsResponse)
+        return self._to_concrete_items([unwrap(item) for item in response.items])
+
+    def _fetch_items(
+        self, types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+    ) -> List[BoardItem]:
+        return self._to_concrete_items([unwrap(item) for item in self._fetch_raw_items(types)])
+
+    def _fetch_raw_items(
+        self, types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+    ) -> Sequence[AnyProto]:
+        command = self._get_items_command(types)
+        return self._kicad.send(command, GetItemsResponse).items
+
+    def snapshot(
+        self, types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+    ) -> BoardSnapshot:
+        """Starts mirroring the items of the given types, so that later reads of the board can
+        report only what changed; see :class:`kipy.snapshot.BoardSnapshot`
+
+        .. versionadded:: 0.6.0"""
+        return BoardSnapshot(self, types)
+
+    def get_tracks(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Union[Track, ArcTrack]]:
+        """Retrieves all tracks and arc tracks on the board, optionally filtered as in
+        :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters"""
+        return [
+            cast(Track, item) if isinstance(item, Track) else cast(ArcTrack, item)
+            for item in self.get_items(
+                types=[KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC],
+                net=net, layers=layers, region=region
+            )
+        ]
+
+    def get_vias(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Via]:
+        """Retrieves all vias on the board, optionally filtered as in :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters"""
+        return [
+            cast(Via, item)
+            for item in self.get_items(
+                types=[KiCadObjectType.KOT_PCB_VIA], net=net, layers=layers, region=region
+            )
+        ]
+
+    def get_pads(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Pad]:
+        """Retrieves all pads on the board (note that pads belong to footprints, not the board
+        itself), optionally filtered as in :meth:`get_items`
 
-    def get_tracks(self) -> Sequence[Union[Track, ArcTrack]]:
-        """Retrieves all tracks and arc tracks on the board"""
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters"""
         return [
-            cast(Track, item) if isinstance(item, Track) else cast(ArcTrack, item)
+            cast(Pad, item)
             for item in self.get_items(
-                types=[KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC]
+                types=[KiCadObjectType.KOT_PCB_PAD], net=net, layers=layers, region=region
             )
         ]
 
-    def get_vias(self) -> Sequence[Via]:
-        """Retrieves all vias on the board"""
-        return [cast(Via, item) for item in self.get_items(types=[KiCadObjectType.KOT_PCB_VIA])]
-
-    def get_pads(self) -> Sequence[Pad]:
-        """Retrieves all pads on the board (note that pads belong to footprints, not the board
-        itself)"""
-        return [cast(Pad, item) for item in self.get_items(types=[KiCadObjectType.KOT_PCB_PAD])]
+    def get_footprints(
+        self,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[FootprintInstance]:
+        """Retrieves all footprints on the board, optionally filtered as in :meth:`get_items`
 
-    def get_footprints(self) -> Sequence[FootprintInstance]:
-        """Retrieves all footprints on the board"""
+        .. versionchanged:: 0.6.0
+            Added the ``layers`` and ``region`` filters"""
         return [
             cast(FootprintInstance, item)
-            for item in self.get_items(types=[KiCadObjectType.KOT_PCB_FOOTPRINT])
+            for item in self.get_items(
+                types=[KiCadObjectType.KOT_PCB_FOOTPRINT], layers=layers, region=region
+            )
         ]
 
-    def get_shapes(self) -> Sequence[BoardShape]:
-        """Retrieves all graphic shapes (not including tracks or text) on the board"""
+    def get_shapes(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[BoardShape]:
+        """Retrieves all graphic shapes (not including tracks or text) on the board, optionally
+        filtered as in :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters"""
         return [
             item
             for item in (
                 to_concrete_board_shape(cast(BoardShape, item))
-                for item in self.get_items(types=[KiCadObjectType.KOT_PCB_SHAPE])
+                for item in self.get_items(
+                    types=[KiCadObjectType.KOT_PCB_SHAPE], net=net, layers=layers, region=region
+                )
             )
             if item is not None
         ]
 
-    def get_dimensions(self) -> Sequence[Dimension]:
-        """Retrieves all dimension objects on the board"""
+    def get_dimensions(
+        self,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Dimension]:
+        """Retrieves all dimension objects on the board, optionally filtered as in
+        :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``layers`` and ``region`` filters"""
         return [
             item
             for item in (
                 to_concrete_dimension(cast(Dimension, item))
-                for item in self.get_items(types=[KiCadObjectType.KOT_PCB_DIMENSION])
+                for item in self.get_items(
+                    types=[KiCadObjectType.KOT_PCB_DIMENSION], layers=layers, region=region
+                )
             )
             if item is not None
         ]
 
-    def get_text(self) -> Sequence[Union[BoardText, BoardTextBox]]:
-        """Retrieves all text objects on the board"""
+    def get_text(
+        self,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Union[BoardText, BoardTextBox]]:
+        """Retrieves all text objects on the board, optionally filtered as in :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``layers`` and ``region`` filters"""
         return [
             cast(BoardText, item) if isinstance(item, BoardText) else cast(BoardTextBox, item)
             for item in self.get_items(
-                types=[KiCadObjectType.KOT_PCB_TEXT, KiCadObjectType.KOT_PCB_TEXTBOX]
+                types=[KiCadObjectType.KOT_PCB_TEXT, KiCadObjectType.KOT_PCB_TEXTBOX],
+                layers=layers, region=region
             )
         ]
 
-    def get_zones(self) -> Sequence[Zone]:
-        """Retrieves all zones (including rule areas and graphic zones) on the board"""
-        return [cast(Zone, item) for item in self.get_items(types=[KiCadObjectType.KOT_PCB_ZONE])]
+    def get_zones(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Zone]:
+        """Retrieves all zones (including rule areas and graphic zones) on the board, optionally
+        filtered as in :meth:`get_items`
+
+        .. versionchanged:: 0.6.0
+            Added the ``net``, ``layers`` and ``region`` filters"""
+        return [
+            cast(Zone, item)
+            for item in self.get_items(
+                types=[KiCadObjectType.KOT_PCB_ZONE], net=net, layers=layers, region=region
+            )
+        ]
 
     def get_as_string(self) -> str:
         """Returns the board as a string in KiCad's board file format"""
@@ -447,76 +1475,63 @@ class Board:
         command = editor_commands_pb2.SaveSelectionToString()
         return self._kicad.send(command, editor_commands_pb2.SavedSelectionResponse).contents
 
-    def update_items(self, items: Union[BoardItem, Sequence[BoardItem]]) -> List[BoardItem]:
+    def update_items(self, items: Union[BoardItem, Iterable[BoardItem]]) -> List[BoardItem]:
         """Updates the properties of one or more items on the board.  The items must already exist
         on the board, and are matched by internal UUID.  All other properties of the items are
         updated from those passed in this call.
 
         Returns the updated items, which may be different from the input items if any updates
-        failed to apply (for example, if any properties were out of range and were clamped)"""
-        command = UpdateItems()
-        command.header.document.CopyFrom(self._doc)
+        failed to apply (for example, if any properties were out of range and were clamped)
 
-        if isinstance(items, BoardItem):
-            command.items.append(pack_any(items.proto))
-        else:
-            command.items.extend([pack_any(i.proto) for i in items])
+        As with :meth:`create_items`, large inputs are sent in batches and may be a generator.
 
-        if len(command.items) == 0:
-            return []
+        .. versionchanged:: 0.6.0
+            Large inputs are split into batches
+        """
+        updated: List[BoardItem] = []
 
-        return self._to_concrete_items(
-            [
+        for command in self._update_items_commands(items):
+            batch = self._to_concrete_items([
                 unwrap(result.item)
-                for result in self._kicad.send(
-                    command, UpdateItemsResponse
-                ).updated_items
-            ]
-        )
+                for result in self._kicad.send(command, UpdateItemsResponse).updated_items
+            ])
 
-    def remove_items(self, items: Union[BoardItem, Sequence[BoardItem]]):
-        """Deletes one or more items from the board"""
-        command = DeleteItems()
-        command.header.document.CopyFrom(self._doc)
+            for listener in self._edit_listeners:
+                listener.on_items_updated(batch)
 
-        if isinstance(items, BoardItem):
-            command.item_ids.append(items.id)
-        else:
-            command.item_ids.extend([item.id for item in items])
+            updated.extend(batch)
 
-        if len(command.item_ids) == 0:
-            return
+        return updated
 
-        self._kicad.send(command, DeleteItemsResponse)
+    def remove_items(self, items: Union[BoardItem, Iterable[BoardItem]]):
+        """Deletes one or more items from the board.  As with :meth:`create_items`, large inputs
+        are sent in batches and may be a generator.
 
-    def remove_items_by_id(self, items: Union[KIID, Sequence[KIID]]):
-        """Deletes one or more items from the board using their unique IDs
+        .. versionchanged:: 0.6.0
+            Large inputs are split into batches
+        """
+        self._delete_items(items)
 
-        .. versionadded:: 0.4.0"""
-        command = DeleteItems()
-        command.header.document.CopyFrom(self._doc)
+    def _delete_items(self, items: Union[BoardItem, KIID, Iterable[Union[BoardItem, KIID]]]):
+        for command in self._delete_items_commands(items):
+            self._kicad.send(command, DeleteItemsResponse)
 
-        if isinstance(items, KIID):
-            command.item_ids.append(items)
-        else:
-            command.item_ids.extend(items)
+            if self._edit_listeners:
+                ids = [item_id.value for item_id in command.item_ids]
+                for listener in self._edit_listeners:
+                    listener.on_items_removed(ids)
 
-        if len(command.item_ids) == 0:
-            return
+    def remove_items_by_id(self, items: Union[KIID, Sequence[KIID]]):
+        """Deletes one or more items from the board using their unique IDs
 
-        self._kicad.send(command, DeleteItemsResponse)
+        .. versionadded:: 0.4.0"""
+        self._delete_items(items)
 
     def get_nets(
         self, netclass_filter: Optional[Union[str, Sequence[str]]] = None
     ) -> Sequence[Net]:
         """Retrieves all nets on the board, optionally filtering by net class"""
-        command = board_commands_pb2.GetNets()
-        command.board.CopyFrom(self._doc)
-
-        if isinstance(netclass_filter, str):
-            command.netclass_filter.append(netclass_filter)
-        elif netclass_filter is not None:
-            command.netclass_filter.extend(netclass_filter)
+        command = self._get_nets_command(netclass_filter)
 
         return [
             Net(net)
@@ -745,30 +1760,9 @@ class Board:
     ) -> Union[Optional[Box2], List[Optional[Box2]]]:
         """Gets the KiCad-calculated bounding box for an item or items, returning None if the item
         does not exist or has no bounding box"""
-        cmd = editor_commands_pb2.GetBoundingBox()
-        cmd.header.document.CopyFrom(self._doc)
-        cmd.mode = (
-            editor_commands_pb2.BoundingBoxMode.BBM_ITEM_AND_CHILD_TEXT
-            if include_text
-            else editor_commands_pb2.BoundingBoxMode.BBM_ITEM_ONLY
-        )
-
-        if isinstance(items, BoardItem):
-            cmd.items.append(items.id)
-        else:
-            cmd.items.extend([i.id for i in items])
-
+        cmd = self._get_bounding_box_command(items, include_text)
         response = self._kicad.send(cmd, editor_commands_pb2.GetBoundingBoxResponse)
-
-        if isinstance(items, BoardItem):
-            return Box2.from_proto(response.boxes[0]) if len(response.boxes) == 1 else None
-
-        item_to_bbox = {item.value: bbox for item, bbox in zip(response.items, response.boxes)}
-        return [
-            Box2.from_proto(box)
-            for box in (item_to_bbox.get(item.id.value, None) for item in items)
-            if box is not None
-        ]
+        return self._parse_bounding_boxes(items, response)
 
     @overload
     def get_pad_shapes_as_polygons(
@@ -785,26 +1779,9 @@ class Board:
     ) -> Union[Optional[PolygonWithHoles], List[Optional[PolygonWithHoles]]]:
         """Retrieves the polygonal shape of one or more pads on a given layer.  If a pad does not
         exist or has no polygonal shape on the given layer, None will be returned for that pad."""
-        cmd = board_commands_pb2.GetPadShapeAsPolygon()
-        cmd.board.CopyFrom(self._doc)
-        cmd.layer = layer
-
-        if isinstance(pads, Pad):
-            cmd.pads.append(pads.id)
-        else:
-            cmd.pads.extend([pad.id for pad in pads])
-
+        cmd = self._get_pad_shapes_command(pads, layer)
         response = self._kicad.send(cmd, board_commands_pb2.PadShapeAsPolygonResponse)
-
-        if isinstance(pads, Pad):
-            return PolygonWithHoles(response.polygons[0]) if len(response.polygons) == 1 else None
-
-        pad_to_polygon = {pad.value: polygon for pad, polygon in zip(response.pads, response.polygons)}
-        return [
-            PolygonWithHoles(p)
-            for p in (pad_to_polygon.get(pad.id.value, None) for pad in pads)
-            if p is not None
-        ]
+        return self._parse_pad_shapes(pads, response)
 
     def check_padstack_presence_on_layers(
         self,
@@ -820,40 +1797,10 @@ class Board:
 
         .. versionadded:: 0.4.0 with KiCad 9.0.3
         """
-        cmd = board_commands_pb2.CheckPadstackPresenceOnLayers()
-        cmd.board.CopyFrom(self._doc)
-
-        items_map = {}
-
-        if isinstance(items, BoardItem):
-            cmd.items.append(items.id)
-            items_map[items.id.value] = items
-        else:
-            cmd.items.extend([item.id for item in items])
-            items_map.update({item.id.value: item for item in items})
-
-        if isinstance(layers, int):
-            cmd.layers.append(layers)
-        else:
-            cmd.layers.extend(layers)
-
+        items_map: Dict[str, BoardItem] = {}
+        cmd = self._padstack_presence_command(items, layers, items_map)
         response = self._kicad.send(cmd, board_commands_pb2.PadstackPresenceResponse)
-
-        result = {}
-        for entry in response.entries:
-            if entry.item.value not in items_map:
-                continue
-
-            item = items_map[entry.item.value]
-            layer = entry.layer
-            presence = entry.presence is board_commands_pb2.PadstackPresence.PSP_PRESENT
-
-            if item not in result:
-                result[item] = {}
-
-            result[item][layer] = presence
-
-        return result
+        return self._parse_padstack_presence(items_map, response)
 
     def interactive_move(self, items: Union[KIID, Iterable[KIID]]):
         """Initiates an interactive move operation on one or more items on the board.  The user
@@ -869,46 +1816,90 @@ class Board:
             cmd.items.extend(items)
 
         self._kicad.send(cmd, Empty)
+        self._notify_board_changed()
 
     def refill_zones(self, block=True, max_poll_seconds: float = 30.0,
                      poll_interval_seconds: float = 0.5):
         """Refills all zones on the board.  If block is True, this function will block until the
         refill operation is complete.  If block is False, this function will return immediately,
-        and future API calls will return AS_BUSY until the refill operation is complete."""
-        cmd = board_commands_pb2.RefillZones()
-        cmd.board.CopyFrom(self._doc)
-        self._kicad.send(cmd, Empty)
+        and future API calls will return AS_BUSY until the refill operation is complete.
+
+        While blocking, KiCad is polled after a few milliseconds, then at exponentially growing
+        intervals of up to `poll_interval_seconds`, so that short refills return promptly.
+        Polling stops after `max_poll_seconds` even if KiCad is still busy.
+
+        .. versionchanged:: 0.6.0
+            Polling backs off adaptively instead of waiting `poll_interval_seconds` each time
+        """
+        self._kicad.send(self._refill_zones_command(), Empty)
+        self._notify_board_changed()
 
         if not block:
             return
 
-        # Zone fill is a blocking operation that can block the entire event loop.
-        # To hide this from API users somewhat, do an initial busy loop here
-        sleeps = 0
+        self._wait_for_refill(max_poll_seconds, poll_interval_seconds)
+
+    def begin_refill_zones(self, max_poll_seconds: float = 30.0,
+                           poll_interval_seconds: float = 0.5) -> "Future[None]":
+        """Starts refilling all zones on the board and returns a future that completes once KiCad
+        has finished, so that other work can be done in the meantime.  KiCad is polled from a
+        background thread in the same way as :meth:`refill_zones`; other API calls made before
+        the future completes will fail with AS_BUSY.
+
+        .. versionadded:: 0.6.0
+        """
+        self._kicad.send(self._refill_zones_command(), Empty)
+        self._notify_board_changed()
+        future: "Future[None]" = Future()
+        future.set_running_or_notify_cancel()
+
+        def wait():
+            try:
+                self._wait_for_refill(max_poll_seconds, poll_interval_seconds)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=wait, name="kipy-refill-zones", daemon=True).start()
+        return future
 
-        while sleeps < max_poll_seconds:
-            sleep(poll_interval_seconds)
+    def _wait_for_refill(self, max_poll_seconds: float, poll_interval_seconds: float):
+        # Zone fill is a blocking operation that can block the entire event loop.
+        # To hide this from API users somewhat, poll here until KiCad responds again
+        for delay in self._refill_poll_delays(max_poll_seconds, poll_interval_seconds):
+            time.sleep(delay)
             try:
                 self._kicad.send(Ping(), Empty)
-            except IOError:
-                # transport-layer timeout
-                continue
-            except ApiError as e:
-                if e.code == ApiStatusCode.AS_BUSY:
+            except (IOError, ConnectionError, ApiError) as e:
+                if self._still_refilling(e):
                     continue
-                else:
-                    raise e
-            break
+                raise e
+            return
 
     def hit_test(self, item: Item, position: Vector2, tolerance: int = 0) -> bool:
         """Performs a hit test on a board item at a given position"""
-        cmd = HitTest()
-        cmd.header.document.CopyFrom(self._doc)
-        cmd.id.CopyFrom(item.id)
-        cmd.position.CopyFrom(position.proto)
-        cmd.tolerance = tolerance
+        cmd = self._hit_test_command(item, position, tolerance)
         return self._kicad.send(cmd, HitTestResponse).result == HitTestResult.HTR_HIT
 
+    def hit_test_many(
+        self, tests: Iterable[Tuple[Item, Vector2]], tolerance: int = 0
+    ) -> List[bool]:
+        """Performs hit tests for many (item, position) pairs, returning the results in the same
+        order.  The API has no batch hit test, so the tests are sent as pipelined requests (see
+        :meth:`kipy.client.KiCadClient.send_pipelined`), which costs far less than calling
+        :meth:`hit_test` in a loop.  For tests that do not need KiCad's exact answer, see
+        :class:`kipy.hittest.HitTester`.
+
+        .. versionadded:: 0.6.0"""
+        commands = (
+            self._hit_test_command(item, position, tolerance) for item, position in tests
+        )
+        return [
+            response.result == HitTestResult.HTR_HIT
+            for response in self._kicad.send_pipelined(commands, HitTestResponse)
+        ]
+
     def get_visible_layers(self) -> Sequence[board_types_pb2.BoardLayer.ValueType]:
         cmd = board_commands_pb2.GetVisibleLayers()
         cmd.board.CopyFrom(self._doc)
@@ -942,3 +1933,282 @@ class Board:
         cmd = board_commands_pb2.SetBoardEditorAppearanceSettings()
         cmd.settings.CopyFrom(settings.proto)
         self._kicad.send(cmd, Empty)
+
+class AsyncBoard(_BoardBase):
+    def __init__(self, kicad: AsyncKiCadClient, document: DocumentSpecifier):
+        """An asynchronous counterpart to Board for queries and edits that should not block the
+        calling task.  Independent calls may be awaited concurrently, for example with
+        ``asyncio.gather``, to keep several requests in flight at once.
+
+        .. versionadded:: 0.6.0"""
+        self._kicad = kicad
+        self._doc = document
+
+    def __repr__(self) -> str:
+        return f"AsyncBoard(filename={self.name})"
+
+    @property
+    def client(self) -> AsyncKiCadClient:
+        """The KiCad client used to communicate with the API server"""
+        return self._kicad
+
+    async def begin_commit(self) -> Commit:
+        """Begins a commit transaction on the board; see Board.begin_commit"""
+        return Commit((await self._kicad.send(BeginCommit(), BeginCommitResponse)).id)
+
+    async def push_commit(self, commit: Commit, message: str = ""):
+        """Pushes the changes in an open commit to the board; see Board.push_commit"""
+        command = EndCommit()
+        command.id.CopyFrom(commit.id)
+        command.action = CommitAction.CMA_COMMIT
+        command.message = message
+        await self._kicad.send(command, EndCommitResponse)
+
+    async def drop_commit(self, commit: Commit):
+        """Cancel a commit, discarding any changes made since the commit was opened"""
+        command = EndCommit()
+        command.id.CopyFrom(commit.id)
+        command.action = CommitAction.CMA_DROP
+        await self._kicad.send(command, EndCommitResponse)
+
+    async def create_items(self, items: Union[Wrapper, Iterable[Wrapper]]) -> List[Wrapper]:
+        """Creates one or more items on the board; see Board.create_items"""
+        created: List[Wrapper] = []
+
+        for command in self._create_items_commands(items):
+            response = await self._kicad.send(command, CreateItemsResponse)
+            created.extend(unwrap(result.item) for result in response.created_items)
+
+        return created
+
+    async def get_items(
+        self,
+        types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]],
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Wrapper]:
+        """Retrieves items from the board, optionally filtering to a single or set of types and
+        by net, layer, and region; see Board.get_items"""
+        nets = None if net is None else self._split_net_filter(net)
+
+        if nets is not None:
+            names, codes = nets
+
+            if names:
+                codes = codes | self._net_codes_for_names(await self.get_nets(), names)
+
+            if not codes:
+                return []
+
+            command = self._get_items_by_net_command(types, codes)
+        else:
+            command = self._get_items_command(types)
+
+        response = await self._kicad.send(command, GetItemsResponse)
+        items = self._filter_items(
+            self._to_concrete_items([unwrap(item) for item in response.items]), None, layers
+        )
+
+        if region is not None and items:
+            hits, unbounded = self._bound_items_locally(items, region)
+            bbox_response = None
+
+            if unbounded:
+                bbox_command = self._get_bounding_box_command(unbounded, False)
+                bbox_response = await self._kicad.send(
+                    bbox_command, editor_commands_pb2.GetBoundingBoxResponse
+                )
+
+            items = self._filter_items_in_region(items, region, hits, bbox_response)
+
+        return items
+
+    async def get_tracks(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Union[Track, ArcTrack]]:
+        """Retrieves all tracks and arc tracks on the board, optionally filtered as in
+        Board.get_items"""
+        return [
+            cast(Track, item) if isinstance(item, Track) else cast(ArcTrack, item)
+            for item in await self.get_items(
+                types=[KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC],
+                net=net, layers=layers, region=region
+            )
+        ]
+
+    async def get_vias(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Via]:
+        """Retrieves all vias on the board, optionally filtered as in Board.get_items"""
+        return [
+            cast(Via, item)
+            for item in await self.get_items(
+                types=[KiCadObjectType.KOT_PCB_VIA], net=net, layers=layers, region=region
+            )
+        ]
+
+    async def get_pads(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Pad]:
+        """Retrieves all pads on the board, optionally filtered as in Board.get_items"""
+        return [
+            cast(Pad, item)
+            for item in await self.get_items(
+                types=[KiCadObjectType.KOT_PCB_PAD], net=net, layers=layers, region=region
+            )
+        ]
+
+    async def get_footprints(
+        self,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[FootprintInstance]:
+        """Retrieves all footprints on the board, optionally filtered as in Board.get_items"""
+        return [
+            cast(FootprintInstance, item)
+            for item in await self.get_items(
+                types=[KiCadObjectType.KOT_PCB_FOOTPRINT], layers=layers, region=region
+            )
+        ]
+
+    async def get_zones(
+        self,
+        net: Optional[_NetFilter] = None,
+        layers: Optional[_LayerFilter] = None,
+        region: Optional[Box2] = None,
+    ) -> Sequence[Zone]:
+        """Retrieves all zones (including rule areas and graphic zones) on the board, optionally
+        filtered as in Board.get_items"""
+        return [
+            cast(Zone, item)
+            for item in await self.get_items(
+                types=[KiCadObjectType.KOT_PCB_ZONE], net=net, layers=layers, region=region
+            )
+        ]
+
+    async def update_items(self, items: Union[BoardItem, Iterable[BoardItem]]) -> List[BoardItem]:
+        """Updates the properties of one or more items on the board; see Board.update_items"""
+        updated: List[Wrapper] = []
+
+        for command in self._update_items_commands(items):
+            response = await self._kicad.send(command, UpdateItemsResponse)
+            updated.extend(unwrap(result.item) for result in response.updated_items)
+
+        return self._to_concrete_items(updated)
+
+    async def remove_items(self, items: Union[BoardItem, Iterable[BoardItem]]):
+        """Deletes one or more items from the board; see Board.remove_items"""
+        for command in self._delete_items_commands(items):
+            await self._kicad.send(command, DeleteItemsResponse)
+
+    async def refill_zones(self, block=True, max_poll_seconds: float = 30.0,
+                           poll_interval_seconds: float = 0.5):
+        """Refills all zones on the board; see Board.refill_zones.  While waiting for the refill
+        to complete, the event loop is free to run other tasks."""
+        await self._kicad.send(self._refill_zones_command(), Empty)
+
+        if not block:
+            return
+
+        for delay in self._refill_poll_delays(max_poll_seconds, poll_interval_seconds):
+            await asyncio.sleep(delay)
+            try:
+                await self._kicad.send(Ping(), Empty)
+            except (IOError, ConnectionError, ApiError) as e:
+                if self._still_refilling(e):
+                    continue
+                raise e
+            return
+
+    async def get_nets(
+        self, netclass_filter: Optional[Union[str, Sequence[str]]] = None
+    ) -> Sequence[Net]:
+        """Retrieves all nets on the board, optionally filtering by net class"""
+        command = self._get_nets_command(netclass_filter)
+        response = await self._kicad.send(command, board_commands_pb2.NetsResponse)
+        return [Net(net) for net in response.nets]
+
+    @overload
+    async def get_item_bounding_box(
+        self, items: BoardItem, include_text: bool = False
+    ) -> Optional[Box2]: ...
+
+    @overload
+    async def get_item_bounding_box(
+        self, items: Sequence[BoardItem], include_text: bool = False
+    ) -> List[Optional[Box2]]: ...
+
+    async def get_item_bounding_box(
+        self,
+        items: Union[BoardItem, Sequence[BoardItem]],
+        include_text: bool = False
+    ) -> Union[Optional[Box2], List[Optional[Box2]]]:
+        """Gets the KiCad-calculated bounding box for an item or items; see
+        Board.get_item_bounding_box"""
+        cmd = self._get_bounding_box_command(items, include_text)
+        response = await self._kicad.send(cmd, editor_commands_pb2.GetBoundingBoxResponse)
+        return self._parse_bounding_boxes(items, response)
+
+    @overload
+    async def get_pad_shapes_as_polygons(
+        self, pads: Pad, layer: BoardLayer.ValueType = BoardLayer.BL_F_Cu
+    ) -> Optional[PolygonWithHoles]: ...
+
+    @overload
+    async def get_pad_shapes_as_polygons(
+        self, pads: Sequence[Pad], layer: BoardLayer.ValueType = BoardLayer.BL_F_Cu
+    ) -> List[Optional[PolygonWithHoles]]: ...
+
+    async def get_pad_shapes_as_polygons(
+        self, pads: Union[Pad, Sequence[Pad]], layer: BoardLayer.ValueType = BoardLayer.BL_F_Cu
+    ) -> Union[Optional[PolygonWithHoles], List[Optional[PolygonWithHoles]]]:
+        """Retrieves the polygonal shape of one or more pads on a given layer; see
+        Board.get_pad_shapes_as_polygons"""
+        cmd = self._get_pad_shapes_command(pads, layer)
+        response = await self._kicad.send(cmd, board_commands_pb2.PadShapeAsPolygonResponse)
+        return self._parse_pad_shapes(pads, response)
+
+    async def check_padstack_presence_on_layers(
+        self,
+        items: Union[BoardItem, Iterable[BoardItem]],
+        layers: Union[board_types_pb2.BoardLayer.ValueType, Iterable[board_types_pb2.BoardLayer.ValueType]]
+    ) -> Dict[BoardItem, Dict[board_types_pb2.BoardLayer.ValueType, bool]]:
+        """Checks if the given items with padstacks (pads or vias) have content on the given
+        layers; see Board.check_padstack_presence_on_layers"""
+        items_map: Dict[str, BoardItem] = {}
+        cmd = self._padstack_presence_command(items, layers, items_map)
+        response = await self._kicad.send(cmd, board_commands_pb2.PadstackPresenceResponse)
+        return self._parse_padstack_presence(items_map, response)
+
+    async def hit_test(self, item: Item, position: Vector2, tolerance: int = 0) -> bool:
+        """Performs a hit test on a board item at a given position"""
+        cmd = self._hit_test_command(item, position, tolerance)
+        return (await self._kicad.send(cmd, HitTestResponse)).result == HitTestResult.HTR_HIT
+
+    async def hit_test_many(
+        self, tests: Iterable[Tuple[Item, Vector2]], tolerance: int = 0
+    ) -> List[bool]:
+        """Performs hit tests for many (item, position) pairs; see Board.hit_test_many.  The
+        requests are awaited concurrently, in groups of up to 64."""
+        commands = [
+            self._hit_test_command(item, position, tolerance) for item, position in tests
+        ]
+        results: List[bool] = []
+
+        for start in range(0, len(commands), 64):
+            responses = await asyncio.gather(*(
+                self._kicad.send(command, HitTestResponse) for command in commands[start:start + 64]
+            ))
+            results.extend(r.result == HitTestResult.HTR_HIT for r in responses)
+
+        return results
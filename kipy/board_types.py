@@ -19,7 +19,8 @@
 # SOFTWARE.
 
 import sys
-from typing import Dict, Sequence, Optional, Union
+import math
+from typing import Dict, List, Sequence, Optional, Tuple, Union
 from google.protobuf.message import Message
 from google.protobuf.any_pb2 import Any
 
@@ -42,16 +43,21 @@ from kipy.common_types import (
     TextBox,
 )
 from kipy.geometry import (
+    DEFAULT_MAX_ERROR,
     Angle,
     Box2,
+    PointArray,
     Vector2,
     Vector3D,
     PolygonWithHoles,
     arc_angle,
     arc_center,
+    arc_points,
     arc_radius,
     arc_start_angle,
     arc_end_angle,
+    _arc_bounds,
+    _box_from_bounds,
 )
 from kipy.util import unpack_any
 from kipy.util.board_layer import is_copper_layer, iter_copper_layers
@@ -61,6 +67,10 @@ from kipy.wrapper import Item, Wrapper
 # Re-exported protobuf enum types
 from kipy.proto.board.board_types_pb2 import (  # noqa
     PSS_CIRCLE,
+    PSS_CUSTOM,
+    PSS_OVAL,
+    PSS_ROUNDRECT,
+    PSS_TRAPEZOID,
     PST_NORMAL,
     BoardLayer,
     ChamferedRectCorners,
@@ -98,6 +108,81 @@ class BoardItem(Item):
     def id(self) -> KIID:
         return self.proto.id
 
+def _box_bounds(box: Box2) -> Tuple[int, int, int, int]:
+    pos, size = box.pos, box.size
+    return pos.x, pos.y, pos.x + size.x, pos.y + size.y
+
+def _track_bounds(track: board_types_pb2.Track) -> Tuple[int, int, int, int]:
+    start, end = track.start, track.end
+    sx, sy, ex, ey = start.x_nm, start.y_nm, end.x_nm, end.y_nm
+    half = track.width.value_nm // 2
+    return ((sx if sx < ex else ex) - half, (sy if sy < ey else ey) - half,
+            (ex if sx < ex else sx) + half, (ey if sy < ey else sy) + half)
+
+def _arc_track_bounds(arc: board_types_pb2.Arc) -> Tuple[int, int, int, int]:
+    half = arc.width.value_nm // 2
+    min_x, min_y, max_x, max_y = _arc_bounds(arc.start.x_nm, arc.start.y_nm, arc.mid.x_nm,
+                                             arc.mid.y_nm, arc.end.x_nm, arc.end.y_nm)
+    return min_x - half, min_y - half, max_x + half, max_y + half
+
+def _via_bounds(via: board_types_pb2.Via) -> Tuple[int, int, int, int]:
+    radius = max((max(layer.size.x_nm, layer.size.y_nm) for layer in via.pad_stack.copper_layers),
+                 default=0) // 2
+    x, y = via.position.x_nm, via.position.y_nm
+    return x - radius, y - radius, x + radius, y + radius
+
+def _pad_bounds(pad: board_types_pb2.Pad) -> Tuple[int, int, int, int]:
+    """Bounds the copper of a pad on all of its layers.  Each layer's shape is reduced to a
+    rectangle with rounded corners (circles, ovals and rounded rectangles are exact) that is
+    rotated with the padstack; custom shape primitives are bounded by their rotated boxes."""
+    angle = math.radians(pad.pad_stack.angle.value_degrees)
+    cos, sin = math.cos(angle), math.sin(angle)
+    x, y = pad.position.x_nm, pad.position.y_nm
+    xs: List[float] = [x]
+    ys: List[float] = [y]
+
+    def rotated(px: float, py: float) -> Tuple[float, float]:
+        # The same sense of rotation as Vector2.rotate
+        return px * cos + py * sin, py * cos - px * sin
+
+    for layer in pad.pad_stack.copper_layers:
+        half_x = layer.size.x_nm / 2
+        half_y = layer.size.y_nm / 2
+        rounding = 0.0
+
+        if layer.shape == PSS_CIRCLE:
+            half_y = half_x
+            rounding = half_x
+        elif layer.shape == PSS_OVAL:
+            rounding = min(half_x, half_y)
+        elif layer.shape == PSS_ROUNDRECT:
+            rounding = layer.corner_rounding_ratio * 2 * min(half_x, half_y)
+        elif layer.shape == PSS_TRAPEZOID:
+            half_x += abs(layer.trapezoid_delta.y_nm) / 2
+            half_y += abs(layer.trapezoid_delta.x_nm) / 2
+
+        offset_x, offset_y = rotated(layer.offset.x_nm, layer.offset.y_nm)
+        inner_x, inner_y = half_x - rounding, half_y - rounding
+        extent_x = abs(inner_x * cos) + abs(inner_y * sin) + rounding
+        extent_y = abs(inner_x * sin) + abs(inner_y * cos) + rounding
+        xs += [x + offset_x - extent_x, x + offset_x + extent_x]
+        ys += [y + offset_y - extent_y, y + offset_y + extent_y]
+
+        if layer.shape == PSS_CUSTOM:
+            for proto in layer.custom_shapes:
+                shape = to_concrete_board_shape(BoardShape(proto))
+                if shape is None:
+                    continue
+
+                min_x, min_y, max_x, max_y = _box_bounds(shape.bounding_box())
+                for corner_x, corner_y in ((min_x, min_y), (max_x, min_y), (min_x, max_y),
+                                           (max_x, max_y)):
+                    dx, dy = rotated(corner_x, corner_y)
+                    xs.append(x + dx)
+                    ys.append(y + dy)
+
+    return round(min(xs)), round(min(ys)), round(max(xs)), round(max(ys))
+
 
 class Net(Wrapper):
     def __init__(self, proto: Optional[board_types_pb2.Net] = None):
@@ -191,6 +276,13 @@ class Track(BoardItem):
         """Calculates track length in nanometers"""
         return (self.end - self.start).length()
 
+    def bounding_box(self) -> Box2:
+        """Calculates the bounding box of the track, including its width, without a request to
+        KiCad
+
+        .. versionadded:: 0.6.0"""
+        return _box_from_bounds(*_track_bounds(self._proto))
+
 
 class ArcTrack(BoardItem):
     """Represents an arc track segment"""
@@ -306,11 +398,20 @@ class ArcTrack(BoardItem):
         return angle*self.radius()
 
     def bounding_box(self) -> Box2:
-        box = Box2()
-        box.merge(self.start)
-        box.merge(self.end)
-        box.merge(self.mid)
-        return box
+        """Calculates the bounding box of the arc track, including its width, without a request
+        to KiCad
+
+        .. versionchanged:: 0.6.0
+           Includes the width of the track and the full extent of the arc rather than only its
+           three points"""
+        return _box_from_bounds(*_arc_track_bounds(self._proto))
+
+    def tessellate(self, max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+        """Flattens the centerline of the arc track to points from start to end, as by
+        :func:`~kipy.geometry.arc_points`; the width of the track is not included
+
+        .. versionadded:: 0.6.0"""
+        return arc_points(self.start, self.mid, self.end, max_error)
 
 class BoardShape(BoardItem):
     """Represents a graphic shape on a board or footprint"""
@@ -361,6 +462,19 @@ class BoardShape(BoardItem):
     def attributes(self, attributes: GraphicAttributes):
         self._proto.shape.attributes.CopyFrom(attributes.proto)
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        """The bounds of the shape's geometry, as (min_x, min_y, max_x, max_y)"""
+        raise NotImplementedError(f"bounding_box() not implemented for {self.__class__.__name__}")
+
+    def bounding_box(self) -> Box2:
+        """Calculates the bounding box of the shape, including its stroke width, without a
+        request to KiCad
+
+        .. versionadded:: 0.6.0"""
+        min_x, min_y, max_x, max_y = self._bounds()
+        half = self._proto.shape.attributes.stroke.width.value_nm // 2
+        return _box_from_bounds(min_x - half, min_y - half, max_x + half, max_y + half)
+
     def move(self, delta: Vector2):
         raise NotImplementedError(f"move() not implemented for {self.__class__.__name__}")
 
@@ -394,6 +508,9 @@ class BoardSegment(BoardShape, Segment):
             f"{net_repr})"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Segment.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the segment by the given delta vector"""
         self.start += delta
@@ -431,6 +548,9 @@ class BoardArc(BoardShape, Arc):
             f"layer={BoardLayer.Name(self.layer)}{net_repr})"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Arc.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the arc by the given delta vector"""
         self.start += delta
@@ -470,6 +590,9 @@ class BoardCircle(BoardShape, Circle):
             f"layer={BoardLayer.Name(self.layer)}{net_repr})"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Circle.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the circle by the given delta vector"""
         self.center += delta
@@ -510,6 +633,9 @@ class BoardRectangle(BoardShape, Rectangle):
             f"layer={BoardLayer.Name(self.layer)}{net_repr}"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Rectangle.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the rectangle by the given delta vector"""
         self.top_left += delta
@@ -547,6 +673,9 @@ class BoardPolygon(BoardShape, Polygon):
             f"{net_repr})"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Polygon.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the polygon by the given delta vector"""
         for polygon in self.polygons:
@@ -584,6 +713,9 @@ class BoardBezier(BoardShape, Bezier):
             f"end={self.end}, layer={BoardLayer.Name(self.layer)}{net_repr})"
         )
 
+    def _bounds(self) -> Tuple[int, int, int, int]:
+        return _box_bounds(Bezier.bounding_box(self))
+
     def move(self, delta: Vector2):
         """Moves the bezier curve by the given delta vector"""
         self.start += delta
@@ -1323,6 +1455,14 @@ class Pad(BoardItem):
     def pad_to_die_length(self, length: int):
         self._proto.pad_to_die_length.value_nm = length
 
+    def bounding_box(self) -> Box2:
+        """Calculates the bounding box of the pad's copper on all of its layers, without a
+        request to KiCad.  The box is exact for circular, oval, rectangular and rounded
+        rectangular pads, and may be slightly larger than KiCad's for other shapes.
+
+        .. versionadded:: 0.6.0"""
+        return _box_from_bounds(*_pad_bounds(self._proto))
+
 
 class Via(BoardItem):
     def __init__(self, proto: Optional[board_types_pb2.Via] = None,
@@ -1424,6 +1564,13 @@ class Via(BoardItem):
     def drill_diameter(self, diameter: int):
         self.padstack.drill.diameter = Vector2.from_xy(diameter, diameter)
 
+    def bounding_box(self) -> Box2:
+        """Calculates the bounding box of the via's largest copper pad, without a request to
+        KiCad
+
+        .. versionadded:: 0.6.0"""
+        return _box_from_bounds(*_via_bounds(self._proto))
+
 
 class FootprintAttributes(Wrapper):
     """The built-in attributes that a Footprint or FootprintInstance may have"""
@@ -1808,6 +1955,23 @@ class FootprintInstance(BoardItem):
         """
         return SheetPath(self._proto.symbol_path)
 
+    def bounding_box(self) -> Box2:
+        """Calculates the bounding box of the footprint's pads and graphic shapes, without a
+        request to KiCad.  Unlike KiCad's bounding box, it does not include text, which cannot
+        be measured without the font.
+
+        .. versionadded:: 0.6.0"""
+        bounds = [_pad_bounds(pad.proto) for pad in self.definition.pads]
+        bounds.extend(_box_bounds(shape.bounding_box()) for shape in self.definition.shapes
+                      if not isinstance(shape, BoardPolygon) or shape.polygons)
+
+        if not bounds:
+            position = self._proto.position
+            return Box2.from_xywh(position.x_nm, position.y_nm, 0, 0)
+
+        return _box_from_bounds(min(b[0] for b in bounds), min(b[1] for b in bounds),
+                                max(b[2] for b in bounds), max(b[3] for b in bounds))
+
 
 class ZoneFilledPolygons(Wrapper):
     """Represents the set of filled polygons of a zone on a single board layer"""
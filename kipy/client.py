@@ -18,74 +18,734 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import asyncio
+import random
+import threading
+import time
 import pynng
-from typing import TypeVar
+from collections import deque
+from typing import (
+    Collection, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union,
+    cast
+)
 
 from google.protobuf.message import Message
 
 from kipy.errors import ApiError, ConnectionError
-from kipy.proto.common import ApiRequest, ApiResponse, ApiStatusCode
+from kipy.metrics import MetricsCollector, RequestSample
+from kipy.proto.common import ApiRequestHeader, ApiResponse, ApiStatusCode
+from kipy.proto.common.commands import Ping
 
-class KiCadClient:
+R = TypeVar('R', bound=Message)
+
+# Wire tags for length-delimited fields 1 and 2; these are ApiRequest.header/message and
+# google.protobuf.Any.type_url/value
+_FIELD_1 = b'\x0a'
+_FIELD_2 = b'\x12'
+
+_TYPE_URL_PREFIX = "type.googleapis.com/"
+
+# Attribute lookups on protobuf enum wrappers are surprisingly slow, so resolve this once
+_AS_OK = ApiStatusCode.AS_OK
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _length_delimited(tag: bytes, data: bytes) -> bytes:
+    return tag + _varint(len(data)) + data
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        initial_delay_s: float = 0.01,
+        max_delay_s: float = 1.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        retryable_codes: Collection[ApiStatusCode.ValueType] = (ApiStatusCode.AS_BUSY,),
+        retry_on_timeout: bool = False,
+    ):
+        """Describes how a client retries requests that KiCad could not handle right away, for
+        example because it is busy filling zones or running an interactive tool.
+
+        A request is retried when KiCad answers with one of `retryable_codes` (or, if
+        `retry_on_timeout` is set, when no answer arrives in time), up to a total of
+        `max_attempts` attempts.  This applies to single requests and to the commands of a
+        pipelined batch alike.  The wait before each retry starts at `initial_delay_s` and
+        grows by `multiplier` up to `max_delay_s`, and is randomly shortened by up to a fraction
+        `jitter` of itself so that several clients do not retry in lockstep.
+
+        Only enable `retry_on_timeout` for requests that are safe to repeat: a request that timed
+        out may still have been carried out.
+
+        .. versionadded:: 0.6.0
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+        self.max_attempts = max_attempts
+        self.initial_delay_s = initial_delay_s
+        self.max_delay_s = max_delay_s
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retryable_codes = frozenset(retryable_codes)
+        self.retry_on_timeout = retry_on_timeout
+
+    def __repr__(self) -> str:
+        return (f"RetryPolicy(max_attempts={self.max_attempts}, "
+                f"initial_delay_s={self.initial_delay_s}, max_delay_s={self.max_delay_s})")
+
+    def delays(self) -> Iterator[float]:
+        """Yields the wait before each retry, in seconds; there are max_attempts - 1 of them"""
+        delay = self.initial_delay_s
+        for _ in range(self.max_attempts - 1):
+            yield delay * (1 - self.jitter * random.random())
+            delay = min(delay * self.multiplier, self.max_delay_s)
+
+    def should_retry(self, error: Exception) -> bool:
+        if isinstance(error, ApiError):
+            return error.code in self.retryable_codes
+        return self.retry_on_timeout and isinstance(error, ConnectionError)
+
+class _ClientBase:
+    """Request packing and reply parsing shared by the synchronous and asynchronous clients"""
     def __init__(self, socket_path: str, client_name: str, kicad_token: str, timeout_ms: int):
         self._socket_path = socket_path
         self._client_name = client_name
         self._kicad_token = kicad_token
         self._timeout_ms = timeout_ms
         self._connected = False
+        self._header_field: Optional[bytes] = None
+        self._type_urls: Dict[type[Message], Tuple[str, bytes]] = {}
+        self._metrics: Optional[MetricsCollector] = None
+        self._retry_policy: Optional[RetryPolicy] = None
 
-    def _connect(self):
-        if self._connected:
-            self._conn.close()
-
+    def _dial(self) -> pynng.Req0:
         try:
-            self._conn = pynng.Req0(dial=self._socket_path, block_on_dial=True,
-                                    send_timeout=self._timeout_ms, recv_timeout=self._timeout_ms)
-            self._connected = True
+            return pynng.Req0(dial=self._socket_path, block_on_dial=True,
+                              send_timeout=self._timeout_ms, recv_timeout=self._timeout_ms)
         except pynng.exceptions.NNGException as e:
-            self._connected = False
             raise ConnectionError(f"Failed to connect to KiCad: {e}") from None
 
     @property
     def connected(self):
         return self._connected
 
-    R = TypeVar('R', bound=Message)
+    @property
+    def metrics(self) -> Optional[MetricsCollector]:
+        """The collector that records timings and sizes of this client's requests, or None (the
+        default) to not record them
 
-    def send(self, command: Message, response_type: type[R]) -> R:
-        if not self._connected:
-            self._connect()
+        .. versionadded:: 0.6.0"""
+        return self._metrics
 
-        envelope = ApiRequest()
-        envelope.message.Pack(command)
-        envelope.header.kicad_token = self._kicad_token
-        envelope.header.client_name = self._client_name
+    @metrics.setter
+    def metrics(self, collector: Optional[MetricsCollector]):
+        self._metrics = collector
 
-        try:
-            self._conn.send(envelope.SerializeToString())
-        except pynng.exceptions.NNGException as e:
-            raise ConnectionError(f"Failed to send command to KiCad: {e}") from None
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """How requests that fail because KiCad is busy are retried, or None (the default) to
+        raise the error straight away
 
-        try:
-            reply_data = self._conn.recv_msg()
-        except pynng.exceptions.NNGException as e:
-            raise ConnectionError(f"Error receiving reply from KiCad: {e}") from None
+        .. versionadded:: 0.6.0"""
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]):
+        self._retry_policy = policy
+
+    def _record_retry(self, command: Message):
+        if self._metrics is not None:
+            self._metrics.record_retry(command)
+
+    def _type_url(self, message_type: type[Message]) -> Tuple[str, bytes]:
+        """Returns the full name of a message type, and its type URL encoded as Any.type_url"""
+        cached = self._type_urls.get(message_type)
+        if cached is None:
+            name = message_type.DESCRIPTOR.full_name
+            url = _TYPE_URL_PREFIX + name
+            cached = (name, _length_delimited(_FIELD_1, url.encode()))
+            self._type_urls[message_type] = cached
+        return cached
+
+    def _pack_request(self, command: Message) -> bytes:
+        """Serializes an ApiRequest wrapping the given command.
 
+        The header only changes when the KiCad token is learned, so its encoding is cached, and
+        the command is written straight into the Any field rather than being packed into an
+        intermediate message and copied again.  The result is byte-for-byte what
+        ApiRequest.SerializeToString() would produce.
+        """
+        header = self._header_field
+        if header is None:
+            fields = ApiRequestHeader(kicad_token=self._kicad_token, client_name=self._client_name)
+            header = _length_delimited(_FIELD_1, fields.SerializeToString())
+            self._header_field = header
+
+        message = self._type_url(type(command))[1]
+        value = command.SerializeToString()
+        if value:
+            message += _length_delimited(_FIELD_2, value)
+
+        return header + _length_delimited(_FIELD_2, message)
+
+    def _unpack_reply(self, reply_data: bytes, command: Message, response_type: type[R]) -> R:
         reply = ApiResponse()
-        reply.ParseFromString(reply_data.bytes)
+        reply.ParseFromString(reply_data)
 
-        if reply.status.status == ApiStatusCode.AS_OK:
+        if reply.status.status == _AS_OK:
             response = response_type()
 
-            if not reply.message.Unpack(response):
+            # Equivalent to Any.Unpack(), without its descriptor lookups
+            if reply.message.type_url.rpartition('/')[2] != self._type_url(response_type)[0]:
                 raise ApiError(
                     f"Failed to unpack {response_type.__name__} from the response to {type(command).__name__}"
                 )
 
+            response.ParseFromString(reply.message.value)
+
             if self._kicad_token == "":
                 self._kicad_token = reply.header.kicad_token
+                self._header_field = None
 
             return response
         else:
             raise ApiError(f"KiCad returned error: {reply.status.error_message}",
                            raw_message=reply.status.error_message, code=reply.status.status)
+
+class KiCadClient(_ClientBase):
+    def __init__(self, socket_path: str, client_name: str, kicad_token: str, timeout_ms: int,
+                 pipeline_window: int = 8):
+        """A client holding a single connection to KiCad.  Requests from multiple threads are
+        serialized; use :class:`PooledKiCadClient` to run them concurrently.
+
+        :param pipeline_window: The default number of requests that :meth:`send_pipelined` keeps
+            in flight at once
+        """
+        super().__init__(socket_path, client_name, kicad_token, timeout_ms)
+        self._pipeline_window = pipeline_window
+        self._contexts: List[pynng.Context] = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connected:
+            self._close_contexts()
+            self._conn.close()
+
+        self._connected = False
+        self._conn = self._dial()
+        self._connected = True
+
+    def _close_contexts(self):
+        for ctx in self._contexts:
+            ctx.close()
+        self._contexts.clear()
+
+    def close(self):
+        """Closes the connection to KiCad; the next request will reconnect
+
+        .. versionadded:: 0.6.0"""
+        if not self._connected:
+            return
+
+        self._close_contexts()
+        self._conn.close()
+        self._connected = False
+
+    @property
+    def pipeline_window(self) -> int:
+        """The default number of requests that :meth:`send_pipelined` keeps in flight at once
+
+        .. versionadded:: 0.6.0"""
+        return self._pipeline_window
+
+    @pipeline_window.setter
+    def pipeline_window(self, window: int):
+        if window < 1:
+            raise ValueError("pipeline_window must be at least 1")
+        self._pipeline_window = window
+
+    @staticmethod
+    def _exchange(conn: pynng.Req0, data: bytes, sample: Optional[RequestSample] = None) -> bytes:
+        try:
+            conn.send(data)
+        except pynng.exceptions.NNGException as e:
+            raise ConnectionError(f"Failed to send command to KiCad: {e}") from None
+
+        if sample is not None:
+            sample.mark_sent()
+
+        try:
+            return conn.recv_msg().bytes
+        except pynng.exceptions.NNGException as e:
+            raise ConnectionError(f"Error receiving reply from KiCad: {e}") from None
+
+    def _round_trip(self, data: bytes, sample: Optional[RequestSample] = None) -> bytes:
+        with self._lock:
+            if not self._connected:
+                self._connect()
+
+            return self._exchange(self._conn, data, sample)
+
+    def send(self, command: Message, response_type: type[R]) -> R:
+        policy = self._retry_policy
+        if policy is None:
+            return self._send_once(command, response_type)
+
+        for delay in policy.delays():
+            try:
+                return self._send_once(command, response_type)
+            except (ApiError, ConnectionError) as e:
+                if not policy.should_retry(e):
+                    raise
+
+            self._record_retry(command)
+            time.sleep(delay)
+
+        return self._send_once(command, response_type)
+
+    def _send_once(self, command: Message, response_type: type[R]) -> R:
+        if self._metrics is None:
+            reply_data = self._round_trip(self._pack_request(command))
+            return self._unpack_reply(reply_data, command, response_type)
+
+        with self._metrics.begin(command) as sample:
+            data = self._pack_request(command)
+            sample.mark_packed(data)
+            reply_data = self._round_trip(data, sample)
+            sample.mark_received(reply_data)
+            return self._unpack_reply(reply_data, command, response_type)
+
+    def send_pipelined(
+        self,
+        commands: Iterable[Message],
+        response_type: Union[type[R], Sequence[type[R]]],
+        window: Optional[int] = None,
+    ) -> List[R]:
+        """Sends a batch of commands without waiting for each reply before sending the next.
+
+        Up to `window` requests are kept in flight at once, each on its own nng context of the
+        client's socket, so the cost of a batch approaches one round trip per `window` commands
+        rather than one per command.  Replies are returned in the same order as `commands`.
+
+        If KiCad returns an error for any command, the remaining replies are still collected and
+        the first error is raised once the batch is complete.  With a :attr:`retry_policy`, the
+        commands that failed with a retryable error are sent again as a smaller batch (the
+        others are not repeated) before any error is raised.  If the policy retries timeouts, a
+        command whose reply does not arrive in time is retried in the same way, together with
+        the commands that had not been sent yet; otherwise the connection error is raised at once.
+
+        :param commands: The commands to send; may be a generator, which is consumed lazily
+        :param response_type: The expected response type for every command, or a sequence giving
+            the response type for each command in turn
+        :param window: The maximum number of requests in flight, or None to use
+            :attr:`pipeline_window`
+        :return: The responses, in the same order as the commands
+
+        .. versionadded:: 0.6.0
+        """
+        window = self._pipeline_window if window is None else window
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        with self._lock:
+            if not self._connected:
+                self._connect()
+
+            return self._pipeline(self._conn, self._contexts, commands, response_type, window)
+
+    def _pipeline(
+        self,
+        conn: pynng.Req0,
+        contexts: List[pynng.Context],
+        commands: Iterable[Message],
+        response_type: Union[type[R], Sequence[type[R]]],
+        window: int,
+    ) -> List[R]:
+        results, failures = self._pipeline_once(conn, contexts, commands, response_type, window)
+        policy = self._retry_policy
+
+        if policy is not None and failures:
+            for delay in policy.delays():
+                retry = sorted(i for i, (_, _, e) in failures.items() if policy.should_retry(e))
+                if not retry:
+                    break
+
+                for i in retry:
+                    self._record_retry(failures[i][0])
+                time.sleep(delay)
+
+                retried, retry_failures = self._pipeline_once(
+                    conn, contexts, [failures[i][0] for i in retry],
+                    [failures[i][1] for i in retry], window
+                )
+
+                for j, i in enumerate(retry):
+                    results[i] = retried[j]
+                    del failures[i]
+
+                for j, failure in retry_failures.items():
+                    failures[retry[j]] = failure
+
+        if failures:
+            raise failures[min(failures)][2]
+
+        return results
+
+    def _pipeline_once(
+        self,
+        conn: pynng.Req0,
+        contexts: List[pynng.Context],
+        commands: Iterable[Message],
+        response_type: Union[type[R], Sequence[type[R]]],
+        window: int,
+    ) -> Tuple[List[R], Dict[int, Tuple[Message, type[R], Exception]]]:
+        """Sends a batch of commands, returning the replies in order and the command, expected
+        response type, and error of each one that failed, by position.
+
+        A connection error is raised at once unless the retry policy retries timeouts, in which
+        case it is recorded like a refused command and the commands not yet sent are recorded
+        with it, so that they are sent again rather than each waiting out its own timeout."""
+        while len(contexts) < window:
+            contexts.append(conn.new_context())
+
+        policy = self._retry_policy
+        retry_timeouts = policy is not None and policy.retry_on_timeout
+        metrics = self._metrics
+        free = contexts[:window]
+        in_flight: Deque[Tuple[pynng.Context, Message, type[R], Optional[RequestSample]]] = deque()
+        results: List[R] = []
+        failures: Dict[int, Tuple[Message, type[R], Exception]] = {}
+        broken: List[ConnectionError] = []
+
+        def fail(command: Message, expected: type[R], error: Exception):
+            failures[len(results)] = (command, expected, error)
+            results.append(cast(R, None))
+
+        def complete_oldest():
+            ctx, command, expected, sample = in_flight.popleft()
+
+            try:
+                reply_data = ctx.recv_msg().bytes
+            except pynng.exceptions.NNGException as e:
+                error = ConnectionError(f"Error receiving reply from KiCad: {e}")
+                if sample is not None:
+                    sample.finish(error)
+                if not retry_timeouts:
+                    raise error from None
+                fail(command, expected, error)
+                broken.append(error)
+                return
+            finally:
+                free.append(ctx)
+
+            if sample is not None:
+                sample.mark_received(reply_data)
+
+            try:
+                results.append(self._unpack_reply(reply_data, command, expected))
+            except ApiError as e:
+                fail(command, expected, e)
+                if sample is not None:
+                    sample.finish(e)
+            else:
+                if sample is not None:
+                    sample.finish()
+
+        response_types = (
+            iter(response_type) if isinstance(response_type, Sequence) else None
+        )
+
+        for command in commands:
+            if not free and not broken:
+                complete_oldest()
+
+            expected = next(response_types) if response_types is not None else response_type
+            if broken:
+                while in_flight:
+                    complete_oldest()
+                fail(command, cast(type[R], expected), broken[0])
+                continue
+
+            ctx = free.pop()
+            sample = metrics.begin(command) if metrics is not None else None
+            data = self._pack_request(command)
+
+            if sample is not None:
+                sample.mark_packed(data)
+
+            try:
+                ctx.send(data)
+            except pynng.exceptions.NNGException as e:
+                error = ConnectionError(f"Failed to send command to KiCad: {e}")
+                free.append(ctx)
+                if sample is not None:
+                    sample.finish(error)
+                if not retry_timeouts:
+                    raise error from None
+                while in_flight:
+                    complete_oldest()
+                fail(command, cast(type[R], expected), error)
+                broken.append(error)
+                continue
+
+            if sample is not None:
+                sample.mark_sent()
+
+            in_flight.append((ctx, command, cast(type[R], expected), sample))
+
+        while in_flight:
+            complete_oldest()
+
+        return results, failures
+
+class _PooledConnection:
+    def __init__(self, conn: pynng.Req0, generation: int):
+        self.conn = conn
+        self.contexts: List[pynng.Context] = []
+        self.last_used = time.monotonic()
+        # The number of times the pool had been closed when the connection was opened
+        self.generation = generation
+
+    def close(self):
+        for ctx in self.contexts:
+            ctx.close()
+        self.conn.close()
+
+class PooledKiCadClient(KiCadClient):
+    def __init__(self, socket_path: str, client_name: str, kicad_token: str, timeout_ms: int,
+                 max_connections: int = 4, health_check_after_s: float = 5.0,
+                 pipeline_window: int = 8):
+        """A thread-safe client that keeps a pool of connections to KiCad, so that requests made
+        from several threads (for example, workers of a ThreadPoolExecutor sharing one KiCad
+        object) run concurrently instead of queueing behind a single socket.
+
+        Connections are dialed lazily, up to `max_connections`; when all are busy, further
+        requests wait for one to be returned to the pool.  A connection that has sat idle for
+        longer than `health_check_after_s` is checked with a Ping before being reused, and is
+        replaced if it no longer responds.
+
+        .. versionadded:: 0.6.0
+        """
+        super().__init__(socket_path, client_name, kicad_token, timeout_ms, pipeline_window)
+
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+
+        self._max_connections = max_connections
+        self._health_check_after_s = health_check_after_s
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle: Deque[_PooledConnection] = deque()
+        self._open_count = 0
+        self._generation = 0
+
+    @property
+    def max_connections(self) -> int:
+        return self._max_connections
+
+    @property
+    def connected(self):
+        return self._open_count > 0
+
+    def close(self):
+        """Closes the idle connections in the pool; connections in use are closed when they are
+        returned.  The next request opens a new connection."""
+        with self._lock:
+            self._generation += 1
+            while self._idle:
+                self._idle.pop().close()
+                self._open_count -= 1
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        try:
+            self._exchange(pooled.conn, self._pack_request(Ping()))
+        except ConnectionError:
+            return False
+        return True
+
+    def _checkout(self) -> _PooledConnection:
+        self._slots.acquire()
+
+        try:
+            while True:
+                with self._lock:
+                    pooled = self._idle.pop() if self._idle else None
+
+                if pooled is None:
+                    with self._lock:
+                        generation = self._generation
+                    pooled = _PooledConnection(self._dial(), generation)
+                    with self._lock:
+                        self._open_count += 1
+                    return pooled
+
+                if (time.monotonic() - pooled.last_used < self._health_check_after_s
+                        or self._is_healthy(pooled)):
+                    return pooled
+
+                self._discard(pooled)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, pooled: _PooledConnection):
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            # Connections that were in use when the pool was closed are closed now
+            closed = pooled.generation != self._generation
+            if not closed:
+                self._idle.append(pooled)
+
+        if closed:
+            self._discard(pooled)
+        self._slots.release()
+
+    def _discard(self, pooled: _PooledConnection):
+        pooled.close()
+        with self._lock:
+            self._open_count -= 1
+
+    def _round_trip(self, data: bytes, sample: Optional[RequestSample] = None) -> bytes:
+        pooled = self._checkout()
+
+        try:
+            reply_data = self._exchange(pooled.conn, data, sample)
+        except ConnectionError:
+            self._discard(pooled)
+            self._slots.release()
+            raise
+
+        self._checkin(pooled)
+        return reply_data
+
+    def send_pipelined(
+        self,
+        commands: Iterable[Message],
+        response_type: Union[type[R], Sequence[type[R]]],
+        window: Optional[int] = None,
+    ) -> List[R]:
+        """Sends a batch of commands on one connection from the pool; see
+        :meth:`KiCadClient.send_pipelined`"""
+        window = self._pipeline_window if window is None else window
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        pooled = self._checkout()
+
+        try:
+            results = self._pipeline(pooled.conn, pooled.contexts, commands, response_type, window)
+        except ConnectionError:
+            self._discard(pooled)
+            self._slots.release()
+            raise
+        except BaseException:
+            self._checkin(pooled)
+            raise
+
+        self._checkin(pooled)
+        return results
+
+class AsyncKiCadClient(_ClientBase):
+    """An asyncio (or trio) client that can keep many requests in flight at once.
+
+    Each outstanding request runs on its own nng context of a single dialed socket, so awaiting
+    several calls concurrently (for example with ``asyncio.gather``) overlaps their round trips
+    instead of serializing them.
+
+    .. versionadded:: 0.6.0"""
+    def __init__(self, socket_path: str, client_name: str, kicad_token: str, timeout_ms: int):
+        super().__init__(socket_path, client_name, kicad_token, timeout_ms)
+        self._contexts: list[pynng.Context] = []
+
+    def _connect(self):
+        if self._connected:
+            self.close()
+
+        self._conn = self._dial()
+        self._connected = True
+
+    def close(self):
+        """Closes the connection to KiCad, including any idle request contexts"""
+        if not self._connected:
+            return
+
+        for ctx in self._contexts:
+            ctx.close()
+        self._contexts.clear()
+        self._conn.close()
+        self._connected = False
+
+    def _acquire_context(self) -> pynng.Context:
+        if self._contexts:
+            return self._contexts.pop()
+        return self._conn.new_context()
+
+    def _release_context(self, ctx: pynng.Context):
+        if self._connected:
+            self._contexts.append(ctx)
+        else:
+            ctx.close()
+
+    async def _round_trip(self, data: bytes, sample: Optional[RequestSample] = None) -> bytes:
+        if not self._connected:
+            self._connect()
+
+        ctx = self._acquire_context()
+
+        try:
+            try:
+                await ctx.asend(data)
+            except pynng.exceptions.NNGException as e:
+                raise ConnectionError(f"Failed to send command to KiCad: {e}") from None
+
+            if sample is not None:
+                sample.mark_sent()
+
+            try:
+                reply_data = await ctx.arecv_msg()
+            except pynng.exceptions.NNGException as e:
+                raise ConnectionError(f"Error receiving reply from KiCad: {e}") from None
+        except BaseException:
+            # A context abandoned mid-request (error or cancellation) can't be safely reused
+            ctx.close()
+            raise
+
+        self._release_context(ctx)
+        return reply_data.bytes
+
+    async def send(self, command: Message, response_type: type[R]) -> R:
+        policy = self._retry_policy
+        if policy is None:
+            return await self._send_once(command, response_type)
+
+        for delay in policy.delays():
+            try:
+                return await self._send_once(command, response_type)
+            except (ApiError, ConnectionError) as e:
+                if not policy.should_retry(e):
+                    raise
+
+            self._record_retry(command)
+            await asyncio.sleep(delay)
+
+        return await self._send_once(command, response_type)
+
+    async def _send_once(self, command: Message, response_type: type[R]) -> R:
+        if self._metrics is None:
+            reply_data = await self._round_trip(self._pack_request(command))
+            return self._unpack_reply(reply_data, command, response_type)
+
+        with self._metrics.begin(command) as sample:
+            data = self._pack_request(command)
+            sample.mark_packed(data)
+            reply_data = await self._round_trip(data, sample)
+            sample.mark_received(reply_data)
+            return self._unpack_reply(reply_data, command, response_type)
@@ -24,14 +24,21 @@ from kipy.proto.common import types
 from kipy.proto.common.types import base_types_pb2
 from kipy.proto.common.types.base_types_pb2 import KIID
 from kipy.geometry import (
+    DEFAULT_MAX_ERROR,
     Box2,
+    PointArray,
     PolygonWithHoles,
     Vector2,
     arc_angle,
     arc_center,
+    arc_points,
     arc_radius,
     arc_start_angle,
     arc_end_angle,
+    bezier_points,
+    _arc_bounds,
+    _bezier_extremes,
+    _box_from_bounds,
 )
 from kipy.wrapper import Wrapper
 
@@ -536,11 +543,13 @@ class Segment(GraphicShape):
         self._graphic_proto.segment.end.CopyFrom(point.proto)
 
     def bounding_box(self) -> Box2:
-        """Calculates the bounding box of the segment"""
-        box = Box2()
-        box.merge(self.start)
-        box.merge(self.end)
-        return box
+        """Calculates the bounding box of the segment
+
+        .. versionchanged:: 0.6.0
+           No longer includes the origin"""
+        start, end = self._graphic_proto.segment.start, self._graphic_proto.segment.end
+        return _box_from_bounds(min(start.x_nm, end.x_nm), min(start.y_nm, end.y_nm),
+                                max(start.x_nm, end.x_nm), max(start.y_nm, end.y_nm))
 
 
 class Arc(GraphicShape):
@@ -617,11 +626,20 @@ class Arc(GraphicShape):
         return arc_angle(self.start, self.mid, self.end)
 
     def bounding_box(self) -> Box2:
-        box = Box2()
-        box.merge(self.start)
-        box.merge(self.end)
-        box.merge(self.mid)
-        return box
+        """Calculates the bounding box of the arc
+
+        .. versionchanged:: 0.6.0
+           Includes the full extent of the arc rather than only its three points"""
+        arc = self._graphic_proto.arc
+        return _box_from_bounds(*_arc_bounds(arc.start.x_nm, arc.start.y_nm, arc.mid.x_nm,
+                                             arc.mid.y_nm, arc.end.x_nm, arc.end.y_nm))
+
+    def tessellate(self, max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+        """Flattens the arc to points from start to end, as by
+        :func:`~kipy.geometry.arc_points`
+
+        .. versionadded:: 0.6.0"""
+        return arc_points(self.start, self.mid, self.end, max_error)
 
 
 class Circle(GraphicShape):
@@ -657,11 +675,14 @@ class Circle(GraphicShape):
         return (self.radius_point - self.center).length()
 
     def bounding_box(self) -> Box2:
-        """Calculates the bounding box of the circle"""
-        box = Box2()
-        box.merge(self.center)
-        box.inflate(int(self.radius() + 0.5))
-        return box
+        """Calculates the bounding box of the circle
+
+        .. versionchanged:: 0.6.0
+           No longer includes the origin"""
+        center = self._graphic_proto.circle.center
+        radius = int(self.radius() + 0.5)
+        return _box_from_bounds(center.x_nm - radius, center.y_nm - radius,
+                                center.x_nm + radius, center.y_nm + radius)
 
 
 class Rectangle(GraphicShape):
@@ -778,9 +799,23 @@ class Bezier(GraphicShape):
         self._graphic_proto.bezier.end.CopyFrom(point.proto)
 
     def bounding_box(self) -> Box2:
-        # TODO: maybe bring in a library for Bezier curve math so we can generate an
-        # bounding box from the curve approximation like KiCad does?
-        raise NotImplementedError()
+        """Calculates the bounding box of the curve itself, which is usually smaller than the
+        bounding box of its control points
+
+        .. versionadded:: 0.6.0"""
+        bezier = self._graphic_proto.bezier
+        min_x, max_x = _bezier_extremes(bezier.start.x_nm, bezier.control1.x_nm,
+                                        bezier.control2.x_nm, bezier.end.x_nm)
+        min_y, max_y = _bezier_extremes(bezier.start.y_nm, bezier.control1.y_nm,
+                                        bezier.control2.y_nm, bezier.end.y_nm)
+        return _box_from_bounds(min_x, min_y, max_x, max_y)
+
+    def tessellate(self, max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+        """Flattens the curve to points from start to end, as by
+        :func:`~kipy.geometry.bezier_points`
+
+        .. versionadded:: 0.6.0"""
+        return bezier_points(self.start, self.control1, self.control2, self.end, max_error)
 
 
 def to_concrete_shape(shape: GraphicShape) -> Optional[GraphicShape]:
@@ -0,0 +1,460 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Connectivity of the copper on each net.
+
+:class:`ConnectivityGraph` joins the tracks, arcs, vias and pads of a net into a graph whose
+nodes are the points where copper meets and whose edges are the tracks and arcs between them::
+
+    graphs = build_connectivity(board, nets="GND")
+    gnd = graphs["GND"]
+    stubs = gnd.dangling_ends()
+    length = gnd.routed_length(pad_a, pad_b)
+
+Track and arc ends are joined when they are on the same layer and within a tolerance of each
+other.  Ends are snapped to nodes through a hash grid, so building a graph costs time in
+proportion to the number of ends, rather than to its square as comparing every pair of tracks
+does.  An end that lands on the middle of another straight track on the same layer joins it there
+(a T junction), and an end inside the copper of a via or pad, on one of the via or pad's layers,
+joins the via or pad.  Pads are tested against their bounding box, or against their circle if
+they are circular.  Zones are not part of the graph.
+
+For code that only needs to know which track ends meet, :func:`match_endpoints` groups them with
+the same hash grid and builds no graph.
+
+.. versionadded:: 0.6.0
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from typing import (
+    Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union, cast
+)
+
+from kipy.board import Board, _NetFilter
+from kipy.board_types import (
+    PSS_CIRCLE, ArcTrack, BoardItem, BoardLayer, Pad, PadType, Track, Via, _pad_bounds,
+    _track_bounds, _via_bounds
+)
+from kipy.geometry import Vector2
+from kipy.proto.common.types import KiCadObjectType
+from kipy.spatial import Bounds, PackedRTree, _segment_distance
+from kipy.util.board_layer import iter_copper_layers
+
+_COPPER_ORDER = {layer: order for order, layer in enumerate(iter_copper_layers())}
+_ALL_COPPER = frozenset(_COPPER_ORDER)
+
+_CONNECTIVITY_TYPES = [
+    KiCadObjectType.KOT_PCB_TRACE,
+    KiCadObjectType.KOT_PCB_ARC,
+    KiCadObjectType.KOT_PCB_VIA,
+    KiCadObjectType.KOT_PCB_PAD,
+]
+
+def _copper_layers(item: Union[Via, Pad]) -> FrozenSet[BoardLayer.ValueType]:
+    """The copper layers that a via or pad connects"""
+    pad_stack = item.proto.pad_stack
+
+    if isinstance(item, Via):
+        start = _COPPER_ORDER.get(pad_stack.drill.start_layer)
+        end = _COPPER_ORDER.get(pad_stack.drill.end_layer)
+        if start is None or end is None:
+            return _ALL_COPPER
+
+        first, last = min(start, end), max(start, end)
+        return frozenset(layer for layer, order in _COPPER_ORDER.items() if first <= order <= last)
+
+    if item.pad_type == PadType.PT_NPTH:
+        return frozenset()
+
+    if item.pad_type == PadType.PT_PTH:
+        return _ALL_COPPER
+
+    layers = frozenset(layer for layer in pad_stack.layers if layer in _ALL_COPPER)
+    return layers or frozenset(layer.layer for layer in pad_stack.copper_layers)
+
+class _HashGrid:
+    """Finds stored points within a tolerance of a query point, on the same layer.  The cells
+    are several times wider than the tolerance, so most queries look at a single cell."""
+    def __init__(self, tolerance: int):
+        self._tolerance = tolerance
+        self._size = max(1, 16 * tolerance)
+        self._cells: Dict[Tuple[int, int, int], List[Tuple[int, int, int]]] = {}
+
+    def find(self, layer: int, x: int, y: int) -> Optional[int]:
+        """Returns the value stored with the nearest point within the tolerance, if any"""
+        size, tolerance = self._size, self._tolerance
+        first_x, last_x = (x - tolerance) // size, (x + tolerance) // size
+        first_y, last_y = (y - tolerance) // size, (y + tolerance) // size
+        found: Optional[int] = None
+        nearest = tolerance * tolerance
+
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                for px, py, value in self._cells.get((layer, cell_x, cell_y), ()):
+                    distance = (px - x) * (px - x) + (py - y) * (py - y)
+                    if distance <= nearest:
+                        found, nearest = value, distance
+
+        return found
+
+    def add(self, layer: int, x: int, y: int, value: int):
+        key = (layer, x // self._size, y // self._size)
+        cell = self._cells.get(key)
+
+        if cell is None:
+            self._cells[key] = [(x, y, value)]
+        else:
+            cell.append((x, y, value))
+
+def match_endpoints(
+    tracks: Iterable[Union[Track, ArcTrack]], tolerance: int = 10
+) -> List[Tuple[Vector2, List[Tuple[Union[Track, ArcTrack], bool]]]]:
+    """Finds the places where the ends of two or more tracks or arcs on the same layer meet.
+
+    Ends are snapped to the first end seen within `tolerance` nanometers through a hash grid,
+    so the whole sequence is matched in one pass rather than by comparing every pair of tracks.
+
+    :return: For each place where ends meet, its position and the tracks that end there, with
+             True if it is the track's start and False if it is the track's end
+    """
+    grid = _HashGrid(tolerance)
+    groups: List[Tuple[int, int, List[Tuple[Union[Track, ArcTrack], bool]]]] = []
+
+    for track in tracks:
+        proto = track.proto
+
+        for start, point in ((True, proto.start), (False, proto.end)):
+            index = grid.find(proto.layer, point.x_nm, point.y_nm)
+
+            if index is None:
+                index = len(groups)
+                groups.append((point.x_nm, point.y_nm, []))
+                grid.add(proto.layer, point.x_nm, point.y_nm, index)
+
+            groups[index][2].append((track, start))
+
+    return [
+        (Vector2.from_xy(x, y), ends)
+        for x, y, ends in groups
+        if len(ends) > 1 and any(track is not ends[0][0] for track, _ in ends)
+    ]
+
+class ConnectivityNode:
+    """A point where copper meets: the ends of one or more tracks and arcs on one layer, or a
+    via or pad, which may join ends on several layers"""
+    def __init__(self, index: int, x: int, y: int, layer: BoardLayer.ValueType,
+                 item: Optional[Union[Via, Pad]] = None):
+        self.index = index
+        self.x = x
+        self.y = y
+        #: The layer of the ends, or BL_UNDEFINED for a via or pad
+        self.layer = layer
+        #: The via or pad, for via and pad nodes
+        self.item = item
+        #: The tracks and arcs that end here, with True for their start and False for their end
+        self.ends: List[Tuple[Union[Track, ArcTrack], bool]] = []
+        #: (node, length, track) for each edge; the track is None for the zero-length edges
+        #: between a via or pad and the ends in its copper
+        self.edges: List[Tuple["ConnectivityNode", float, Optional[Union[Track, ArcTrack]]]] = []
+
+    def __repr__(self) -> str:
+        if self.item is not None:
+            return f"ConnectivityNode({self.item})"
+        return (
+            f"ConnectivityNode(x={self.x}, y={self.y}, layer={BoardLayer.Name(self.layer)}, "
+            f"degree={self.degree})"
+        )
+
+    @property
+    def position(self) -> Vector2:
+        return Vector2.from_xy(self.x, self.y)
+
+    @property
+    def degree(self) -> int:
+        """The number of track and arc edges meeting at this node"""
+        return sum(1 for _, _, track in self.edges if track is not None)
+
+class ConnectivityGraph:
+    """The connectivity of the tracks, arcs, vias and pads of one net.  Other item types are
+    ignored.
+
+    :param items: The items of the net
+    :param tolerance: The largest distance, in nanometers, between track ends that are joined
+    """
+    def __init__(self, items: Iterable[BoardItem], tolerance: int = 10):
+        self._tolerance = tolerance
+        self._grid = _HashGrid(tolerance)
+        self._item_nodes: Dict[str, ConnectivityNode] = {}
+        self.nodes: List[ConnectivityNode] = []
+
+        tracks: List[Union[Track, ArcTrack]] = []
+        anchors: List[Union[Via, Pad]] = []
+
+        for item in items:
+            if isinstance(item, (Track, ArcTrack)):
+                tracks.append(item)
+            elif isinstance(item, (Via, Pad)):
+                anchors.append(item)
+
+        track_ends = [(self._end_node(track, True), self._end_node(track, False))
+                      for track in tracks]
+        tees = self._find_tees(tracks, track_ends)
+
+        for track, (start, end) in zip(tracks, track_ends):
+            if isinstance(track, ArcTrack):
+                self._connect(start, end, track.length(), track)
+                continue
+
+            # A straight track is split at the ends of other tracks that meet it along its length
+            length = track.length()
+            previous, previous_t = start, 0.0
+
+            for t, node in sorted(tees.get(id(track), []), key=lambda tee: tee[0]):
+                self._connect(previous, node, (t - previous_t) * length, track)
+                previous, previous_t = node, t
+
+            self._connect(previous, end, (1.0 - previous_t) * length, track)
+
+        self._attach_anchors(anchors)
+
+    def _add_node(self, x: int, y: int, layer: BoardLayer.ValueType,
+                  item: Optional[Union[Via, Pad]] = None) -> ConnectivityNode:
+        node = ConnectivityNode(len(self.nodes), x, y, layer, item)
+        self.nodes.append(node)
+        return node
+
+    def _end_node(self, track: Union[Track, ArcTrack], start: bool) -> ConnectivityNode:
+        proto = track.proto
+        point = proto.start if start else proto.end
+        index = self._grid.find(proto.layer, point.x_nm, point.y_nm)
+
+        if index is None:
+            node = self._add_node(point.x_nm, point.y_nm, proto.layer)
+            self._grid.add(proto.layer, point.x_nm, point.y_nm, node.index)
+        else:
+            node = self.nodes[index]
+
+        node.ends.append((track, start))
+        return node
+
+    @staticmethod
+    def _connect(a: ConnectivityNode, b: ConnectivityNode, length: float,
+                 track: Optional[Union[Track, ArcTrack]]):
+        a.edges.append((b, length, track))
+        b.edges.append((a, length, track))
+
+    def _find_tees(
+        self,
+        tracks: Sequence[Union[Track, ArcTrack]],
+        track_ends: Sequence[Tuple[ConnectivityNode, ConnectivityNode]],
+    ) -> Dict[int, List[Tuple[float, ConnectivityNode]]]:
+        """Finds the nodes that lie on the copper of a straight track away from its ends, as
+        (position along the track from 0 to 1, node) for each track"""
+        # A zero-length track has no middle, and its single node is joined to others by position
+        straight = [i for i, track in enumerate(tracks)
+                    if isinstance(track, Track) and track.start != track.end]
+        tree = PackedRTree([_track_bounds(cast(Track, tracks[i]).proto) for i in straight])
+        tees: Dict[int, List[Tuple[float, ConnectivityNode]]] = defaultdict(list)
+
+        for node in self.nodes:
+            for found in tree.search(node.x, node.y, node.x, node.y):
+                track = tracks[straight[found]]
+                proto = track.proto
+
+                if proto.layer != node.layer or node in track_ends[straight[found]]:
+                    continue
+
+                sx, sy, ex, ey = proto.start.x_nm, proto.start.y_nm, proto.end.x_nm, proto.end.y_nm
+                if (_segment_distance(node.x, node.y, sx, sy, ex, ey)
+                        > proto.width.value_nm / 2 + self._tolerance):
+                    continue
+
+                length_sq = (ex - sx) * (ex - sx) + (ey - sy) * (ey - sy)
+                t = ((node.x - sx) * (ex - sx) + (node.y - sy) * (ey - sy)) / length_sq
+                tees[id(track)].append((min(1.0, max(0.0, t)), node))
+
+        return tees
+
+    def _attach_anchors(self, anchors: Sequence[Union[Via, Pad]]):
+        bounds: List[Bounds] = []
+        radii: List[Optional[float]] = []
+        layers: List[FrozenSet[BoardLayer.ValueType]] = []
+        anchor_nodes: List[ConnectivityNode] = []
+
+        for item in anchors:
+            proto = item.proto
+            node = self._add_node(proto.position.x_nm, proto.position.y_nm,
+                                  BoardLayer.BL_UNDEFINED, item)
+            self._item_nodes[item.id.value] = node
+            anchor_nodes.append(node)
+            layers.append(_copper_layers(item))
+
+            if isinstance(item, Via):
+                bounds.append(_via_bounds(proto))
+                radii.append((bounds[-1][2] - bounds[-1][0]) / 2)
+                continue
+
+            bounds.append(_pad_bounds(proto))
+            circular = all(layer.shape == PSS_CIRCLE and layer.offset.x_nm == 0
+                           and layer.offset.y_nm == 0 for layer in proto.pad_stack.copper_layers)
+            radii.append((bounds[-1][2] - bounds[-1][0]) / 2 if circular else None)
+
+        tree = PackedRTree(bounds)
+
+        def contains(anchor: int, x: int, y: int) -> bool:
+            radius = radii[anchor]
+            node = anchor_nodes[anchor]
+            return radius is None or math.hypot(x - node.x, y - node.y) <= radius
+
+        for node in self.nodes:
+            if node.item is not None:
+                continue
+
+            for anchor in tree.search(node.x, node.y, node.x, node.y):
+                if node.layer in layers[anchor] and contains(anchor, node.x, node.y):
+                    self._connect(anchor_nodes[anchor], node, 0.0, None)
+
+        # Vias in pads, and pads or vias that overlap, are joined at the via or pad centers
+        for first, node in enumerate(anchor_nodes):
+            for second in tree.search(node.x, node.y, node.x, node.y):
+                if (second != first and layers[first] & layers[second]
+                        and contains(second, node.x, node.y)
+                        and not any(other is anchor_nodes[second] for other, _, _ in node.edges)):
+                    self._connect(node, anchor_nodes[second], 0.0, None)
+
+    def node_at(self, point: Vector2, layer: BoardLayer.ValueType) -> Optional[ConnectivityNode]:
+        """Returns the node of the track ends within the tolerance of a point on a layer"""
+        index = self._grid.find(layer, point.x, point.y)
+        return self.nodes[index] if index is not None else None
+
+    def node_of(self, item: Union[Via, Pad]) -> Optional[ConnectivityNode]:
+        """Returns the node of a via or pad in the graph"""
+        return self._item_nodes.get(item.id.value)
+
+    def components(self) -> List[List[BoardItem]]:
+        """Returns the items of each group of connected copper, largest first.  A net that is
+        fully routed has one component."""
+        seen: Set[int] = set()
+        components: List[List[BoardItem]] = []
+
+        for root in self.nodes:
+            if root.index in seen:
+                continue
+
+            seen.add(root.index)
+            stack = [root]
+            items: Dict[int, BoardItem] = {}
+
+            while stack:
+                node = stack.pop()
+                if node.item is not None:
+                    items[id(node.item)] = node.item
+
+                for other, _, track in node.edges:
+                    if track is not None:
+                        items[id(track)] = track
+                    if other.index not in seen:
+                        seen.add(other.index)
+                        stack.append(other)
+
+            components.append(list(items.values()))
+
+        components.sort(key=len, reverse=True)
+        return components
+
+    def dangling_ends(self) -> List[Tuple[Union[Track, ArcTrack], Vector2]]:
+        """Returns the track and arc ends that meet nothing: no other track, via or pad"""
+        return [
+            (track, node.position)
+            for node in self.nodes
+            if node.item is None and len(node.edges) == 1
+            for track, _ in node.ends
+        ]
+
+    def junctions(self, min_degree: int = 3) -> List[ConnectivityNode]:
+        """Returns the nodes, other than vias and pads, where at least `min_degree` tracks and
+        arcs meet"""
+        return [node for node in self.nodes if node.item is None and node.degree >= min_degree]
+
+    def _shortest_path(
+        self, a: Union[Via, Pad], b: Union[Via, Pad]
+    ) -> Optional[Tuple[float, List[Union[Track, ArcTrack]]]]:
+        source, target = self.node_of(a), self.node_of(b)
+        if source is None or target is None:
+            return None
+
+        distances = {source.index: 0.0}
+        previous: Dict[int, Tuple[ConnectivityNode, Optional[Union[Track, ArcTrack]]]] = {}
+        heap = [(0.0, source.index)]
+
+        while heap:
+            distance, index = heapq.heappop(heap)
+
+            if index == target.index:
+                route: List[Union[Track, ArcTrack]] = []
+                while index in previous:
+                    node, track = previous[index]
+                    if track is not None and (not route or route[-1] is not track):
+                        route.append(track)
+                    index = node.index
+                route.reverse()
+                return distance, route
+
+            if distance > distances[index]:
+                continue
+
+            node = self.nodes[index]
+            for other, length, track in node.edges:
+                candidate = distance + length
+                if candidate < distances.get(other.index, math.inf):
+                    distances[other.index] = candidate
+                    previous[other.index] = (node, track)
+                    heapq.heappush(heap, (candidate, other.index))
+
+        return None
+
+    def routed_length(self, a: Union[Via, Pad], b: Union[Via, Pad]) -> Optional[float]:
+        """Returns the length in nanometers of the shortest route along tracks and arcs between
+        two pads or vias, or None if they are not connected"""
+        path = self._shortest_path(a, b)
+        return path[0] if path is not None else None
+
+    def route(self, a: Union[Via, Pad], b: Union[Via, Pad]) -> List[Union[Track, ArcTrack]]:
+        """Returns the tracks and arcs along the shortest route between two pads or vias, in
+        order from `a`, or an empty list if they are not connected"""
+        path = self._shortest_path(a, b)
+        return path[1] if path is not None else []
+
+def build_connectivity(
+    board: Board, nets: Optional[_NetFilter] = None, tolerance: int = 10
+) -> Dict[str, ConnectivityGraph]:
+    """Fetches the tracks, arcs, vias and pads of the given nets (by default, all of them) and
+    builds a graph for each net, keyed by net name.  Items without a net are left out."""
+    items = board.get_items(_CONNECTIVITY_TYPES, net=nets)
+    by_net: Dict[str, List[BoardItem]] = defaultdict(list)
+
+    for item in items:
+        name = cast(Union[Track, ArcTrack, Via, Pad], item).net.name
+        if name:
+            by_net[name].append(cast(BoardItem, item))
+
+    return {name: ConnectivityGraph(group, tolerance) for name, group in by_net.items()}
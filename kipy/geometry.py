@@ -21,8 +21,11 @@
 from __future__ import annotations
 
 import sys
-from typing import Optional, Union
+from functools import lru_cache
+from itertools import chain
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
 import math
+import operator
 from kipy.proto.common import types
 from kipy.util import from_mm
 from kipy.wrapper import Wrapper
@@ -32,51 +35,63 @@ if sys.version_info >= (3, 11):
 else:
     from typing_extensions import Self
 
+if TYPE_CHECKING:
+    from kipy.board_types import ArcTrack, Track
+
+#: The default maximum distance in nanometers between an arc or curve and the chords that
+#: approximate it, matching KiCad's ARC_HIGH_DEF
+DEFAULT_MAX_ERROR = 5000
+
+# The number of arcs and of Bezier curves whose flattened points, and of arcs whose bounds, are
+# kept for reuse
+_TESSELLATION_CACHE_SIZE = 1 << 14
 
 class Vector2(Wrapper):
-    """Wraps a kiapi.common.types.Vector2, aka VECTOR2I"""
-    def __init__(self, proto: Optional[types.Vector2] = None):
-        self._proto = types.Vector2()
+    """A point or vector in nanometers, aka VECTOR2I.  Corresponds to a
+    kiapi.common.types.Vector2.
 
+    .. versionchanged:: 0.6.0
+       The coordinates are held as plain integers rather than in a protobuf message, which makes
+       arithmetic several times faster; :attr:`proto` builds a message when one is needed.
+    """
+    __slots__ = ('x', 'y')
+
+    def __init__(self, proto: Optional[types.Vector2] = None):
         if proto is not None:
-            self._proto.CopyFrom(proto)
+            self.x: int = proto.x_nm
+            self.y: int = proto.y_nm
+        else:
+            self.x = 0
+            self.y = 0
 
     def __repr__(self):
         return f"Vector2({self.x}, {self.y})"
 
     @classmethod
     def from_xy(cls, x_nm: int, y_nm: int) -> Self:
-        """Initialize Vector2 with x and y values in nanometers"""
-        proto = types.Vector2()
-        proto.x_nm = x_nm
-        proto.y_nm = y_nm
-        return cls(proto)
+        """Initialize Vector2 with x and y values in nanometers
+
+        :raises TypeError: if a value is not an integer, as a protobuf message would"""
+        vector = cls.__new__(cls)
+        vector.x = operator.index(x_nm)
+        vector.y = operator.index(y_nm)
+        return vector
 
     @classmethod
     def from_xy_mm(cls, x_mm: float, y_mm: float) -> Self:
         """Initialize Vector2 with x and y values in mm
 
         .. versionadded:: 0.3.0"""
-        proto = types.Vector2()
-        proto.x_nm = from_mm(x_mm)
-        proto.y_nm = from_mm(y_mm)
-        return cls(proto)
+        return cls.from_xy(from_mm(x_mm), from_mm(y_mm))
 
     @property
-    def x(self) -> int:
-        return self._proto.x_nm
-
-    @x.setter
-    def x(self, val: int):
-        self._proto.x_nm = val
-
-    @property
-    def y(self) -> int:
-        return self._proto.y_nm
-
-    @y.setter
-    def y(self, val: int):
-        self._proto.y_nm = val
+    def proto(self) -> types.Vector2:
+        """A new kiapi.common.types.Vector2 message with this vector's coordinates.  Changing
+        the message does not change the vector."""
+        proto = types.Vector2()
+        proto.x_nm = self.x
+        proto.y_nm = self.y
+        return proto
 
     def __hash__(self):
         return hash((self.x, self.y))
@@ -87,31 +102,19 @@ class Vector2(Wrapper):
         return NotImplemented
 
     def __add__(self, other: Vector2) -> Vector2:
-        r = Vector2(self._proto)
-        r.x += other.x
-        r.y += other.y
-        return r
+        return Vector2.from_xy(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other: Vector2) -> Vector2:
-        r = Vector2(self._proto)
-        r.x -= other.x
-        r.y -= other.y
-        return r
+        return Vector2.from_xy(self.x - other.x, self.y - other.y)
 
     def __neg__(self) -> Vector2:
-        r = Vector2(self._proto)
-        r.x = -r.x
-        r.y = -r.y
-        return r
+        return Vector2.from_xy(-self.x, -self.y)
 
     def __mul__(self, scalar: float) -> Vector2:
-        r = Vector2(self._proto)
-        r.x = int(float(r.x) * scalar)
-        r.y = int(float(r.y) * scalar)
-        return r
+        return Vector2.from_xy(int(float(self.x) * scalar), int(float(self.y) * scalar))
 
     def length(self) -> float:
-        return math.sqrt(self.x * self.x + self.y * self.y)
+        return math.hypot(self.x, self.y)
 
     def angle(self) -> float:
         """Returns the angle (direction) of the vector in radians"""
@@ -248,13 +251,16 @@ class Box2:
 
     @classmethod
     def from_xywh(cls, x_nm: int, y_nm: int, w_nm: int, h_nm: int) -> Self:
-        pos = Vector2.from_xy(x_nm, y_nm)
-        size = Vector2.from_xy(w_nm, h_nm)
-        return cls(pos._proto, size._proto)
+        box = cls()
+        box._pos_proto.x_nm = x_nm
+        box._pos_proto.y_nm = y_nm
+        box._size_proto.x_nm = w_nm
+        box._size_proto.y_nm = h_nm
+        return box
 
     @classmethod
     def from_pos_size(cls, pos: Vector2, size: Vector2) -> Self:
-        return cls(pos._proto, size._proto)
+        return cls(pos.proto, size.proto)
 
     @classmethod
     def from_proto( cls, other: types.Box2) -> Self:
@@ -302,6 +308,19 @@ class Box2:
         self._size_proto.x_nm = new_width
         self._size_proto.y_nm = new_height
 
+    def intersects(self, other: Box2) -> bool:
+        """Returns True if this box and the other box overlap or touch
+
+        .. versionadded:: 0.6.0"""
+        pos, size = self._pos_proto, self._size_proto
+        other_pos, other_size = other._pos_proto, other._size_proto
+        return (
+            pos.x_nm <= other_pos.x_nm + other_size.x_nm
+            and other_pos.x_nm <= pos.x_nm + size.x_nm
+            and pos.y_nm <= other_pos.y_nm + other_size.y_nm
+            and other_pos.y_nm <= pos.y_nm + size.y_nm
+        )
+
 class Angle(Wrapper):
     def __init__(self, proto: Optional[types.Angle] = None):
         self._proto = types.Angle()
@@ -391,7 +410,7 @@ class ArcStartMidEnd(Wrapper):
 
     @start.setter
     def start(self, val: Vector2):
-        self._proto.start.CopyFrom(val._proto)
+        self._proto.start.CopyFrom(val.proto)
 
     @property
     def mid(self) -> Vector2:
@@ -399,7 +418,7 @@ class ArcStartMidEnd(Wrapper):
 
     @mid.setter
     def mid(self, val: Vector2):
-        self._proto.mid.CopyFrom(val._proto)
+        self._proto.mid.CopyFrom(val.proto)
 
     @property
     def end(self) -> Vector2:
@@ -407,7 +426,7 @@ class ArcStartMidEnd(Wrapper):
 
     @end.setter
     def end(self, val: Vector2):
-        self._proto.end.CopyFrom(val._proto)
+        self._proto.end.CopyFrom(val.proto)
 
     def center(self) -> Optional[Vector2]:
         """
@@ -440,12 +459,19 @@ class ArcStartMidEnd(Wrapper):
         return arc_end_angle(self.start, self.mid, self.end)
 
     def bounding_box(self) -> Box2:
-        """Returns the bounding box of the arc -- not calculated by KiCad; may differ from KiCad's"""
-        box = Box2()
-        box.merge(self.start)
-        box.merge(self.end)
-        box.merge(self.mid)
-        return box
+        """Returns the bounding box of the arc -- not calculated by KiCad; may differ from KiCad's
+
+        .. versionchanged:: 0.6.0
+           Includes the full extent of the arc rather than only its three points"""
+        start, mid, end = self._proto.start, self._proto.mid, self._proto.end
+        return _box_from_bounds(*_arc_bounds(start.x_nm, start.y_nm, mid.x_nm, mid.y_nm,
+                                             end.x_nm, end.y_nm))
+
+    def tessellate(self, max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+        """Flattens the arc to points from start to end, as by :func:`arc_points`
+
+        .. versionadded:: 0.6.0"""
+        return arc_points(self.start, self.mid, self.end, max_error)
 
 class PolyLineNode(Wrapper):
     def __init__(
@@ -487,7 +513,7 @@ class PolyLineNode(Wrapper):
 
     @point.setter
     def point(self, val: Vector2):
-        self._proto.point.CopyFrom(val._proto)
+        self._proto.point.CopyFrom(val.proto)
 
     @property
     def has_arc(self) -> bool:
@@ -499,7 +525,7 @@ class PolyLineNode(Wrapper):
 
     @arc.setter
     def arc(self, val: ArcStartMidEnd):
-        self._proto.arc.CopyFrom(val._proto)
+        self._proto.arc.CopyFrom(val.proto)
 
 class PolyLine(Wrapper):
     def __init__(
@@ -551,14 +577,18 @@ class PolyLine(Wrapper):
     def clear(self):
         self._proto.ClearField("nodes")
 
+    def move(self, delta: Vector2):
+        """Moves every node of the polyline by delta
+
+        .. versionadded:: 0.6.0"""
+        _move_points(_polyline_points(self._proto), delta)
+
     def rotate(self, delta: Angle, center: Vector2):
-        for node in self.nodes:
-            if node.has_point:
-                node.point = node.point.rotate(delta, center)
-            elif node.has_arc:
-                node.arc.start = node.arc.start.rotate(delta, center)
-                node.arc.mid = node.arc.mid.rotate(delta, center)
-                node.arc.end = node.arc.end.rotate(delta, center)
+        """Rotates every node of the polyline around a center point
+
+        .. versionchanged:: 0.6.0
+           Arc nodes are rotated too; previously only their copies were"""
+        _rotate_points(_polyline_points(self._proto), delta, center)
 
 class PolygonWithHoles(Wrapper):
     def __init__(
@@ -593,58 +623,255 @@ class PolygonWithHoles(Wrapper):
         self._proto.holes.remove(hole._proto)
 
     def bounding_box(self) -> Box2:
-        if not self.outline.nodes:
+        """Returns the bounding box of the outline -- not calculated by KiCad; may differ from
+        KiCad's
+
+        .. versionchanged:: 0.6.0
+           Includes the full extent of arc nodes rather than only their three points"""
+        xs = []
+        ys = []
+
+        for node in self._proto.outline.nodes:
+            if node.HasField("point"):
+                xs.append(node.point.x_nm)
+                ys.append(node.point.y_nm)
+            elif node.HasField("arc"):
+                start, mid, end = node.arc.start, node.arc.mid, node.arc.end
+                min_x, min_y, max_x, max_y = _arc_bounds(start.x_nm, start.y_nm, mid.x_nm,
+                                                         mid.y_nm, end.x_nm, end.y_nm)
+                xs.extend((min_x, max_x))
+                ys.extend((min_y, max_y))
+
+        if not xs:
             return Box2()
 
-        min_x = math.inf
-        min_y = math.inf
-        max_x = -math.inf
-        max_y = -math.inf
-
-        for node in self.outline:
-            if node.has_point:
-                min_x = min(min_x, node.point.x)
-                min_y = min(min_y, node.point.y)
-                max_x = max(max_x, node.point.x)
-                max_y = max(max_y, node.point.y)
-            elif node.has_arc:
-                box = node.arc.bounding_box()
-                min_x = min(min_x, box.pos.x)
-                min_y = min(min_y, box.pos.y)
-                max_x = max(max_x, box.pos.x + box.size.x)
-                max_y = max(max_y, box.pos.y + box.size.y)
-
-        return Box2.from_pos_size(
-            Vector2.from_xy(int(min_x), int(min_y)),
-            Vector2.from_xy(int(max_x - min_x), int(max_y - min_y)),
-        )
+        return _box_from_bounds(min(xs), min(ys), max(xs), max(ys))
 
     def move(self, delta: Vector2):
-        for node in self.outline:
-            if node.has_point:
-                node.point += delta
-            elif node.has_arc:
-                node.arc.start += delta
-                node.arc.mid += delta
-                node.arc.end += delta
-
-        for hole in self.holes:
-            for node in hole:
-                if node.has_point:
-                    node.point += delta
-                elif node.has_arc:
-                    node.arc.start += delta
-                    node.arc.mid += delta
-                    node.arc.end += delta
+        """Moves the outline and holes by delta
+
+        .. versionchanged:: 0.6.0
+           Arc nodes are moved too; previously only their copies were"""
+        _move_points(_polygon_points(self._proto), delta)
 
     def rotate(self, delta: Angle, center: Optional[Vector2] = None):
+        """Rotates the outline and holes around a center point, by default the center of the
+        bounding box
+
+        .. versionchanged:: 0.6.0
+           Arc nodes are rotated too; previously only their copies were"""
         if center is None:
             center = self.bounding_box().center()
 
-        self.outline.rotate(delta, center)
+        _rotate_points(_polygon_points(self._proto), delta, center)
+
+class PointArray:
+    """An array of points in nanometers, held as an (N, 2) NumPy array of int64 so that many points
+    can be moved, rotated and measured at once rather than one :class:`Vector2` at a time.
+
+    The constructors read coordinates straight from the protobuf messages of polylines, polygons
+    and tracks, and the ``write_`` methods store coordinates back into them.  Operations return a
+    new PointArray and leave this one unchanged.
 
-        for hole in self.holes:
-            hole.rotate(delta, center)
+    Requires NumPy, which is not otherwise a dependency of kicad-python.
+
+    .. versionadded:: 0.6.0
+    """
+    __slots__ = ('array',)
+
+    def __init__(self, points=()):
+        """
+        :param points: Anything NumPy can turn into an (N, 2) array of integers, such as a list of
+                       (x, y) tuples or an existing array, which is used without a copy if it
+                       already holds int64
+        """
+        np = _numpy()
+        array = np.asarray(points, dtype=np.int64)
+
+        if array.size == 0:
+            array = array.reshape(0, 2)
+
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(f"PointArray needs an (N, 2) array of points, not {array.shape}")
+
+        self.array = array
+
+    def __repr__(self):
+        return f"PointArray({self.array.tolist()})"
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index: int) -> Vector2:
+        x, y = self.array[index].tolist()
+        return Vector2.from_xy(x, y)
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Vector2]) -> Self:
+        np = _numpy()
+        coords = np.fromiter(chain.from_iterable((v.x, v.y) for v in vectors), dtype=np.int64,
+                             count=2 * len(vectors))
+        return cls(coords.reshape(-1, 2))
+
+    @classmethod
+    def from_polyline(cls, polyline: PolyLine) -> Self:
+        """Creates an array of the nodes of a polyline in order; an arc node gives three points,
+        its start, mid and end"""
+        return cls._from_protos(_polyline_points(polyline._proto))
+
+    @classmethod
+    def from_polygon(cls, polygon: PolygonWithHoles) -> Self:
+        """Creates an array of the nodes of a polygon's outline followed by those of each hole,
+        in the same order as :meth:`from_polyline`"""
+        return cls._from_protos(_polygon_points(polygon._proto))
+
+    @classmethod
+    def from_track_ends(cls, tracks: Sequence[Union[Track, ArcTrack]]) -> Self:
+        """Creates an array of the start and end points of tracks or arcs: row 2 * i is the
+        start of tracks[i] and row 2 * i + 1 its end"""
+        return cls._from_protos(_track_end_points(tracks))
+
+    @classmethod
+    def _from_protos(cls, protos: Sequence[types.Vector2]) -> Self:
+        np = _numpy()
+        coords = np.fromiter(chain.from_iterable((p.x_nm, p.y_nm) for p in protos),
+                             dtype=np.int64, count=2 * len(protos))
+        return cls(coords.reshape(-1, 2))
+
+    def to_vectors(self) -> List[Vector2]:
+        return [Vector2.from_xy(x, y) for x, y in self.array.tolist()]
+
+    def write_polyline(self, polyline: PolyLine):
+        """Stores the points in the nodes of a polyline, in the order of :meth:`from_polyline`"""
+        self._write_protos(_polyline_points(polyline._proto))
+
+    def write_polygon(self, polygon: PolygonWithHoles):
+        """Stores the points in the nodes of a polygon, in the order of :meth:`from_polygon`"""
+        self._write_protos(_polygon_points(polygon._proto))
+
+    def write_track_ends(self, tracks: Sequence[Union[Track, ArcTrack]]):
+        """Stores the points as the start and end points of tracks or arcs, in the order of
+        :meth:`from_track_ends`"""
+        self._write_protos(_track_end_points(tracks))
+
+    def _write_protos(self, protos: Sequence[types.Vector2]):
+        if len(protos) != len(self.array):
+            raise ValueError(f"Cannot write {len(self.array)} points to {len(protos)} points")
+
+        for proto, (x, y) in zip(protos, self.array.tolist()):
+            proto.x_nm = x
+            proto.y_nm = y
+
+    def translate(self, delta: Vector2) -> PointArray:
+        return PointArray(self.array + (delta.x, delta.y))
+
+    def rotate(self, angle: Angle, center: Vector2) -> PointArray:
+        """Rotates the points around a center point, giving the same results as
+        :meth:`Vector2.rotate` on each point"""
+        np = _numpy()
+        rotation = normalize_angle_radians(angle.to_radians())
+        sin_angle = math.sin(rotation)
+        cos_angle = math.cos(rotation)
+
+        pt_x = self.array[:, 0] - center.x
+        pt_y = self.array[:, 1] - center.y
+
+        rotated = np.empty_like(self.array)
+        rotated[:, 0] = np.trunc(pt_y * sin_angle + pt_x * cos_angle).astype(np.int64) + center.x
+        rotated[:, 1] = np.trunc(pt_y * cos_angle - pt_x * sin_angle).astype(np.int64) + center.y
+        return PointArray(rotated)
+
+    def scale(self, factor: float, center: Optional[Vector2] = None) -> PointArray:
+        """Scales the points away from a center point, or from the origin if there is none.
+        Coordinates are truncated towards the center as in ``Vector2 * factor``."""
+        np = _numpy()
+        offset = (center.x, center.y) if center is not None else (0, 0)
+        scaled = np.trunc((self.array - offset) * float(factor)).astype(np.int64)
+        return PointArray(scaled + offset)
+
+    def bounding_box(self) -> Box2:
+        if len(self.array) == 0:
+            return Box2()
+
+        min_x, min_y = self.array.min(axis=0).tolist()
+        max_x, max_y = self.array.max(axis=0).tolist()
+        return _box_from_bounds(min_x, min_y, max_x, max_y)
+
+    def distances_to(self, point: Vector2):
+        """Returns a float array of the distance from each point to the given point"""
+        np = _numpy()
+        return np.hypot(self.array[:, 0] - point.x, self.array[:, 1] - point.y)
+
+    def isclose(self, other: Union[PointArray, Vector2], tolerance: int = 0):
+        """Returns a boolean array that is True where a point is within tolerance of the point in
+        the same row of other, or of other itself if it is a single Vector2"""
+        np = _numpy()
+        if isinstance(other, Vector2):
+            return self.distances_to(other) <= tolerance
+
+        if other.array.shape != self.array.shape:
+            raise ValueError(f"Cannot compare {len(self.array)} points to {len(other.array)}")
+
+        delta = self.array - other.array
+        return np.hypot(delta[:, 0], delta[:, 1]) <= tolerance
+
+    def allclose(self, other: PointArray, tolerance: int = 0) -> bool:
+        """Returns True if both arrays have the same number of points and every point is within
+        tolerance of the point in the same row of other"""
+        return (other.array.shape == self.array.shape
+                and bool(self.isclose(other, tolerance).all()))
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("PointArray requires NumPy; install it with `pip install numpy`") from e
+    return numpy
+
+def _polyline_points(polyline: types.PolyLine) -> List[types.Vector2]:
+    """Returns the point messages of a polyline's nodes in order, three for each arc node"""
+    points = []
+    for node in polyline.nodes:
+        if node.HasField("point"):
+            points.append(node.point)
+        elif node.HasField("arc"):
+            arc = node.arc
+            points.extend((arc.start, arc.mid, arc.end))
+    return points
+
+def _polygon_points(polygon: types.PolygonWithHoles) -> List[types.Vector2]:
+    points = _polyline_points(polygon.outline)
+    for hole in polygon.holes:
+        points.extend(_polyline_points(hole))
+    return points
+
+def _track_end_points(tracks: Sequence[Union[Track, ArcTrack]]) -> List[types.Vector2]:
+    points = []
+    for track in tracks:
+        points.append(track._proto.start)
+        points.append(track._proto.end)
+    return points
+
+def _move_points(points: List[types.Vector2], delta: Vector2):
+    dx = delta.x
+    dy = delta.y
+    for point in points:
+        point.x_nm += dx
+        point.y_nm += dy
+
+def _rotate_points(points: List[types.Vector2], angle: Angle, center: Vector2):
+    """Rotates point messages in place, with the same arithmetic as :meth:`Vector2.rotate`"""
+    rotation = normalize_angle_radians(angle.to_radians())
+    sin_angle = math.sin(rotation)
+    cos_angle = math.cos(rotation)
+    cx = center.x
+    cy = center.y
+
+    for point in points:
+        pt_x = point.x_nm - cx
+        pt_y = point.y_nm - cy
+        point.x_nm = int(pt_y * sin_angle + pt_x * cos_angle) + cx
+        point.y_nm = int(pt_y * cos_angle - pt_x * sin_angle) + cy
 
 def arc_center(start: Vector2, mid: Vector2, end: Vector2) -> Optional[Vector2]:
     """
@@ -695,6 +922,33 @@ def arc_radius(start: Vector2, mid: Vector2, end: Vector2) -> float:
 
     return (start - center).length()
 
+def arc_points(start: Vector2, mid: Vector2, end: Vector2,
+               max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+    """Flattens an arc to chords that are at most max_error from it, returning the points from
+    start to end, which are exact.  An arc whose start and end are the same is a full circle
+    through start and mid.
+
+    The points are cached by the start, mid, end and max_error, so flattening the same arc again
+    does not calculate its center, radius and angles again.  Requires NumPy.
+
+    .. versionadded:: 0.6.0"""
+    _check_max_error(max_error)
+    return PointArray(_arc_points(start.x, start.y, mid.x, mid.y, end.x, end.y, max_error))
+
+def bezier_points(start: Vector2, control1: Vector2, control2: Vector2, end: Vector2,
+                  max_error: int = DEFAULT_MAX_ERROR) -> PointArray:
+    """Flattens a cubic Bezier curve to chords that are at most max_error from it, returning the
+    points from start to end, which are exact.  Cached like :func:`arc_points`.  Requires NumPy.
+
+    .. versionadded:: 0.6.0"""
+    _check_max_error(max_error)
+    return PointArray(_bezier_points(start.x, start.y, control1.x, control1.y, control2.x,
+                                     control2.y, end.x, end.y, max_error))
+
+def _check_max_error(max_error: int):
+    if max_error <= 0:
+        raise ValueError(f"max_error must be positive, not {max_error}")
+
 def normalize_angle_degrees(angle: float) -> float:
     """Normalizes an angle to fall within the range [0, 360)
 
@@ -802,3 +1056,146 @@ def arc_end_angle_degrees(start: Vector2, mid: Vector2, end: Vector2) -> Optiona
         angle += 360
 
     return normalize_angle_degrees(angle)
+
+def _arc_center(sx: float, sy: float, mx: float, my: float, ex: float,
+                ey: float) -> Optional[Tuple[float, float]]:
+    d = 2 * (sx * (my - ey) + mx * (ey - sy) + ex * (sy - my))
+
+    if d == 0:
+        return None
+
+    s2 = sx * sx + sy * sy
+    m2 = mx * mx + my * my
+    e2 = ex * ex + ey * ey
+    cx = (s2 * (my - ey) + m2 * (ey - sy) + e2 * (sy - my)) / d
+    cy = (s2 * (ex - mx) + m2 * (sx - ex) + e2 * (mx - sx)) / d
+    return cx, cy
+
+def _on_arc(angle: float, start: float, mid: float, end: float) -> bool:
+    """Returns True if the angle is within the arc from start through mid to end"""
+    turn = 2 * math.pi
+    if (mid - start) % turn <= (end - start) % turn:
+        return (angle - start) % turn <= (end - start) % turn
+    return (start - angle) % turn <= (start - end) % turn
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _arc_bounds(sx: int, sy: int, mx: int, my: int, ex: int,
+                ey: int) -> Tuple[int, int, int, int]:
+    """Returns the exact extents of an arc as (min_x, min_y, max_x, max_y), including the points
+    where the arc crosses the axes through its center.  Cached, as bounding the same arcs again
+    is common when boards are indexed or redrawn."""
+    center = _arc_center(sx, sy, mx, my, ex, ey)
+    xs = [sx, mx, ex]
+    ys = [sy, my, ey]
+
+    if center is not None:
+        cx, cy = center
+        radius = math.hypot(sx - cx, sy - cy)
+        start = math.atan2(sy - cy, sx - cx)
+        mid = math.atan2(my - cy, mx - cx)
+        end = math.atan2(ey - cy, ex - cx)
+
+        for quadrant in range(4):
+            angle = quadrant * math.pi / 2
+            if _on_arc(angle, start, mid, end):
+                xs.append(round(cx + radius * math.cos(angle)))
+                ys.append(round(cy + radius * math.sin(angle)))
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+def _bezier_extremes(p0: int, p1: int, p2: int, p3: int) -> Tuple[int, int]:
+    """Returns the range of one coordinate of a cubic Bezier curve, from the end points and the
+    points where the derivative of the curve is zero"""
+    values = [p0, p3]
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+
+    if a == 0:
+        roots = [-c / b] if b != 0 else []
+    else:
+        discriminant = b * b - 4 * a * c
+        roots = [] if discriminant < 0 else [
+            (-b + sign * math.sqrt(discriminant)) / (2 * a) for sign in (-1, 1)
+        ]
+
+    for t in roots:
+        if 0 < t < 1:
+            u = 1 - t
+            values.append(round(u * u * u * p0 + 3 * u * u * t * p1 + 3 * u * t * t * p2
+                                + t * t * t * p3))
+
+    return min(values), max(values)
+
+def _box_from_bounds(min_x: int, min_y: int, max_x: int, max_y: int) -> Box2:
+    return Box2.from_xywh(min_x, min_y, max_x - min_x, max_y - min_y)
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _arc_points(sx: int, sy: int, mx: int, my: int, ex: int, ey: int,
+                max_error: int) -> Tuple[Tuple[int, int], ...]:
+    """Approximates an arc by chords whose distance from the arc is at most max_error, returning
+    the points from start to end; the start and end are exact.  The result is cached, so it is a
+    tuple that callers cannot change."""
+    if (sx, sy) == (ex, ey):
+        # A full circle through start and mid
+        cx = (sx + mx) / 2
+        cy = (sy + my) / 2
+        start = math.atan2(sy - cy, sx - cx)
+        sweep = 2 * math.pi
+    else:
+        center = _arc_center(sx, sy, mx, my, ex, ey)
+
+        if center is None:
+            return ((sx, sy), (ex, ey))
+
+        cx, cy = center
+        start = math.atan2(sy - cy, sx - cx)
+        mid = math.atan2(my - cy, mx - cx)
+        end = math.atan2(ey - cy, ex - cx)
+        turn = 2 * math.pi
+
+        if (mid - start) % turn <= (end - start) % turn:
+            sweep = (end - start) % turn
+        else:
+            sweep = -((start - end) % turn)
+
+    radius = math.hypot(sx - cx, sy - cy)
+
+    if max_error <= 0 or radius <= max_error:
+        steps = 2
+    else:
+        steps = max(2, math.ceil(abs(sweep) / (2 * math.acos(1 - max_error / radius))))
+
+    points = [(sx, sy)]
+    for step in range(1, steps):
+        angle = start + sweep * step / steps
+        points.append((round(cx + radius * math.cos(angle)), round(cy + radius * math.sin(angle))))
+    points.append((ex, ey))
+    return tuple(points)
+
+@lru_cache(maxsize=_TESSELLATION_CACHE_SIZE)
+def _bezier_points(x0: int, y0: int, x1: int, y1: int, x2: int, y2: int, x3: int, y3: int,
+                   max_error: int) -> Tuple[Tuple[int, int], ...]:
+    """Approximates a cubic Bezier curve by chords whose distance from the curve is at most
+    max_error, evenly spaced in the curve parameter, returning the points from start to end; the
+    start and end are exact.  Cached like :func:`_arc_points`."""
+    # The second derivative is at most 6 * second_difference, and a chord over a parameter
+    # interval h is within h * h / 8 of it times that (Wang's formula)
+    second_difference = max(math.hypot(x0 - 2 * x1 + x2, y0 - 2 * y1 + y2),
+                            math.hypot(x1 - 2 * x2 + x3, y1 - 2 * y2 + y3))
+    steps = 1
+    if max_error > 0:
+        steps = max(1, math.ceil(math.sqrt(0.75 * second_difference / max_error)))
+
+    points = [(x0, y0)]
+    for step in range(1, steps):
+        t = step / steps
+        u = 1 - t
+        a = u * u * u
+        b = 3 * u * u * t
+        c = 3 * u * t * t
+        d = t * t * t
+        points.append((round(a * x0 + b * x1 + c * x2 + d * x3),
+                       round(a * y0 + b * y1 + c * y2 + d * y3)))
+    points.append((x3, y3))
+    return tuple(points)
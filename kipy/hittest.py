@@ -0,0 +1,265 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""In-process hit testing of board items.
+
+:meth:`kipy.board.Board.hit_test` asks KiCad, which costs a round trip for every item and point.
+:class:`HitTester` answers the same question locally for tracks, arcs, vias and pads: track, arc
+and via geometry comes from the items themselves, and pad shapes are fetched from KiCad as
+polygons once per pad and then reused::
+
+    hits = HitTester(board)
+    hits.prefetch_pads(pads)
+    inside = [p for p in pads if hits.hit_test(p, point)]
+
+Other item types are passed through to KiCad.
+
+.. versionadded:: 0.6.0
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, cast
+
+from kipy.board import Board, BoardEditListener, BoardLayer
+from kipy.board_types import ArcTrack, BoardItem, FootprintInstance, Pad, Track, Via
+from kipy.common_types import Commit
+from kipy.geometry import DEFAULT_MAX_ERROR, Vector2, _arc_points
+from kipy.proto.common.types import base_types_pb2
+from kipy.spatial import _arc_distance, _segment_distance
+from kipy.wrapper import Item, Wrapper
+
+# A ring of a polygon as a list of vertices
+_Ring = List[Tuple[int, int]]
+
+def _ring_points(polyline: base_types_pb2.PolyLine) -> _Ring:
+    points: _Ring = []
+
+    for node in polyline.nodes:
+        if node.HasField('arc'):
+            # Arcs are flattened to KiCad's default accuracy rather than to the chords through
+            # their midpoint; the points are cached, so refetched pads reuse them
+            arc = node.arc
+            points.extend(_arc_points(arc.start.x_nm, arc.start.y_nm, arc.mid.x_nm, arc.mid.y_nm,
+                                      arc.end.x_nm, arc.end.y_nm, DEFAULT_MAX_ERROR))
+        else:
+            points.append((node.point.x_nm, node.point.y_nm))
+
+    return points
+
+class _PolygonShape:
+    """A polygon with holes, flattened for point tests"""
+    __slots__ = ('rings', 'min_x', 'min_y', 'max_x', 'max_y')
+
+    def __init__(self, polygon: base_types_pb2.PolygonWithHoles):
+        self.rings = [_ring_points(polygon.outline)]
+        self.rings.extend(_ring_points(hole) for hole in polygon.holes)
+        outline = self.rings[0] or [(0, 0)]
+        self.min_x = min(x for x, _ in outline)
+        self.min_y = min(y for _, y in outline)
+        self.max_x = max(x for x, _ in outline)
+        self.max_y = max(y for _, y in outline)
+
+    def hit(self, x: int, y: int, tolerance: int) -> bool:
+        if (x < self.min_x - tolerance or x > self.max_x + tolerance
+                or y < self.min_y - tolerance or y > self.max_y + tolerance):
+            return False
+
+        # Even-odd ray casting; the holes are rings like the outline
+        inside = False
+        for ring in self.rings:
+            j = len(ring) - 1
+            for i in range(len(ring)):
+                xi, yi = ring[i]
+                xj, yj = ring[j]
+                if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                    inside = not inside
+                j = i
+
+        if inside or tolerance <= 0:
+            return inside
+
+        return any(
+            _segment_distance(x, y, *ring[i - 1], *ring[i]) <= tolerance
+            for ring in self.rings
+            for i in range(len(ring))
+        )
+
+def _pad_layer(pad: Pad) -> BoardLayer.ValueType:
+    """The layer whose shape is used to hit test a pad: the front or back copper layer when the
+    pad is on it, as KiCad's pad hit test uses the outer layer shape"""
+    layers = pad.proto.pad_stack.layers
+
+    for layer in (BoardLayer.BL_F_Cu, BoardLayer.BL_B_Cu):
+        if layer in layers:
+            return layer
+
+    return layers[0] if len(layers) > 0 else BoardLayer.BL_F_Cu
+
+class HitTester(BoardEditListener):
+    """Hit tests board items without a request to KiCad per test.
+
+    Pad shapes are cached by pad ID.  The tester registers itself as an edit listener of the
+    board, so pads that are updated or removed through the board, or that belong to footprints
+    that are, are fetched again when next tested; call :meth:`invalidate` after pads change in
+    other ways.  Items other than tracks, arcs, vias and pads, and pads whose shape KiCad does
+    not return, are tested by KiCad.
+
+    :param board: The board that the items belong to
+    :param cross_check: If True, every test is also sent to KiCad, the answer from KiCad is
+                        returned, and any disagreement is recorded in :attr:`mismatches`.  This
+                        is meant for checking the local results against KiCad, not for speed.
+    """
+    def __init__(self, board: Board, cross_check: bool = False):
+        self._board = board
+        self.cross_check = cross_check
+        #: The (item, position, local result, KiCad result) of tests that disagreed with KiCad
+        #: while :attr:`cross_check` was on
+        self.mismatches: List[Tuple[Item, Vector2, bool, bool]] = []
+        self._pad_shapes: Dict[str, Optional[_PolygonShape]] = {}
+        board.add_edit_listener(self)
+
+    def prefetch_pads(self, pads: Iterable[Pad]):
+        """Fetches the shapes of the given pads that are not cached yet, with one request per
+        copper layer involved rather than one per pad"""
+        by_layer: Dict[BoardLayer.ValueType, List[Pad]] = {}
+
+        for pad in pads:
+            if pad.id.value not in self._pad_shapes:
+                by_layer.setdefault(_pad_layer(pad), []).append(pad)
+
+        for layer, layer_pads in by_layer.items():
+            polygons = self._board.get_pad_shapes_as_polygons(layer_pads, layer)
+
+            for pad, polygon in zip(layer_pads, polygons):
+                self._pad_shapes[pad.id.value] = (
+                    _PolygonShape(polygon.proto) if polygon is not None else None
+                )
+
+    def invalidate(self, pads: Optional[Iterable[Pad]] = None):
+        """Forgets the cached shapes of the given pads, or of every pad"""
+        if pads is None:
+            self._pad_shapes.clear()
+        else:
+            for pad in pads:
+                self._pad_shapes.pop(pad.id.value, None)
+
+    def hit_test(self, item: Item, position: Vector2, tolerance: int = 0) -> bool:
+        """Tests whether the point is on the item, as :meth:`kipy.board.Board.hit_test` does"""
+        if isinstance(item, Pad):
+            self.prefetch_pads([item])
+
+        return self._test(item, position, tolerance)
+
+    def hit_test_many(
+        self, tests: Iterable[Tuple[Item, Vector2]], tolerance: int = 0
+    ) -> List[bool]:
+        """Hit tests many (item, position) pairs, fetching all the pad shapes they need first.
+        Tests that go to KiCad (for other item types, or in :attr:`cross_check` mode) are sent
+        together with :meth:`kipy.board.Board.hit_test_many`."""
+        tests = list(tests)
+        self.prefetch_pads(item for item, _ in tests if isinstance(item, Pad))
+
+        local = [self._local_hit(item, p.x, p.y, tolerance) for item, p in tests]
+        remote_indices = [
+            i for i, result in enumerate(local) if result is None or self.cross_check
+        ]
+
+        if not remote_indices:
+            return cast(List[bool], local)
+
+        remote = self._board.hit_test_many((tests[i] for i in remote_indices), tolerance)
+        results = list(local)
+
+        for i, remote_result in zip(remote_indices, remote):
+            if results[i] is not None and results[i] != remote_result:
+                self.mismatches.append((tests[i][0], tests[i][1], cast(bool, results[i]),
+                                        remote_result))
+            results[i] = remote_result
+
+        return cast(List[bool], results)
+
+    def hit_test_points(
+        self, item: Item, positions: Sequence[Vector2], tolerance: int = 0
+    ) -> List[bool]:
+        """Hit tests one item at many points"""
+        return self.hit_test_many(((item, position) for position in positions), tolerance)
+
+    def _test(self, item: Item, position: Vector2, tolerance: int) -> bool:
+        local = self._local_hit(item, position.x, position.y, tolerance)
+
+        if local is None:
+            return self._board.hit_test(item, position, tolerance)
+
+        if self.cross_check:
+            remote = self._board.hit_test(item, position, tolerance)
+            if remote != local:
+                self.mismatches.append((item, position, local, remote))
+            return remote
+
+        return local
+
+    def _local_hit(self, item: Item, x: int, y: int, tolerance: int) -> Optional[bool]:
+        proto = item.proto
+
+        if isinstance(item, Track):
+            start, end = proto.start, proto.end
+            return _segment_distance(x, y, start.x_nm, start.y_nm, end.x_nm,
+                                     end.y_nm) <= proto.width.value_nm / 2 + tolerance
+
+        if isinstance(item, ArcTrack):
+            start, mid, end = proto.start, proto.mid, proto.end
+            return _arc_distance(x, y, start.x_nm, start.y_nm, mid.x_nm, mid.y_nm, end.x_nm,
+                                 end.y_nm) <= proto.width.value_nm / 2 + tolerance
+
+        if isinstance(item, Via):
+            layers = proto.pad_stack.copper_layers
+            radius = max((layer.size.x_nm for layer in layers), default=0) / 2
+            dx = x - proto.position.x_nm
+            dy = y - proto.position.y_nm
+            return dx * dx + dy * dy <= (radius + tolerance) ** 2
+
+        if isinstance(item, Pad):
+            # Pads whose shape KiCad did not return are tested by KiCad
+            shape = self._pad_shapes.get(proto.id.value)
+            return shape.hit(x, y, tolerance) if shape is not None else None
+
+        return None
+
+    def on_items_updated(self, items: Sequence[BoardItem]):
+        self._forget_pads_of(items)
+
+    def _forget_pads_of(self, items: Sequence[Wrapper]):
+        for item in items:
+            if isinstance(item, Pad):
+                self._pad_shapes.pop(item.id.value, None)
+            elif isinstance(item, FootprintInstance):
+                for pad in item.definition.pads:
+                    self._pad_shapes.pop(pad.id.value, None)
+
+    def on_items_removed(self, item_ids: Sequence[str]):
+        # Removed footprints cannot be told apart from other items by ID, so their pads are
+        # left in the cache, where they are only reached if a removed pad is tested again
+        for item_id in item_ids:
+            self._pad_shapes.pop(item_id, None)
+
+    def on_commit_dropped(self, commit: Commit):
+        self._pad_shapes.clear()
+
+    def on_board_changed(self):
+        self._pad_shapes.clear()
@@ -25,14 +25,15 @@ import platform
 import random
 import string
 from tempfile import gettempdir
-from typing import Optional, Sequence, Union
+from typing import Optional, Sequence, Tuple, Union
 from google.protobuf.empty_pb2 import Empty
 
-from kipy.board import Board
-from kipy.client import KiCadClient, ApiError
+from kipy.board import AsyncBoard, Board
+from kipy.client import AsyncKiCadClient, KiCadClient, PooledKiCadClient, RetryPolicy, ApiError
 from kipy.common_types import Text, TextBox, CompoundShape
 from kipy.errors import FutureVersionError
 from kipy.geometry import Box2
+from kipy.metrics import MetricsCollector, collector_from_environment
 from kipy.project import Project
 from kipy.proto.common import commands
 from kipy.proto.common.types import base_types_pb2, DocumentType, DocumentSpecifier
@@ -65,6 +66,17 @@ def _default_kicad_token() -> str:
         return token
     return ""
 
+def _resolve_connection_args(
+    socket_path: Optional[str], client_name: Optional[str], kicad_token: Optional[str]
+) -> Tuple[str, str, str]:
+    if socket_path is None:
+        socket_path = _default_socket_path()
+    if client_name is None:
+        client_name = _random_client_name()
+    if kicad_token is None:
+        kicad_token = _default_kicad_token()
+    return socket_path, client_name, kicad_token
+
 class KiCadVersion:
     def __init__(self, major: int, minor: int, patch: int, full_version: str):
         self.major = major
@@ -121,7 +133,9 @@ class KiCad:
     def __init__(self, socket_path: Optional[str]=None,
                  client_name: Optional[str]=None,
                  kicad_token: Optional[str]=None,
-                 timeout_ms: int=2000):
+                 timeout_ms: int=2000,
+                 max_connections: int=1,
+                 retry_policy: Optional[RetryPolicy]=None):
         """Creates a connection to a running KiCad instance
 
         :param socket_path: The path to the IPC API socket (leave default to read from the
@@ -133,14 +147,24 @@ class KiCad:
         :param kicad_token: A token that can be provided to the client to uniquely identify a
             KiCad instance.  Leave default to read from the KICAD_API_TOKEN environment variable.
         :param timeout_ms: The maximum time to wait for a response from KiCad, in milliseconds
+        :param max_connections: The number of connections to KiCad that may be open at once.  Set
+            this higher than 1 when sharing this object between threads, so that their requests
+            run concurrently (see :class:`kipy.client.PooledKiCadClient`).
+        :param retry_policy: How to retry requests that fail because KiCad is busy.  Leave
+            default to raise an error straight away.
+
+        .. versionadded:: 0.6.0 max_connections, retry_policy
         """
-        if socket_path is None:
-            socket_path = _default_socket_path()
-        if client_name is None:
-            client_name = _random_client_name()
-        if kicad_token is None:
-            kicad_token = _default_kicad_token()
-        self._client = KiCadClient(socket_path, client_name, kicad_token, timeout_ms)
+        args = _resolve_connection_args(socket_path, client_name, kicad_token)
+
+        self._client: KiCadClient
+        if max_connections > 1:
+            self._client = PooledKiCadClient(*args, timeout_ms, max_connections=max_connections)
+        else:
+            self._client = KiCadClient(*args, timeout_ms)
+
+        self._client.metrics = collector_from_environment()
+        self._client.retry_policy = retry_policy
 
     @staticmethod
     def from_client(client: KiCadClient):
@@ -149,6 +173,34 @@ class KiCad:
         k._client = client
         return k
 
+    @property
+    def metrics(self) -> Optional[MetricsCollector]:
+        """The collector recording timings and sizes of requests sent to KiCad, if any.  See
+        :mod:`kipy.metrics`.
+
+        .. versionadded:: 0.6.0"""
+        return self._client.metrics
+
+    @metrics.setter
+    def metrics(self, collector: Optional[MetricsCollector]):
+        self._client.metrics = collector
+
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """How requests that fail because KiCad is busy are retried; see
+        :class:`kipy.client.RetryPolicy`"""
+        return self._client.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]):
+        self._client.retry_policy = policy
+
+    def close(self):
+        """Closes the connection to KiCad
+
+        .. versionadded:: 0.6.0"""
+        self._client.close()
+
     def get_version(self) -> KiCadVersion:
         """Returns the KiCad version as a string, including any package-specific info"""
         response = self._client.send(commands.GetVersion(), commands.GetVersionResponse)
@@ -255,3 +307,80 @@ class KiCad:
         reply = self._client.send(cmd, base_commands_pb2.GetTextAsShapesResponse)
 
         return [CompoundShape(entry.shapes) for entry in reply.text_with_shapes]
+
+class AsyncKiCad:
+    def __init__(self, socket_path: Optional[str]=None,
+                 client_name: Optional[str]=None,
+                 kicad_token: Optional[str]=None,
+                 timeout_ms: int=2000,
+                 retry_policy: Optional[RetryPolicy]=None):
+        """Creates an asynchronous connection to a running KiCad instance.  The parameters are the
+        same as for :class:`KiCad`; the difference is that API calls are coroutines, and several
+        of them can be awaited concurrently without one blocking the next.
+
+        .. versionadded:: 0.6.0
+        """
+        self._client = AsyncKiCadClient(
+            *_resolve_connection_args(socket_path, client_name, kicad_token), timeout_ms
+        )
+        self._client.metrics = collector_from_environment()
+        self._client.retry_policy = retry_policy
+
+    @staticmethod
+    def from_client(client: AsyncKiCadClient):
+        """Creates an AsyncKiCad object from an existing asynchronous client"""
+        k = AsyncKiCad.__new__(AsyncKiCad)
+        k._client = client
+        return k
+
+    @property
+    def metrics(self) -> Optional[MetricsCollector]:
+        """The collector recording timings and sizes of requests sent to KiCad, if any.  See
+        :mod:`kipy.metrics`."""
+        return self._client.metrics
+
+    @metrics.setter
+    def metrics(self, collector: Optional[MetricsCollector]):
+        self._client.metrics = collector
+
+    @property
+    def retry_policy(self) -> Optional[RetryPolicy]:
+        """How requests that fail because KiCad is busy are retried; see
+        :class:`kipy.client.RetryPolicy`"""
+        return self._client.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]):
+        self._client.retry_policy = policy
+
+    def close(self):
+        """Closes the connection to KiCad"""
+        self._client.close()
+
+    async def get_version(self) -> KiCadVersion:
+        """Returns the KiCad version as a string, including any package-specific info"""
+        response = await self._client.send(commands.GetVersion(), commands.GetVersionResponse)
+        return KiCadVersion.from_proto(response.version)
+
+    def get_api_version(self) -> KiCadVersion:
+        """Returns the version of KiCad that this library was built against"""
+        return KiCadVersion.from_git_describe(KICAD_API_VERSION)
+
+    async def ping(self):
+        await self._client.send(commands.Ping(), Empty)
+
+    async def get_open_documents(
+        self, doc_type: DocumentType.ValueType
+    ) -> Sequence[DocumentSpecifier]:
+        """Retrieves a list of open documents matching the given type"""
+        command = commands.GetOpenDocuments()
+        command.type = doc_type
+        response = await self._client.send(command, commands.GetOpenDocumentsResponse)
+        return response.documents
+
+    async def get_board(self) -> AsyncBoard:
+        """Retrieves a reference to the PCB open in KiCad, if one exists"""
+        docs = await self.get_open_documents(DocumentType.DOCTYPE_PCB)
+        if len(docs) == 0:
+            raise ApiError("Expected to be able to retrieve at least one board")
+        return AsyncBoard(self._client, docs[0])
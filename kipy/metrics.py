@@ -0,0 +1,271 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Optional instrumentation of the requests a client sends to KiCad.
+
+Metrics are off by default.  To collect them, attach a :class:`MetricsCollector` to a client::
+
+    kicad = KiCad()
+    kicad.metrics = MetricsCollector()
+    ...
+    print(kicad.metrics.summary())
+
+or set the ``KIPY_METRICS`` environment variable to any non-empty value, which attaches a shared
+collector to every :class:`kipy.KiCad` and prints its summary to stderr when the process exits.
+
+.. versionadded:: 0.6.0
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, TextIO
+
+from google.protobuf.message import Message
+
+# Upper bounds of the latency histogram buckets, in microseconds; the last bucket is unbounded
+LATENCY_BUCKETS_US = (
+    50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000
+)
+
+class RequestSample:
+    """Timings and sizes of a single request, as passed to :class:`MetricsCollector` listeners.
+
+    Timestamps are from :func:`time.perf_counter_ns`.  A phase that was not reached (because the
+    request failed) has a timestamp of 0.  For pipelined requests, the wait includes the time the
+    reply spent queued behind earlier requests in the batch.
+    """
+    __slots__ = ('_collector', 'command', 'started', 'packed', 'sent', 'received', 'finished',
+                 'request_bytes', 'response_bytes', 'error')
+
+    def __init__(self, collector: 'MetricsCollector', command: str):
+        self._collector = collector
+        self.command = command
+        self.started = time.perf_counter_ns()
+        self.packed = 0
+        self.sent = 0
+        self.received = 0
+        self.finished = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.error: Optional[BaseException] = None
+
+    def mark_packed(self, data: bytes):
+        self.packed = time.perf_counter_ns()
+        self.request_bytes = len(data)
+
+    def mark_sent(self):
+        self.sent = time.perf_counter_ns()
+
+    def mark_received(self, data: bytes):
+        self.received = time.perf_counter_ns()
+        self.response_bytes = len(data)
+
+    def __enter__(self) -> 'RequestSample':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc)
+
+    def finish(self, error: Optional[BaseException] = None):
+        """Completes the sample and records it with the collector that created it"""
+        self.finished = time.perf_counter_ns()
+        self.error = error
+        self._collector.record(self)
+
+    @property
+    def pack_ns(self) -> int:
+        """Time spent serializing the request"""
+        return self.packed - self.started if self.packed else 0
+
+    @property
+    def send_ns(self) -> int:
+        """Time spent handing the request to the socket"""
+        return self.sent - self.packed if self.sent else 0
+
+    @property
+    def wait_ns(self) -> int:
+        """Time between sending the request and receiving the reply, which includes KiCad's
+        processing time"""
+        return self.received - self.sent if self.received else 0
+
+    @property
+    def unpack_ns(self) -> int:
+        """Time spent parsing the reply"""
+        return self.finished - self.received if self.received else 0
+
+    @property
+    def total_ns(self) -> int:
+        return self.finished - self.started
+
+class CommandStats:
+    """Aggregated metrics for one command type"""
+    def __init__(self, command: str):
+        self.command = command
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.pack_ns = 0
+        self.send_ns = 0
+        self.wait_ns = 0
+        self.unpack_ns = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_US) + 1)
+
+    def add(self, sample: RequestSample):
+        total = sample.total_ns
+        self.count += 1
+        self.errors += sample.error is not None
+        self.total_ns += total
+        self.max_ns = max(self.max_ns, total)
+        self.pack_ns += sample.pack_ns
+        self.send_ns += sample.send_ns
+        self.wait_ns += sample.wait_ns
+        self.unpack_ns += sample.unpack_ns
+        self.request_bytes += sample.request_bytes
+        self.response_bytes += sample.response_bytes
+        self.max_response_bytes = max(self.max_response_bytes, sample.response_bytes)
+        self.histogram[bisect_left(LATENCY_BUCKETS_US, total / 1000)] += 1
+
+    def percentile_ns(self, q: float) -> int:
+        """Returns an upper bound for the given latency percentile (0 < q <= 1), taken from the
+        histogram bucket it falls in"""
+        if self.count == 0:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= rank:
+                if i < len(LATENCY_BUCKETS_US):
+                    return min(LATENCY_BUCKETS_US[i] * 1000, self.max_ns)
+                break
+        return self.max_ns
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+class MetricsCollector:
+    """Records per-command counts, latency histograms, and request/response sizes for the
+    requests sent by any client it is attached to.  Safe to share between threads and clients.
+
+    .. versionadded:: 0.6.0
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CommandStats] = {}
+        self._listeners: List[Callable[[RequestSample], None]] = []
+
+    def begin(self, command: Message) -> RequestSample:
+        """Starts timing a request; used by the clients as a context manager around each one"""
+        return RequestSample(self, type(command).__name__)
+
+    def add_listener(self, listener: Callable[[RequestSample], None]):
+        """Registers a callable that is passed every completed :class:`RequestSample`, for
+        example to forward timings to an external metrics system.  Listeners run on the thread
+        that made the request, so should return quickly."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RequestSample], None]):
+        self._listeners.remove(listener)
+
+    def _command_stats(self, command: str) -> CommandStats:
+        stats = self._stats.get(command)
+        if stats is None:
+            stats = self._stats[command] = CommandStats(command)
+        return stats
+
+    def record(self, sample: RequestSample):
+        with self._lock:
+            self._command_stats(sample.command).add(sample)
+
+        for listener in self._listeners:
+            listener(sample)
+
+    def record_retry(self, command: Message):
+        """Counts a retry of a request that failed, for example because KiCad was busy (see
+        :class:`kipy.client.RetryPolicy`).  The failed attempt itself is recorded as an error."""
+        with self._lock:
+            self._command_stats(type(command).__name__).retries += 1
+
+    def stats(self) -> Dict[str, CommandStats]:
+        """Returns the aggregated metrics, keyed by command type name"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> str:
+        """Returns a table of the recorded metrics, slowest command types (by total time) first"""
+        header = (f"{'command':<32} {'count':>7} {'errors':>6} {'retry':>6} {'total ms':>10} "
+                  f"{'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'wait %':>6} "
+                  f"{'req B':>8} {'resp B':>9}")
+        lines = [header, '-' * len(header)]
+
+        for s in sorted(self.stats().values(), key=lambda s: s.total_ns, reverse=True):
+            wait_pct = 100 * s.wait_ns / s.total_ns if s.total_ns else 0
+            # A command can have retries but no completed requests, if every attempt was refused
+            request_bytes = s.request_bytes // s.count if s.count else 0
+            response_bytes = s.response_bytes // s.count if s.count else 0
+            lines.append(
+                f"{s.command:<32} {s.count:>7} {s.errors:>6} {s.retries:>6} "
+                f"{s.total_ns / 1e6:>10.1f} "
+                f"{s.mean_ns / 1e6:>8.3f} {s.percentile_ns(0.5) / 1e6:>8.3f} "
+                f"{s.percentile_ns(0.99) / 1e6:>8.3f} {s.max_ns / 1e6:>8.3f} {wait_pct:>6.1f} "
+                f"{request_bytes:>8} {response_bytes:>9}"
+            )
+
+        return '\n'.join(lines)
+
+    def print_summary_at_exit(self, file: Optional[TextIO] = None):
+        """Prints :meth:`summary` to `file` (stderr by default) when the interpreter exits"""
+        def dump():
+            if self._stats:
+                print(self.summary(), file=file or sys.stderr)
+
+        atexit.register(dump)
+
+_environment_collector: Optional[MetricsCollector] = None
+
+def collector_from_environment() -> Optional[MetricsCollector]:
+    """Returns the process-wide collector enabled by the ``KIPY_METRICS`` environment variable,
+    or None if it is not set"""
+    global _environment_collector
+
+    if not os.environ.get('KIPY_METRICS'):
+        return None
+
+    if _environment_collector is None:
+        _environment_collector = MetricsCollector()
+        _environment_collector.print_summary_at_exit()
+
+    return _environment_collector
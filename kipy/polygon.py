@@ -0,0 +1,812 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Area, perimeter, point containment, offsetting and boolean operations of polygons, computed
+locally with NumPy.
+
+:class:`Polygon` holds a :class:`~kipy.geometry.PolygonWithHoles` as one array of vertices per
+ring, with arc nodes flattened to chords, so that whole polygons and many points are handled in a
+few array operations rather than node by node through the protobuf wrappers::
+
+    fills = zone.filled_polygons[BoardLayer.BL_F_Cu]
+    copper = sum(Polygon.from_proto(p).area() for p in fills)
+    covered = Polygon.from_proto(fills[0]).contains(PointArray.from_vectors(probes))
+
+:func:`union`, :func:`intersection`, :func:`difference` and :func:`xor` combine sets of polygons
+with integer nanometer coordinates, and return new polygons that can be converted back with
+:meth:`Polygon.to_proto`::
+
+    shapes = board.get_pad_shapes_as_polygons(board.get_pads(), BoardLayer.BL_F_Cu)
+    uncovered = difference([s for s in shapes if s is not None], fills)
+    overlap = sum(p.area() for p in intersection(fills, other_net_fills))
+
+Arcs are flattened so that no chord is further than ``max_error`` from its arc, 5000 nm by default
+as in KiCad, so areas and perimeters of curved outlines are slightly below the true ones.
+
+Requires NumPy, which is not otherwise a dependency of kicad-python.
+
+.. versionadded:: 0.6.0
+"""
+
+import math
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from kipy.geometry import (
+    DEFAULT_MAX_ERROR, Box2, PointArray, PolygonWithHoles, Vector2, _arc_points
+)
+from kipy.proto.common.types import base_types_pb2
+
+# The number of point and edge pairs that Polygon.contains tests at once
+_CHUNK = 1 << 20
+
+def _ring_from_proto(polyline: base_types_pb2.PolyLine, max_error: int) -> np.ndarray:
+    coords: List[int] = []
+
+    for node in polyline.nodes:
+        if node.HasField("point"):
+            coords.append(node.point.x_nm)
+            coords.append(node.point.y_nm)
+        elif node.HasField("arc"):
+            arc = node.arc
+            for x, y in _arc_points(arc.start.x_nm, arc.start.y_nm, arc.mid.x_nm, arc.mid.y_nm,
+                                    arc.end.x_nm, arc.end.y_nm, max_error):
+                coords.append(x)
+                coords.append(y)
+
+    return _ring(np.array(coords, dtype=np.int64).reshape(-1, 2))
+
+def _ring(points) -> np.ndarray:
+    """Returns points as an (N, 2) int64 array without repeated consecutive points, including the
+    last point repeating the first"""
+    ring = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+
+    if len(ring) > 1:
+        keep = np.any(ring != np.roll(ring, 1, axis=0), axis=1)
+        keep[0] = True
+        ring = ring[keep]
+        if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+            ring = ring[:-1]
+
+    return ring
+
+def _signed_area(ring: np.ndarray) -> float:
+    """Returns the signed area of a ring by the shoelace formula: positive when the ring turns
+    counter-clockwise with the y axis pointing up, which is clockwise on a KiCad board, where
+    the y axis points down"""
+    if len(ring) < 3:
+        return 0.0
+
+    # Relative to the first vertex the products stay well inside int64, so the sum is exact, and
+    # the terms of the edges at the first vertex are zero
+    local = ring[1:] - ring[0]
+    x = local[:, 0]
+    y = local[:, 1]
+    twice = int(np.sum(x[:-1] * y[1:] - x[1:] * y[:-1]))
+    return twice / 2
+
+def _points_array(points: Union[PointArray, Sequence[Vector2], np.ndarray]) -> np.ndarray:
+    if isinstance(points, PointArray):
+        return points.array
+    if isinstance(points, np.ndarray):
+        return points.astype(np.int64, copy=False).reshape(-1, 2)
+    return PointArray.from_vectors(points).array
+
+class Polygon:
+    """A polygon with holes as NumPy arrays of vertices, one (N, 2) int64 array per ring.
+
+    Rings are implicitly closed: the last vertex joins the first.  The outline and the holes may
+    turn either way.
+
+    :param outline: The vertices of the outline, as anything NumPy can turn into an (N, 2) array
+    :param holes: The vertices of each hole
+    """
+    __slots__ = ('rings',)
+
+    def __init__(self, outline, holes: Iterable = ()):
+        #: The outline followed by the holes
+        self.rings: List[np.ndarray] = [_ring(outline)]
+        self.rings.extend(_ring(hole) for hole in holes)
+
+    def __repr__(self):
+        return f"Polygon({len(self.outline)} vertices, {len(self.holes)} holes)"
+
+    @property
+    def outline(self) -> np.ndarray:
+        return self.rings[0]
+
+    @property
+    def holes(self) -> List[np.ndarray]:
+        return self.rings[1:]
+
+    @classmethod
+    def from_proto(cls, polygon: PolygonWithHoles,
+                   max_error: int = DEFAULT_MAX_ERROR) -> "Polygon":
+        """Creates a polygon from a PolygonWithHoles, flattening arc nodes
+
+        :param max_error: The maximum distance in nanometers between an arc and its chords
+        """
+        if max_error <= 0:
+            raise ValueError(f"max_error must be positive, not {max_error}")
+
+        proto = polygon._proto
+        result = cls.__new__(cls)
+        result.rings = [_ring_from_proto(proto.outline, max_error)]
+        result.rings.extend(_ring_from_proto(hole, max_error) for hole in proto.holes)
+        return result
+
+    def to_proto(self) -> PolygonWithHoles:
+        """Returns the polygon as a PolygonWithHoles of point nodes"""
+        polygon = PolygonWithHoles()
+        _ring_to_proto(self.outline, polygon._proto.outline)
+
+        for hole in self.holes:
+            _ring_to_proto(hole, polygon._proto.holes.add())
+
+        return polygon
+
+    def bounding_box(self) -> Box2:
+        return PointArray(self.outline).bounding_box()
+
+    def signed_area(self) -> float:
+        """Returns the area inside the outline and outside the holes, in square nanometers, with
+        the sign of the outline's turning direction: positive when it turns clockwise on the
+        board, which is counter-clockwise with the y axis pointing up"""
+        outline = _signed_area(self.outline)
+        area = abs(outline) - sum(abs(_signed_area(hole)) for hole in self.holes)
+        return math.copysign(area, outline)
+
+    def area(self) -> float:
+        """Returns the area inside the outline and outside the holes, in square nanometers"""
+        return abs(self.signed_area())
+
+    def perimeter(self) -> float:
+        """Returns the total length of the outline and the holes, in nanometers"""
+        total = 0.0
+
+        for ring in self.rings:
+            if len(ring) > 1:
+                delta = np.roll(ring, -1, axis=0) - ring
+                total += float(np.hypot(delta[:, 0], delta[:, 1]).sum())
+
+        return total
+
+    def contains(self, points: Union[PointArray, Sequence[Vector2], np.ndarray],
+                 tolerance: int = 0) -> np.ndarray:
+        """Tests many points at once, returning a boolean array that is True for each point that
+        is inside the outline and outside the holes.  Points on an edge, or within tolerance of
+        one, count as inside.
+
+        :param points: A PointArray, a sequence of Vector2 or an (N, 2) array
+        :param tolerance: The distance in nanometers from the edges within which points count as
+                          inside
+        """
+        array = _points_array(points)
+        inside = np.zeros(len(array), dtype=bool)
+        outline = self.outline
+
+        if len(outline) < 3 or len(array) == 0:
+            return inside
+
+        low = outline.min(axis=0) - tolerance
+        high = outline.max(axis=0) + tolerance
+        candidates = np.flatnonzero(np.all((array >= low) & (array <= high), axis=1))
+
+        starts = np.concatenate([ring for ring in self.rings if len(ring) > 0])
+        ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in self.rings if len(ring) > 0])
+        inside[candidates] = _contains(array[candidates], starts, ends, tolerance)
+        return inside
+
+    def contains_point(self, point: Vector2, tolerance: int = 0) -> bool:
+        """Tests a single point; see :meth:`contains`"""
+        return bool(self.contains(np.array([[point.x, point.y]], dtype=np.int64), tolerance)[0])
+
+    def inflate(self, amount: int, max_error: int = DEFAULT_MAX_ERROR) -> "Polygon":
+        """Returns the polygon grown by amount in every direction, or shrunk if amount is
+        negative.  Outward corners are rounded with chords at most max_error from the true arc
+        and inward corners are mitered.
+
+        Rings that an offset turns inside out, such as a hole smaller than twice amount, are
+        left out.  Other self-intersections, which a large offset of a concave outline can cause,
+        are not removed; :func:`offset` removes them, at the cost of a boolean union.
+        """
+        if max_error <= 0:
+            raise ValueError(f"max_error must be positive, not {max_error}")
+
+        rings = []
+
+        for index, ring in enumerate(self.rings):
+            area = _signed_area(ring)
+            if area == 0:
+                continue
+
+            # Offsetting the polygon outward moves the outline away from its inside and a hole
+            # into its inside
+            outward = 1 if (area > 0) == (index == 0) else -1
+            offset = _offset_ring(ring, outward * amount, max_error)
+
+            if offset is not None and _signed_area(offset) * area > 0:
+                rings.append(offset)
+            elif index == 0:
+                return Polygon(np.empty((0, 2), dtype=np.int64))
+
+        result = Polygon.__new__(Polygon)
+        result.rings = rings
+        return result
+
+#: Polygons for the boolean operations, which may mix Polygon and PolygonWithHoles
+PolygonSet = Iterable[Union[Polygon, PolygonWithHoles]]
+
+def union(a: PolygonSet, b: PolygonSet = (), max_error: int = DEFAULT_MAX_ERROR) -> List[Polygon]:
+    """Returns the area covered by a or b, as polygons that do not overlap.  With only a, merges
+    the polygons of a that overlap or touch, and removes their self-intersections.
+
+    :param a: Polygons, or PolygonWithHoles which are flattened as by :meth:`Polygon.from_proto`
+    :param b: Polygons, or PolygonWithHoles
+    :param max_error: The maximum distance in nanometers between an arc and its chords
+    """
+    return _boolean(a, b, np.logical_or, max_error)
+
+def intersection(a: PolygonSet, b: PolygonSet,
+                 max_error: int = DEFAULT_MAX_ERROR) -> List[Polygon]:
+    """Returns the area covered by both a and b; see :func:`union`"""
+    return _boolean(a, b, np.logical_and, max_error)
+
+def difference(a: PolygonSet, b: PolygonSet, max_error: int = DEFAULT_MAX_ERROR) -> List[Polygon]:
+    """Returns the area covered by a and not by b; see :func:`union`"""
+    return _boolean(a, b, lambda in_a, in_b: in_a & ~in_b, max_error)
+
+def xor(a: PolygonSet, b: PolygonSet, max_error: int = DEFAULT_MAX_ERROR) -> List[Polygon]:
+    """Returns the area covered by exactly one of a and b; see :func:`union`"""
+    return _boolean(a, b, np.logical_xor, max_error)
+
+def offset(polygons: PolygonSet, amount: int,
+           max_error: int = DEFAULT_MAX_ERROR) -> List[Polygon]:
+    """Returns the polygons grown by amount in every direction, or shrunk if amount is negative,
+    with rounded corners.  Unlike :meth:`Polygon.inflate`, the result is exact up to max_error:
+    parts that overlap are merged, and parts that a shrink cuts off become separate polygons.
+
+    :param polygons: Polygons, or PolygonWithHoles which are flattened as by
+                     :meth:`Polygon.from_proto`
+    :param max_error: The maximum distance in nanometers between a rounded corner or an arc
+                      and its chords
+    """
+    rings = _set_rings(polygons, max_error)
+
+    # The polygons are on the left of the rings, so outward is to the right
+    if amount != 0:
+        moved = (_offset_ring(ring, amount, max_error, exact=True) for ring in rings)
+        rings = [ring for ring in moved if ring is not None]
+
+    starts, ends = _ring_edges(rings)
+    return _combine(starts, ends, starts[:0], ends[:0], np.logical_or)
+
+def _ring_to_proto(ring: np.ndarray, polyline: base_types_pb2.PolyLine):
+    nodes = polyline.nodes
+    for x, y in ring.tolist():
+        point = nodes.add().point
+        point.x_nm = x
+        point.y_nm = y
+    polyline.closed = True
+
+def _ranges(first: np.ndarray, counts: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Expands the ranges of positions first[i] to first[i] + counts[i] - 1 into pairs of i and
+    each position in its range, yielded as two arrays in batches of about _CHUNK pairs"""
+    totals = np.cumsum(counts)
+    item = 0
+
+    while item < len(counts):
+        done = totals[item - 1] if item > 0 else 0
+        stop = max(item + 1, int(np.searchsorted(totals, done + _CHUNK, side="right")))
+        batch = np.arange(item, min(stop, len(counts)))
+        item = stop
+
+        batch_counts = counts[batch]
+        items = np.repeat(batch, batch_counts)
+        offset = np.arange(len(items)) - np.repeat(np.cumsum(batch_counts) - batch_counts,
+                                                   batch_counts)
+        yield items, first[items] + offset
+
+def _level_pairs(y: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                 margin: int = 0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yields batches of edges paired with the points whose y is within the edge's range of y,
+    widened by margin.  The points are sorted by y so that the points of each edge are found by
+    binary search rather than by testing every point."""
+    order = np.argsort(y, kind="stable")
+    sorted_y = y[order]
+    low = np.minimum(starts[:, 1], ends[:, 1])
+    high = np.maximum(starts[:, 1], ends[:, 1])
+    first = np.searchsorted(sorted_y, low - margin, side="left")
+    counts = np.searchsorted(sorted_y, high + margin, side="right") - first
+
+    for edge, position in _ranges(first, counts):
+        yield edge, order[position]
+
+def _contains(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+              tolerance: int) -> np.ndarray:
+    """Even-odd ray casting, with the holes counted as rings like the outline"""
+    crossings = np.zeros(len(points), dtype=np.int64)
+    on_edge = np.zeros(len(points), dtype=bool)
+
+    for pair_edge, pair_point in _level_pairs(points[:, 1], starts, ends, tolerance):
+        x1, y1 = starts[pair_edge, 0], starts[pair_edge, 1]
+        x2, y2 = ends[pair_edge, 0], ends[pair_edge, 1]
+        px, py = points[pair_point, 0], points[pair_point, 1]
+
+        straddles = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        np.add.at(crossings, pair_point[straddles & (px < crossing)], 1)
+
+        # Points on an edge: the cross product is exact in int64 for coordinates within a few
+        # meters
+        dx = x2 - x1
+        dy = y2 - y1
+        on_line = (dx * (py - y1) - dy * (px - x1) == 0) & (
+            (np.minimum(x1, x2) <= px) & (px <= np.maximum(x1, x2))
+            & (np.minimum(y1, y2) <= py) & (py <= np.maximum(y1, y2)))
+
+        if tolerance > 0:
+            length2 = (dx * dx + dy * dy).astype(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.nan_to_num(np.clip(((px - x1) * dx + (py - y1) * dy) / length2, 0, 1))
+            on_line |= np.hypot(x1 + t * dx - px, y1 + t * dy - py) <= tolerance
+
+        on_edge[pair_point[on_line]] = True
+
+    return (crossings % 2 == 1) | on_edge
+
+def _winding(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Returns the winding number of the edges around each point: the number of times they
+    cross a ray from the point to the right going up, less the times going down"""
+    winding = np.zeros(len(points), dtype=np.int64)
+
+    for pair_edge, pair_point in _level_pairs(points[:, 1], starts, ends):
+        x1, y1 = starts[pair_edge, 0], starts[pair_edge, 1]
+        x2, y2 = ends[pair_edge, 0], ends[pair_edge, 1]
+        px, py = points[pair_point, 0], points[pair_point, 1]
+
+        side = (x2 - x1) * (py - y1) - (px - x1) * (y2 - y1)
+        np.add.at(winding, pair_point[(y1 <= py) & (py < y2) & (side > 0)], 1)
+        np.subtract.at(winding, pair_point[(y2 <= py) & (py < y1) & (side < 0)], 1)
+
+    return winding
+
+def _piece_windings(starts: np.ndarray, ends: np.ndarray,
+                    among: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the winding numbers of the pieces selected by among on the left and on the right
+    of every piece.  Pieces meet only at their ends, so the winding number at the middle of a
+    piece, leaving out the pieces on top of it, is the one just beyond it along the ray, and the
+    pieces on top of it make up the difference between its sides.  Points probed off the piece
+    instead could land beyond other pieces that leave its ends at a tiny angle."""
+    direction = ends - starts
+    sign = np.where((direction[:, 0] > 0) | ((direction[:, 0] == 0) & (direction[:, 1] > 0)),
+                    1, -1)
+    key = np.concatenate([np.where(sign[:, None] > 0, starts, ends),
+                          np.where(sign[:, None] > 0, ends, starts)], axis=1)
+    _, same = np.unique(key, axis=0, return_inverse=True)
+    same = same.reshape(-1)
+    on_top = sign * np.bincount(same[among], weights=sign[among],
+                                minlength=len(key)).astype(np.int64)[same]
+
+    # With everything doubled the middles are whole.  Horizontal pieces lie along the ray, so
+    # those are wound with x and y swapped, which mirrors the pieces and negates the winding
+    # numbers.
+    middle = starts + ends
+    among_starts = 2 * starts[among]
+    among_ends = 2 * ends[among]
+    beyond = np.empty(len(starts), dtype=np.int64)
+    level = direction[:, 1] == 0
+    beyond[~level] = _winding(middle[~level], among_starts, among_ends)
+    beyond[level] = -_winding(middle[level][:, ::-1], among_starts[:, ::-1],
+                              among_ends[:, ::-1])
+
+    # Beyond is to the right of pieces going up and to the left of those going down, and above
+    # horizontal pieces
+    beyond_left = (direction[:, 1] < 0) | (level & (direction[:, 0] > 0))
+    left = np.where(beyond_left, beyond, beyond + on_top)
+    right = np.where(beyond_left, beyond - on_top, beyond)
+    return left, right
+
+def _offset_ring(ring: np.ndarray, amount: int, max_error: int,
+                 exact: bool = False) -> Optional[np.ndarray]:
+    """Moves each edge of a ring by amount to its right, with the y axis pointing up, rounding
+    the corners that open a gap and mitering those that overlap.  Returns None if the ring
+    collapses.
+
+    With exact, overlapping corners go from one moved edge back through the vertex to the other
+    instead, as Clipper does, so that the ring winds around every point within amount of the
+    ring on its right, and the union of the rings with the positive rule is the exact offset."""
+    if amount == 0:
+        return ring
+
+    points = ring.astype(np.float64)
+    direction = np.roll(points, -1, axis=0) - points
+    direction /= np.hypot(direction[:, 0], direction[:, 1])[:, None]
+    normal = np.column_stack((direction[:, 1], -direction[:, 0]))
+
+    # Vertex i joins edge i - 1 and edge i
+    before = np.roll(normal, 1, axis=0) * amount
+    after = normal * amount
+    gap = np.einsum("ij,ij->i", direction, np.roll(normal, 1, axis=0)) * amount < 0
+
+    radius = abs(amount)
+    start = np.arctan2(before[:, 1], before[:, 0])
+    sweep = np.arctan2(before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0],
+                       np.einsum("ij,ij->i", before, after))
+    step = 2 * math.acos(1 - max_error / radius) if radius > max_error else math.pi / 2
+    # A miter is within max_error of the rounded corner when the corner is shallow enough
+    rounded = gap & (np.abs(sweep) > 2 * math.acos(radius / (radius + max_error)))
+    steps = np.where(rounded, np.maximum(1, np.ceil(np.abs(sweep) / step)), 0).astype(np.int64)
+    through = ~gap if exact else np.zeros(len(ring), dtype=bool)
+
+    # Mitered corners are where the two moved edges meet; with the edges nearly parallel that is
+    # either moved vertex
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = radius * radius / (radius * radius + np.einsum("ij,ij->i", before, after))
+    miter = points + (before + after) * scale[:, None]
+    miter = np.where(np.isfinite(miter), miter, points + after)
+
+    if not exact:
+        # An edge whose moved ends have passed each other has vanished; when every edge has,
+        # the ring has collapsed
+        first = np.where(rounded[:, None], points + after, miter)
+        last = np.roll(np.where(rounded[:, None], points + before, miter), -1, axis=0)
+        if np.all(np.einsum("ij,ij->i", last - first, direction) <= 0):
+            return None
+
+    counts = np.where(through, 3, steps + 1)
+    vertex = np.repeat(np.arange(len(ring)), counts)
+    index = np.arange(len(vertex)) - np.repeat(np.cumsum(counts) - counts, counts)
+    angle = start[vertex] + sweep[vertex] * index / np.maximum(steps, 1)[vertex]
+    arc = points[vertex] + radius * np.column_stack((np.cos(angle), np.sin(angle)))
+    result = np.where(rounded[vertex, None], arc, miter[vertex])
+
+    # Through a vertex: the moved end of the edge before, the vertex, and the moved start of the
+    # edge after
+    detour = points[vertex] + np.where((index == 0)[:, None], before[vertex],
+                                       np.where((index == 2)[:, None], after[vertex], 0))
+    result = np.where(through[vertex, None], detour, result)
+    return _ring(np.rint(result).astype(np.int64))
+
+def _boolean(a: PolygonSet, b: PolygonSet,
+             operation: Callable[[np.ndarray, np.ndarray], np.ndarray],
+             max_error: int) -> List[Polygon]:
+    return _combine(*_ring_edges(_set_rings(a, max_error)),
+                    *_ring_edges(_set_rings(b, max_error)), operation)
+
+def _combine(a_starts: np.ndarray, a_ends: np.ndarray, b_starts: np.ndarray, b_ends: np.ndarray,
+             operation: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> List[Polygon]:
+    """Combines the areas that two sets of edges wind around by edge classification: every edge
+    is split where it meets another, and the pieces that have the result on one side and not the
+    other are kept and joined into rings"""
+    starts, ends, source = _split_edges(np.concatenate([a_starts, b_starts]),
+                                        np.concatenate([a_ends, b_ends]))
+
+    if len(starts) == 0:
+        return []
+
+    # Each set covers the points that its edges wind around, so polygons of a set may overlap
+    in_a = source < len(a_starts)
+    a_left, a_right = _piece_windings(starts, ends, in_a)
+    b_left, b_right = _piece_windings(starts, ends, ~in_a)
+    inside_left = operation(a_left > 0, b_left > 0)
+    inside_right = operation(a_right > 0, b_right > 0)
+
+    # Kept edges turn so that the result is on their left
+    keep = inside_left != inside_right
+    flip = inside_right[keep, None]
+    kept_starts = np.where(flip, ends[keep], starts[keep])
+    kept_ends = np.where(flip, starts[keep], ends[keep])
+    return _assemble(*_unique_edges(kept_starts, kept_ends))
+
+def _set_rings(polygons: PolygonSet, max_error: int) -> List[np.ndarray]:
+    """Returns the rings of a set of polygons, with outlines turning counter-clockwise and holes
+    clockwise when the y axis points up, so that the polygons are on the left of every edge and
+    the winding number of the rings is positive exactly inside the polygons"""
+    if max_error <= 0:
+        raise ValueError(f"max_error must be positive, not {max_error}")
+
+    rings = []
+
+    for polygon in polygons:
+        if isinstance(polygon, PolygonWithHoles):
+            polygon = Polygon.from_proto(polygon, max_error)
+
+        if _signed_area(polygon.outline) == 0:
+            continue
+
+        for index, ring in enumerate(polygon.rings):
+            area = _signed_area(ring)
+            if area != 0:
+                rings.append(ring if (area > 0) == (index == 0) else ring[::-1])
+
+    return rings
+
+def _ring_edges(rings: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    if not rings:
+        empty = np.empty((0, 2), dtype=np.int64)
+        return empty, empty
+
+    # The end of each edge is the next vertex, or the first of the ring for the last edge
+    starts = np.concatenate(rings)
+    following = np.arange(1, len(starts) + 1)
+    lengths = np.array([len(ring) for ring in rings])
+    last = np.cumsum(lengths) - 1
+    following[last] = last + 1 - lengths
+    return starts, starts[following]
+
+def _cross(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    return ax * by - ay * bx
+
+def _dot(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    return ax * bx + ay * by
+
+def _split_edges(starts: np.ndarray,
+                 ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits edges where they cross or overlap other edges, so that edges meet only at their
+    ends or lie on top of each other.  Returns the starts and ends of the pieces, and the number
+    of the edge that each piece came from.
+
+    Crossing points are rounded to whole nanometers, which moves the pieces slightly, so the
+    pieces are then snap rounded as described by Hobby: a piece that passes through the square
+    nanometer around the end of any piece is split there too, until none does."""
+    source = np.flatnonzero(np.any(starts != ends, axis=1))
+    edge_starts = starts[source]
+    edge_ends = ends[source]
+    starts, ends, origin = _cut(edge_starts, edge_ends, *_crossings(edge_starts, edge_ends))
+
+    while len(starts) > 0:
+        # Only pieces that were moved off their edge by rounding can pass through a pixel they
+        # did not before, and only their ends are pixels that pieces did not pass through before
+        direction = edge_ends[origin] - edge_starts[origin]
+        moved = np.zeros(len(starts), dtype=bool)
+        for points in (starts, ends):
+            relative = points - edge_starts[origin]
+            moved |= _cross(direction[:, 0], direction[:, 1], relative[:, 0], relative[:, 1]) != 0
+
+        hot = np.unique(np.concatenate([starts, ends]), axis=0)
+        moved_hot = np.unique(np.concatenate([starts[moved], ends[moved]]), axis=0)
+        moved_pieces = np.flatnonzero(moved)
+        exact_pieces = np.flatnonzero(~moved)
+        split_edges = []
+        split_points = []
+        for pieces, pixels in ((moved_pieces, hot), (exact_pieces, moved_hot)):
+            edge, point = _hot_pixels(starts[pieces], ends[pieces], pixels)
+            split_edges.append(pieces[edge])
+            split_points.append(point)
+
+        if sum(len(edge) for edge in split_edges) == 0:
+            break
+
+        starts, ends, cut_origin = _cut(starts, ends, split_edges, split_points)
+        origin = origin[cut_origin]
+
+    return starts, ends, source[origin]
+
+def _crossings(starts: np.ndarray,
+               ends: np.ndarray) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    """Finds where edges cross or overlap, returning the edges to split and where, in batches"""
+    min_x = np.minimum(starts[:, 0], ends[:, 0])
+    max_x = np.maximum(starts[:, 0], ends[:, 0])
+    min_y = np.minimum(starts[:, 1], ends[:, 1])
+    max_y = np.maximum(starts[:, 1], ends[:, 1])
+
+    # The edges that overlap an edge in x are the ones after it in order of min_x up to its max_x
+    order = np.argsort(min_x, kind="stable")
+    first = np.arange(1, len(order) + 1)
+    counts = np.searchsorted(min_x[order], max_x[order], side="right") - first
+
+    split_edges: List[np.ndarray] = []
+    split_points: List[np.ndarray] = []
+
+    for position, other in _ranges(first, counts):
+        i = order[position]
+        j = order[other]
+        overlap = (min_y[i] <= max_y[j]) & (min_y[j] <= max_y[i])
+        i = i[overlap]
+        j = j[overlap]
+
+        p = starts[i]
+        q = starts[j]
+        rx, ry = ends[i, 0] - p[:, 0], ends[i, 1] - p[:, 1]
+        sx, sy = ends[j, 0] - q[:, 0], ends[j, 1] - q[:, 1]
+        qpx, qpy = q[:, 0] - p[:, 0], q[:, 1] - p[:, 1]
+
+        # Exact in int64 for coordinates within a few meters
+        denominator = _cross(rx, ry, sx, sy)
+        t = _cross(qpx, qpy, sx, sy) * np.sign(denominator)
+        u = _cross(qpx, qpy, rx, ry) * np.sign(denominator)
+        size = np.abs(denominator)
+        crossing = (denominator != 0) & (t >= 0) & (t <= size) & (u >= 0) & (u <= size)
+
+        c = np.flatnonzero(crossing)
+        fraction = (t[c] / size[c])[:, None]
+        point = np.rint(p[c] + np.column_stack((rx[c], ry[c])) * fraction).astype(np.int64)
+        split_edges.extend((i[c], j[c]))
+        split_points.extend((point, point))
+
+        # Collinear edges that overlap split each other at their ends
+        c = np.flatnonzero((denominator == 0) & (_cross(qpx, qpy, rx, ry) == 0))
+        split_edges.extend((i[c], i[c], j[c], j[c]))
+        split_points.extend((starts[j[c]], ends[j[c]], starts[i[c]], ends[i[c]]))
+
+    return split_edges, split_points
+
+def _hot_pixels(starts: np.ndarray, ends: np.ndarray,
+                hot: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the points of hot that are not the ends of an edge but are within the square
+    nanometer around a point of the edge, returning the edges and the points"""
+    split_edges: List[np.ndarray] = []
+    split_points: List[np.ndarray] = []
+
+    for edge, point in _level_pairs(hot[:, 1], starts, ends, margin=1):
+        s = starts[edge]
+        e = ends[edge]
+        h = hot[point]
+        dx = e[:, 0] - s[:, 0]
+        dy = e[:, 1] - s[:, 1]
+
+        # The line through the edge meets the square around h when the corners of the square are
+        # not all on one side of it, and h must be between the ends to split the edge
+        near = (2 * np.abs(_cross(dx, dy, h[:, 0] - s[:, 0], h[:, 1] - s[:, 1]))
+                <= np.abs(dx) + np.abs(dy))
+        near &= (_dot(dx, dy, h[:, 0] - s[:, 0], h[:, 1] - s[:, 1]) > 0) \
+            & (_dot(dx, dy, h[:, 0] - e[:, 0], h[:, 1] - e[:, 1]) < 0)
+
+        split_edges.append(edge[near])
+        split_points.append(h[near])
+
+    if not split_edges:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2), dtype=np.int64)
+
+    return np.concatenate(split_edges), np.concatenate(split_points)
+
+def _cut(starts: np.ndarray, ends: np.ndarray, split_edges: List[np.ndarray],
+         split_points: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits edges at the given points, returning the starts and ends of the pieces and the
+    number of the edge that each came from"""
+    edge = np.concatenate([np.arange(len(starts)), np.arange(len(starts))] + split_edges)
+    points = np.concatenate([starts, ends] + split_points)
+    direction = (ends - starts)[edge]
+    along = np.einsum("ij,ij->i", (points - starts[edge]).astype(np.float64), direction) \
+        / np.einsum("ij,ij->i", direction, direction)
+    along[len(starts):2 * len(starts)] = 1
+
+    # Split points beyond the ends of an edge came from crossings at its ends, or from collinear
+    # edges that do not overlap it
+    inner = np.ones(len(edge), dtype=bool)
+    inner[2 * len(starts):] = (along[2 * len(starts):] > 0) & (along[2 * len(starts):] < 1)
+    edge, points, along = edge[inner], points[inner], along[inner]
+
+    order = np.lexsort((along, edge))
+    edge = edge[order]
+    points = points[order]
+    distinct = np.ones(len(edge), dtype=bool)
+    distinct[1:] = (edge[1:] != edge[:-1]) | np.any(points[1:] != points[:-1], axis=1)
+    edge = edge[distinct]
+    points = points[distinct]
+
+    piece = edge[1:] == edge[:-1]
+    return points[:-1][piece], points[1:][piece], edge[:-1][piece]
+
+def _unique_edges(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Removes repeated edges, which come from edges of a and b that lie on top of each other,
+    and pairs of opposite edges, which bound no area"""
+    edges = np.unique(np.concatenate([starts, ends], axis=1), axis=0)
+    reverse = edges[:, [2, 3, 0, 1]]
+    _, index, counts = np.unique(np.concatenate([edges, reverse]), axis=0, return_inverse=True,
+                                 return_counts=True)
+    single = counts[index.reshape(-1)[:len(edges)]] == 1
+    return edges[single, :2], edges[single, 2:]
+
+def _assemble(starts: np.ndarray, ends: np.ndarray) -> List[Polygon]:
+    """Joins directed edges with the result on their left into rings, and the rings into
+    polygons: rings turning counter-clockwise with the y axis up are outlines and the others are
+    holes"""
+    if len(starts) == 0:
+        return []
+
+    vertices, ids = np.unique(np.concatenate([starts, ends]), axis=0, return_inverse=True)
+    ids = ids.reshape(-1)
+    start_id = ids[:len(starts)]
+    end_id = ids[len(starts):]
+
+    by_start = np.argsort(start_id, kind="stable")
+    first_out = np.searchsorted(start_id[by_start], np.arange(len(vertices)))
+    out_count = np.bincount(start_id, minlength=len(vertices))
+    following = by_start[np.minimum(first_out[end_id], len(starts) - 1)]
+    following[out_count[end_id] == 0] = -1
+
+    # Where rings touch, take the first edge clockwise from the way back, which keeps the rings
+    # apart
+    angle = np.arctan2(ends[:, 1] - starts[:, 1], ends[:, 0] - starts[:, 0])
+    for edge in np.flatnonzero(out_count[end_id] > 1).tolist():
+        vertex = end_id[edge]
+        candidates = by_start[first_out[vertex]:first_out[vertex] + out_count[vertex]]
+        turn = (angle[edge] + math.pi - angle[candidates]) % (2 * math.pi)
+        following[edge] = candidates[np.argmin(turn)]
+
+    next_edge = following.tolist()
+    used = [False] * len(starts)
+    outlines = []
+    holes = []
+
+    for first in range(len(starts)):
+        if used[first]:
+            continue
+
+        ring = []
+        edge = first
+        while edge >= 0 and not used[edge]:
+            used[edge] = True
+            ring.append(edge)
+            edge = next_edge[edge]
+
+        # Edges that do not close a ring can only come from rounding; they are dropped
+        if edge != first:
+            continue
+
+        points = _straighten(starts[ring])
+        area = _signed_area(points)
+        if area > 0:
+            outlines.append((area, points))
+        elif area < 0:
+            holes.append(points)
+
+    outlines.sort(key=lambda outline: outline[0])
+    polygons = [[points] for _, points in outlines]
+
+    if holes and polygons:
+        # The middle of an edge of each hole is inside the smallest outline around the hole, and
+        # is on no outline, as rings share no edges.  With everything doubled the middles are
+        # whole.
+        middles = np.array([hole[0] + hole[1] for hole in holes])
+        owner = np.full(len(holes), -1)
+
+        for index, outline in enumerate(polygons):
+            doubled = 2 * outline[0]
+            waiting = np.flatnonzero((owner < 0) & np.all(
+                (middles >= doubled.min(axis=0)) & (middles <= doubled.max(axis=0)), axis=1))
+            if len(waiting) == 0:
+                continue
+
+            winding = _winding(middles[waiting], doubled, np.roll(doubled, -1, axis=0))
+            owner[waiting[winding != 0]] = index
+
+        for hole, index in zip(holes, owner.tolist()):
+            if index >= 0:
+                polygons[index].append(hole)
+
+    result = []
+    for rings in polygons:
+        polygon = Polygon.__new__(Polygon)
+        polygon.rings = rings
+        result.append(polygon)
+    return result
+
+def _straighten(ring: np.ndarray) -> np.ndarray:
+    """Removes the vertices in the middle of straight runs, left where edges were split"""
+    before = ring - np.roll(ring, 1, axis=0)
+    after = np.roll(ring, -1, axis=0) - ring
+    straight = (_cross(before[:, 0], before[:, 1], after[:, 0], after[:, 1]) == 0) \
+        & (np.einsum("ij,ij->i", before, after) > 0)
+    return ring[~straight]
@@ -0,0 +1,169 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Tracking which board items have changed between reads of the board.
+
+A :class:`BoardSnapshot` keeps a local mirror of some types of items on a board, along with a hash
+of each item's serialized form.  Each :meth:`BoardSnapshot.refresh` reports the items that were
+added, removed, or modified since the previous one, and only parses and wraps those, so tools
+that watch a board can do work in proportion to what changed rather than to the size of the
+board.
+
+.. versionadded:: 0.6.0
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple, Union
+
+from google.protobuf.any_pb2 import Any
+from google.protobuf.message import Message
+
+from kipy.board_types import BoardItem, unwrap
+from kipy.proto.common.types import KIID, KiCadObjectType
+from kipy.util import unpack_any
+
+if TYPE_CHECKING:
+    from kipy.board import Board
+
+def _id_is_first_field(message: Message) -> bool:
+    field = message.DESCRIPTOR.fields_by_name.get('id')
+    return (field is not None and field.number == 1
+            and field.message_type is KIID.DESCRIPTOR)
+
+# Whether the items of each packed type are identified by reading their ID from the start of the
+# serialized message, without parsing the rest
+_id_first_by_type_url: Dict[str, bool] = {}
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class BoardDiff:
+    """The changes found by :meth:`BoardSnapshot.refresh`"""
+    def __init__(self, added: List[BoardItem], removed: List[BoardItem],
+                 modified: List[BoardItem]):
+        #: Items that were not on the board at the previous refresh
+        self.added = added
+        #: Items that are no longer on the board, as they were at the previous refresh
+        self.removed = removed
+        #: Items whose properties have changed, in their new state
+        self.modified = modified
+
+    def __repr__(self) -> str:
+        return (f"BoardDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"modified={len(self.modified)})")
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+class BoardSnapshot:
+    """A local mirror of the items of the given types on a board.  Create one with
+    :meth:`kipy.board.Board.snapshot`.
+
+    Changes are found by comparing a hash of each item's serialized protobuf message with the one
+    from the previous refresh.  The API does not currently offer a way to ask KiCad for only the
+    items changed since a point in time, so each refresh still transfers every item of the
+    tracked types; the saving is in parsing and processing only the changes.
+    """
+    def __init__(
+        self,
+        board: "Board",
+        types: Union[KiCadObjectType.ValueType, Sequence[KiCadObjectType.ValueType]]
+    ):
+        self._board = board
+        self._types = [types] if isinstance(types, int) else list(types)
+        self._hashes: Dict[str, int] = {}
+        self._items: Dict[str, BoardItem] = {}
+        self.refresh()
+
+    @property
+    def types(self) -> List[KiCadObjectType.ValueType]:
+        return list(self._types)
+
+    @property
+    def items(self) -> Dict[str, BoardItem]:
+        """The mirrored items, by ID, as of the last refresh.  This dictionary is updated in
+        place by :meth:`refresh`, and should not be modified."""
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: Union[str, KIID]) -> bool:
+        return (item_id.value if isinstance(item_id, KIID) else item_id) in self._items
+
+    def __getitem__(self, item_id: Union[str, KIID]) -> BoardItem:
+        return self._items[item_id.value if isinstance(item_id, KIID) else item_id]
+
+    def refresh(self) -> BoardDiff:
+        """Reads the board again, updates the mirror, and returns what changed"""
+        added: List[BoardItem] = []
+        modified: List[BoardItem] = []
+        previous = self._hashes
+        hashes: Dict[str, int] = {}
+        changed: List[Tuple[str, Any]] = []
+
+        for packed in self._fetch():
+            item_id = self._item_id(packed)
+            content_hash = hash(packed.value)
+            hashes[item_id] = content_hash
+
+            if previous.get(item_id) != content_hash:
+                changed.append((item_id, packed))
+
+        wrapped = self._board._to_concrete_items([unwrap(packed) for _, packed in changed])
+
+        for (item_id, _), item in zip(changed, wrapped):
+            (modified if item_id in previous else added).append(item)
+            self._items[item_id] = item
+
+        removed = [self._items.pop(item_id) for item_id in previous.keys() - hashes.keys()]
+        self._hashes = hashes
+        return BoardDiff(added, removed, modified)
+
+    def _fetch(self) -> Iterable[Any]:
+        return self._board._fetch_raw_items(self._types)
+
+    def _item_id(self, packed: Any) -> str:
+        id_first = _id_first_by_type_url.get(packed.type_url)
+
+        if id_first is None:
+            id_first = _id_is_first_field(unpack_any(packed))
+            _id_first_by_type_url[packed.type_url] = id_first
+
+        data = packed.value
+
+        # The item's field 1 (a KIID), whose field 1 is the ID string
+        if id_first and data[:1] == b'\x0a':
+            _, offset = _read_varint(data, 1)
+            if data[offset:offset + 1] == b'\x0a':
+                length, offset = _read_varint(data, offset + 1)
+                return data[offset:offset + length].decode()
+
+        return unpack_any(packed).id.value
@@ -0,0 +1,560 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Spatial queries over board items.
+
+:class:`SpatialIndex` answers window, point, nearest-neighbour and within-distance queries over
+the tracks, arcs, vias, pads, zones and graphic shapes of a board without a request to KiCad::
+
+    index = SpatialIndex.from_board(board)
+    near_pad = index.within_distance(pad.position, from_mm(0.5))
+
+It is built on :class:`PackedRTree`, a static R-tree that is bulk loaded with the
+Sort-Tile-Recursive algorithm and stored in flat arrays.
+
+Item bounding boxes are calculated locally from the item geometry, by the same code as the
+``bounding_box()`` methods of the board item types.
+
+.. versionadded:: 0.6.0
+"""
+
+import heapq
+import math
+from array import array
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union, cast
+)
+
+from kipy.board import Board, BoardEditListener, _CommitJournal, _PROTO_OBJECT_TYPES
+from kipy.board_types import (
+    ArcTrack, BoardItem, BoardShape, FootprintInstance, Pad, Track, Via, Zone, _arc_track_bounds,
+    _pad_bounds, _track_bounds, _via_bounds
+)
+from kipy.common_types import Commit
+from kipy.geometry import Box2, Vector2, _arc_center, _on_arc
+from kipy.proto.common.types import KIID, KiCadObjectType
+from kipy.wrapper import Wrapper
+
+# An axis-aligned box as (min_x, min_y, max_x, max_y), in nanometers
+Bounds = Tuple[int, int, int, int]
+
+def _box_distance(bounds: Sequence[int], offset: int, x: float, y: float) -> float:
+    dx = max(bounds[offset] - x, 0.0, x - bounds[offset + 2])
+    dy = max(bounds[offset + 1] - y, 0.0, y - bounds[offset + 3])
+    return math.hypot(dx, dy)
+
+def _str_order(entries: List[int], boxes: Sequence[int], node_size: int) -> List[int]:
+    """Orders entries (indices of boxes in the flat `boxes` array) by the Sort-Tile-Recursive
+    algorithm, so that each run of `node_size` entries covers a compact area"""
+    node_count = math.ceil(len(entries) / node_size)
+    slice_count = max(1, math.ceil(math.sqrt(node_count)))
+    slice_size = slice_count * node_size
+
+    entries = sorted(entries, key=lambda e: boxes[4 * e] + boxes[4 * e + 2])
+    ordered: List[int] = []
+
+    for start in range(0, len(entries), slice_size):
+        ordered.extend(sorted(entries[start:start + slice_size],
+                              key=lambda e: boxes[4 * e + 1] + boxes[4 * e + 3]))
+
+    return ordered
+
+class PackedRTree:
+    """A static R-tree over axis-aligned boxes, identified by their position in the sequence
+    given to the constructor.
+
+    The tree is bulk loaded with the Sort-Tile-Recursive algorithm, which packs every node full,
+    and stored in two flat arrays (node boxes, and the first child or the box number of each
+    node) rather than as node objects.  It cannot be modified after it is built; see
+    :class:`SpatialIndex` for an index that can.
+
+    :param boxes: The boxes to index, as (min_x, min_y, max_x, max_y)
+    :param node_size: The number of children of each node
+    """
+    def __init__(self, boxes: Sequence[Bounds], node_size: int = 16):
+        self._node_size = max(2, node_size)
+        self._size = len(boxes)
+        self._boxes = array('q')
+        self._indices = array('q')
+        # The end of each level in the arrays, starting with the leaves
+        self._level_ends: List[int] = []
+
+        if self._size == 0:
+            return
+
+        flat = array('q')
+        for box in boxes:
+            flat.extend(box)
+
+        for entry in _str_order(list(range(self._size)), flat, self._node_size):
+            self._boxes.extend(flat[4 * entry:4 * entry + 4])
+            self._indices.append(entry)
+
+        start, end = 0, self._size
+        self._level_ends.append(end)
+
+        while end - start > 1 or len(self._level_ends) == 1:
+            self._add_level(start, end)
+            start, end = end, len(self._indices)
+            self._level_ends.append(end)
+
+    def _add_level(self, start: int, end: int):
+        node_size = self._node_size
+        boxes = self._boxes
+        indices = self._indices
+
+        # Reorder this level before grouping it; nodes take their child pointers with them
+        if start > 0:
+            order = _str_order(list(range(start, end)), boxes, node_size)
+            level_boxes = array('q')
+            level_indices = array('q')
+
+            for node in order:
+                level_boxes.extend(boxes[4 * node:4 * node + 4])
+                level_indices.append(indices[node])
+
+            boxes[4 * start:4 * end] = level_boxes
+            indices[start:end] = level_indices
+
+        for first in range(start, end, node_size):
+            last = min(first + node_size, end)
+            boxes.append(min(boxes[4 * i] for i in range(first, last)))
+            boxes.append(min(boxes[4 * i + 1] for i in range(first, last)))
+            boxes.append(max(boxes[4 * i + 2] for i in range(first, last)))
+            boxes.append(max(boxes[4 * i + 3] for i in range(first, last)))
+            indices.append(first)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _children(self, node: int, level: int) -> range:
+        first = self._indices[node]
+        return range(first, min(first + self._node_size, self._level_ends[level - 1]))
+
+    def search(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """Returns the numbers of the boxes that overlap or touch the given window"""
+        if self._size == 0:
+            return []
+
+        boxes = self._boxes
+        indices = self._indices
+        found: List[int] = []
+        stack = [(len(indices) - 1, len(self._level_ends) - 1)]
+
+        while stack:
+            node, level = stack.pop()
+
+            for child in self._children(node, level):
+                offset = 4 * child
+                if (boxes[offset] > max_x or boxes[offset + 1] > max_y
+                        or boxes[offset + 2] < min_x or boxes[offset + 3] < min_y):
+                    continue
+
+                if level == 1:
+                    found.append(indices[child])
+                else:
+                    stack.append((child, level - 1))
+
+        return found
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        max_distance: Optional[float] = None,
+        distance: Optional[Callable[[int], float]] = None,
+    ) -> Iterator[Tuple[float, int]]:
+        """Yields (distance, box number) pairs in order of increasing distance from the point.
+
+        :param max_distance: Stop at boxes further away than this
+        :param distance: A function giving the exact distance to the shape in a box, if the
+                         distance to the box itself is not enough.  It must never be less than
+                         the distance to the box.
+        """
+        if self._size == 0:
+            return
+
+        boxes = self._boxes
+        indices = self._indices
+        counter = 0
+        # Entries are (distance, tie breaker, node or box number, level); level 0 means a box
+        heap: List[Tuple[float, int, int, int]] = [
+            (0.0, 0, len(indices) - 1, len(self._level_ends) - 1)
+        ]
+
+        while heap:
+            dist, _, node, level = heapq.heappop(heap)
+
+            if max_distance is not None and dist > max_distance:
+                return
+
+            if level == 0:
+                yield dist, node
+                continue
+
+            for child in self._children(node, level):
+                child_dist = _box_distance(boxes, 4 * child, x, y)
+
+                if max_distance is not None and child_dist > max_distance:
+                    continue
+
+                counter += 1
+
+                if level == 1:
+                    entry = indices[child]
+                    if distance is not None:
+                        child_dist = distance(entry)
+                    heapq.heappush(heap, (child_dist, counter, entry, 0))
+                else:
+                    heapq.heappush(heap, (child_dist, counter, child, level - 1))
+
+def _segment_distance(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+def _arc_distance(px: float, py: float, sx: int, sy: int, mx: int, my: int, ex: int,
+                  ey: int) -> float:
+    center = _arc_center(sx, sy, mx, my, ex, ey)
+
+    if center is None:
+        return _segment_distance(px, py, sx, sy, ex, ey)
+
+    cx, cy = center
+    angle = math.atan2(py - cy, px - cx)
+
+    if _on_arc(angle, math.atan2(sy - cy, sx - cx), math.atan2(my - cy, mx - cx),
+               math.atan2(ey - cy, ex - cx)):
+        return abs(math.hypot(px - cx, py - cy) - math.hypot(sx - cx, sy - cy))
+
+    return min(math.hypot(px - sx, py - sy), math.hypot(px - ex, py - ey))
+
+def item_bounds(item: BoardItem) -> Optional[Bounds]:
+    """Calculates the bounding box of a track, arc, via, pad, footprint, zone or graphic shape
+    from its geometry, or returns None for other items and for shapes that cannot be bounded
+    locally"""
+    if isinstance(item, Track):
+        return _track_bounds(item.proto)
+
+    if isinstance(item, ArcTrack):
+        return _arc_track_bounds(item.proto)
+
+    if isinstance(item, Via):
+        return _via_bounds(item.proto)
+
+    if isinstance(item, Pad):
+        return _pad_bounds(item.proto)
+
+    if isinstance(item, (Zone, BoardShape, FootprintInstance)):
+        try:
+            box = item.bounding_box()
+        except (NotImplementedError, IndexError):
+            # Only the concrete shape types, such as BoardSegment, can calculate a bounding box
+            return None
+
+        pos, size = box.pos, box.size
+        return pos.x, pos.y, pos.x + size.x, pos.y + size.y
+
+    return None
+
+# Bounds of the item types that are bounded from their protobuf message alone
+_PROTO_BOUNDS: Dict[type, Callable[[Any], Bounds]] = {
+    Track: _track_bounds,
+    ArcTrack: _arc_track_bounds,
+    Via: _via_bounds,
+    Pad: _pad_bounds,
+}
+
+def item_bounds_many(items: Iterable[BoardItem]) -> List[Optional[Bounds]]:
+    """Calculates the bounding boxes of many items, as :func:`item_bounds` does for each one.
+    The item type is looked up once per item rather than tested against each bounded type, which
+    makes this the faster way to bound a whole board."""
+    bounds: List[Optional[Bounds]] = []
+    proto_bounds = _PROTO_BOUNDS
+
+    for item in items:
+        function = proto_bounds.get(type(item))
+        bounds.append(function(item.proto) if function is not None else item_bounds(item))
+
+    return bounds
+
+def _item_distance(item: BoardItem, bounds: Bounds, x: float, y: float) -> float:
+    proto = item.proto
+
+    if isinstance(item, Track):
+        distance = _segment_distance(x, y, proto.start.x_nm, proto.start.y_nm, proto.end.x_nm,
+                                     proto.end.y_nm) - proto.width.value_nm / 2
+    elif isinstance(item, ArcTrack):
+        distance = _arc_distance(x, y, proto.start.x_nm, proto.start.y_nm, proto.mid.x_nm,
+                                 proto.mid.y_nm, proto.end.x_nm,
+                                 proto.end.y_nm) - proto.width.value_nm / 2
+    elif isinstance(item, Via):
+        distance = math.hypot(x - proto.position.x_nm, y - proto.position.y_nm) - (
+            bounds[2] - bounds[0]) / 2
+    else:
+        return _box_distance(bounds, 0, x, y)
+
+    # Never closer than the bounding box, which the tree relies on
+    return max(distance, _box_distance(bounds, 0, x, y))
+
+# The item types indexed by SpatialIndex unless others are given
+_DEFAULT_SPATIAL_TYPES = [
+    KiCadObjectType.KOT_PCB_TRACE,
+    KiCadObjectType.KOT_PCB_ARC,
+    KiCadObjectType.KOT_PCB_VIA,
+    KiCadObjectType.KOT_PCB_PAD,
+    KiCadObjectType.KOT_PCB_ZONE,
+    KiCadObjectType.KOT_PCB_SHAPE,
+]
+
+class SpatialIndex(BoardEditListener):
+    """A spatial index of board items, answering queries by bounding box and, for tracks, arcs
+    and vias, by exact distance to the item's copper.
+
+    Items can be added with :meth:`insert` and removed with :meth:`remove`.  The index created
+    by :meth:`from_board` is also a :class:`kipy.board.BoardEditListener`, so it follows edits
+    made through the Board the same way as :class:`kipy.board.BoardIndex` does.
+
+    Items inserted after the tree was built are kept in a short list that is searched linearly,
+    and removed items are skipped, until enough have changed that the tree is rebuilt.
+
+    :param items: The items to index; items that cannot be bounded are ignored
+    :param node_size: The number of children of each node of the tree
+    """
+    def __init__(self, items: Iterable[BoardItem] = (), node_size: int = 16):
+        self._board: Optional[Board] = None
+        self._types: List[KiCadObjectType.ValueType] = list(_DEFAULT_SPATIAL_TYPES)
+        self._node_size = node_size
+        self._entries: Dict[str, Tuple[BoardItem, Bounds]] = {}
+        self._commits = _CommitJournal()
+        self._stale = False
+        self._rebuild(items)
+
+    @classmethod
+    def from_board(
+        cls, board: Board, types: Optional[Sequence[KiCadObjectType.ValueType]] = None
+    ) -> "SpatialIndex":
+        """Fetches the items of the given types (by default tracks, arcs, vias, pads, zones and
+        graphic shapes) and indexes them.  The index follows edits made through the board until
+        it is passed to :meth:`kipy.board.Board.remove_edit_listener`."""
+        index = cls()
+        index._board = board
+
+        if types is not None:
+            index._types = list(types)
+
+        index.refresh()
+        board.add_edit_listener(index)
+        return index
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._entries)
+
+    def refresh(self):
+        """Fetches the indexed item types from the board again and rebuilds the index"""
+        if self._board is not None:
+            self._rebuild(cast(Sequence[BoardItem], self._board.get_items(self._types)))
+
+    def insert(self, items: Union[BoardItem, Iterable[BoardItem]]):
+        """Adds items to the index, replacing any indexed items with the same IDs"""
+        self._ensure_built()
+
+        for item in [items] if isinstance(items, BoardItem) else items:
+            bounds = item_bounds(item)
+            item_id = item.id.value
+            self._discard(item_id)
+
+            if bounds is not None:
+                self._entries[item_id] = (item, bounds)
+                self._pending[item_id] = bounds
+
+        self._maybe_rebuild()
+
+    def remove(self, items: Union[BoardItem, KIID, str, Iterable[Union[BoardItem, KIID, str]]]):
+        """Removes items from the index, given as items, KIIDs, or ID strings"""
+        self._ensure_built()
+
+        if isinstance(items, (BoardItem, KIID, str)):
+            items = [items]
+
+        for item in items:
+            if isinstance(item, BoardItem):
+                self._discard(item.id.value)
+            else:
+                self._discard(item if isinstance(item, str) else item.value)
+
+        self._maybe_rebuild()
+
+    def in_box(self, box: Box2) -> List[BoardItem]:
+        """Returns the items whose bounding boxes overlap or touch the given box"""
+        pos, size = box.pos, box.size
+        return [item for _, item in self._search(pos.x, pos.y, pos.x + size.x, pos.y + size.y)]
+
+    def at_point(self, point: Vector2) -> List[BoardItem]:
+        """Returns the items whose bounding boxes contain the given point.  These are the
+        candidates for a hit test at that point."""
+        return [item for _, item in self._search(point.x, point.y, point.x, point.y)]
+
+    def nearest(
+        self, point: Vector2, k: int = 1, max_distance: Optional[float] = None
+    ) -> List[BoardItem]:
+        """Returns up to k items nearest to the given point, closest first.  Distances are to the
+        copper of tracks, arcs and vias, and to the bounding box of other items; an item that
+        contains the point is at distance 0."""
+        found = []
+
+        for _, item in self._nearest(point.x, point.y, max_distance):
+            found.append(item)
+            if len(found) == k:
+                break
+
+        return found
+
+    def within_distance(self, point: Vector2, distance: float) -> List[BoardItem]:
+        """Returns the items within the given distance of the point, closest first; distances
+        are measured as for :meth:`nearest`"""
+        return [item for _, item in self._nearest(point.x, point.y, distance)]
+
+    def _ensure_built(self):
+        if self._stale:
+            self.refresh()
+
+    def _rebuild(self, items: Iterable[BoardItem]):
+        entries: Dict[str, Tuple[BoardItem, Bounds]] = {}
+
+        items = list(items)
+
+        for item, bounds in zip(items, item_bounds_many(items)):
+            if bounds is not None:
+                entries[item.proto.id.value] = (item, bounds)
+
+        self._build(entries)
+
+    def _build(self, entries: Dict[str, Tuple[BoardItem, Bounds]]):
+        self._entries = entries
+        self._tree_ids = list(entries.keys())
+        self._tree_slots = {item_id: slot for slot, item_id in enumerate(self._tree_ids)}
+        self._tree = PackedRTree([bounds for _, bounds in entries.values()], self._node_size)
+        self._pending: Dict[str, Bounds] = {}
+        self._removed: Set[str] = set()
+        self._stale = False
+
+    def _discard(self, item_id: str):
+        if self._entries.pop(item_id, None) is None:
+            return
+
+        self._pending.pop(item_id, None)
+        if item_id in self._tree_slots:
+            self._removed.add(item_id)
+
+    def _maybe_rebuild(self):
+        if len(self._pending) + len(self._removed) > max(64, len(self._tree) // 8):
+            self._build(self._entries)
+
+    def _search(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> List[Tuple[str, BoardItem]]:
+        self._ensure_built()
+        found = []
+
+        for slot in self._tree.search(min_x, min_y, max_x, max_y):
+            item_id = self._tree_ids[slot]
+            if item_id not in self._removed:
+                found.append((item_id, self._entries[item_id][0]))
+
+        for item_id, bounds in self._pending.items():
+            if (bounds[0] <= max_x and bounds[1] <= max_y and bounds[2] >= min_x
+                    and bounds[3] >= min_y):
+                found.append((item_id, self._entries[item_id][0]))
+
+        return found
+
+    def _nearest(
+        self, x: float, y: float, max_distance: Optional[float]
+    ) -> Iterator[Tuple[float, BoardItem]]:
+        self._ensure_built()
+        entries = self._entries
+        tree_ids = self._tree_ids
+        removed = self._removed
+
+        def distance(slot: int) -> float:
+            item_id = tree_ids[slot]
+            if item_id in removed:
+                return math.inf
+            item, bounds = entries[item_id]
+            return _item_distance(item, bounds, x, y)
+
+        # Pending items are few, so they are measured up front and merged in by distance
+        pending = sorted(
+            (_item_distance(entries[item_id][0], bounds, x, y), item_id)
+            for item_id, bounds in self._pending.items()
+        )
+        pending_index = 0
+
+        for dist, slot in self._tree.nearest(x, y, max_distance, distance):
+            if dist == math.inf:
+                break
+
+            while pending_index < len(pending) and pending[pending_index][0] <= dist:
+                yield pending[pending_index][0], entries[pending[pending_index][1]][0]
+                pending_index += 1
+
+            yield dist, entries[tree_ids[slot]][0]
+
+        for dist, item_id in pending[pending_index:]:
+            if max_distance is not None and dist > max_distance:
+                break
+            yield dist, entries[item_id][0]
+
+    def on_items_created(self, items: Sequence[Wrapper]):
+        self._commits.record_edit()
+        if self._board is not None:
+            self._insert_indexed_types(self._board._to_concrete_items(items))
+
+    def on_items_updated(self, items: Sequence[BoardItem]):
+        self._commits.record_edit()
+        self._insert_indexed_types(items)
+
+    def _insert_indexed_types(self, items: Sequence[BoardItem]):
+        if not self._stale:
+            self.insert([item for item in items
+                         if _PROTO_OBJECT_TYPES.get(type(item.proto)) in self._types])
+
+    def on_items_removed(self, item_ids: Sequence[str]):
+        self._commits.record_edit()
+        if not self._stale:
+            self.remove(item_ids)
+
+    def on_commit_begun(self, commit: Commit):
+        self._commits.begin(commit)
+
+    def on_commit_pushed(self, commit: Commit):
+        self._commits.end(commit)
+
+    def on_commit_dropped(self, commit: Commit):
+        if self._commits.end(commit):
+            self._stale = True
+
+    def on_board_changed(self):
+        self._stale = True
+        self._commits.clear()
@@ -0,0 +1,534 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""An in-process stand-in for KiCad's API server, backed by an in-memory board.
+
+:class:`FakeKiCad` answers the item commands that :class:`kipy.board.Board` uses (GetItems,
+GetItemsByNet, CreateItems, UpdateItems, DeleteItems, BeginCommit/EndCommit, GetNets, HitTest,
+GetBoundingBox, GetPadShapeAsPolygon, and RefillZones), plus enough
+of the base commands (Ping, GetVersion, GetOpenDocuments) for :class:`kipy.KiCad` to open the
+board.  It is meant for measuring client-side throughput and memory on large synthetic boards::
+
+    with FakeKiCad() as fake:
+        fake.add_items(synthetic_tracks(100_000))
+        board = KiCad(socket_path=fake.socket_path).get_board()
+        tracks = board.get_tracks()
+
+Only the item store is modelled: there is no connectivity, no DRC, and no zone filling, and
+field masks are ignored.
+
+.. versionadded:: 0.6.0
+"""
+
+import math
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from google.protobuf.any_pb2 import Any
+from google.protobuf.empty_pb2 import Empty
+from google.protobuf.message import Message
+
+from kipy.proto.board import board_commands_pb2, board_types_pb2
+from kipy.proto.common import ApiRequest, ApiResponse, ApiStatusCode
+from kipy.proto.common.commands import base_commands_pb2, editor_commands_pb2
+from kipy.proto.common.types import DocumentType, KiCadObjectType, base_types_pb2
+from kipy.testing.server import RepServer
+from kipy.util import pack_any, unpack_any
+from kipy.wrapper import Wrapper
+
+_OBJECT_TYPES: Dict[str, KiCadObjectType.ValueType] = {
+    board_types_pb2.Track.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_TRACE,
+    board_types_pb2.Arc.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_ARC,
+    board_types_pb2.Via.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_VIA,
+    board_types_pb2.Pad.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_PAD,
+    board_types_pb2.FootprintInstance.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_FOOTPRINT,
+    board_types_pb2.BoardGraphicShape.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_SHAPE,
+    board_types_pb2.BoardText.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_TEXT,
+    board_types_pb2.BoardTextBox.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_TEXTBOX,
+    board_types_pb2.Dimension.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_DIMENSION,
+    board_types_pb2.Zone.DESCRIPTOR.full_name: KiCadObjectType.KOT_PCB_ZONE,
+}
+
+class _RequestFailed(Exception):
+    def __init__(self, code: ApiStatusCode.ValueType, message: str):
+        super().__init__(message)
+        self.code = code
+
+def _object_type(item: Any) -> Optional[KiCadObjectType.ValueType]:
+    return _OBJECT_TYPES.get(item.type_url.rpartition('/')[2])
+
+def _distance_to_segment(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+def _hit(item: Message, x: int, y: int, tolerance: int) -> bool:
+    if isinstance(item, board_types_pb2.Track):
+        return _distance_to_segment(x, y, item.start.x_nm, item.start.y_nm, item.end.x_nm,
+                                    item.end.y_nm) <= item.width.value_nm / 2 + tolerance
+
+    if isinstance(item, board_types_pb2.Arc):
+        # Approximated by the chords through the midpoint
+        distance = min(
+            _distance_to_segment(x, y, item.start.x_nm, item.start.y_nm, item.mid.x_nm,
+                                 item.mid.y_nm),
+            _distance_to_segment(x, y, item.mid.x_nm, item.mid.y_nm, item.end.x_nm,
+                                 item.end.y_nm)
+        )
+        return distance <= item.width.value_nm / 2 + tolerance
+
+    if isinstance(item, (board_types_pb2.Via, board_types_pb2.Pad)):
+        if len(item.pad_stack.copper_layers) == 0:
+            return False
+
+        layer = item.pad_stack.copper_layers[0]
+        half_x = layer.size.x_nm / 2 + tolerance
+        half_y = layer.size.y_nm / 2 + tolerance
+        dx = abs(x - item.position.x_nm)
+        dy = abs(y - item.position.y_nm)
+
+        if isinstance(item, board_types_pb2.Via) or layer.shape == board_types_pb2.PSS_CIRCLE:
+            return math.hypot(dx, dy) <= half_x
+
+        # Other pad shapes are treated as unrotated rectangles
+        return dx <= half_x and dy <= half_y
+
+    return False
+
+def _bounding_box(item: Message) -> Optional[Tuple[int, int, int, int]]:
+    if isinstance(item, (board_types_pb2.Track, board_types_pb2.Arc)):
+        # Arcs are bounded by their three points, which is exact only for shallow arcs
+        points = [item.start, item.end]
+
+        if isinstance(item, board_types_pb2.Arc):
+            points.append(item.mid)
+
+        half_width = item.width.value_nm // 2
+        xs = [point.x_nm for point in points]
+        ys = [point.y_nm for point in points]
+        return (min(xs) - half_width, min(ys) - half_width, max(xs) + half_width,
+                max(ys) + half_width)
+
+    if isinstance(item, (board_types_pb2.Via, board_types_pb2.Pad)):
+        size = item.pad_stack.copper_layers[0].size if item.pad_stack.copper_layers else None
+        half_x = size.x_nm // 2 if size is not None else 0
+        half_y = size.y_nm // 2 if size is not None else 0
+        return (item.position.x_nm - half_x, item.position.y_nm - half_y,
+                item.position.x_nm + half_x, item.position.y_nm + half_y)
+
+    return None
+
+def _pad_polygon(pad: board_types_pb2.Pad) -> Optional[base_types_pb2.PolygonWithHoles]:
+    if len(pad.pad_stack.copper_layers) == 0:
+        return None
+
+    layer = pad.pad_stack.copper_layers[0]
+    half_x = layer.size.x_nm / 2
+    half_y = layer.size.y_nm / 2
+
+    if layer.shape == board_types_pb2.PSS_CIRCLE:
+        corners = [(half_x * math.cos(i * math.pi / 16), half_x * math.sin(i * math.pi / 16))
+                   for i in range(32)]
+    else:
+        # Other shapes are treated as rectangles, rotated with the padstack
+        angle = math.radians(pad.pad_stack.angle.value_degrees)
+        cos, sin = math.cos(angle), math.sin(angle)
+        corners = [(x * cos - y * sin, x * sin + y * cos)
+                   for x, y in ((-half_x, -half_y), (half_x, -half_y), (half_x, half_y),
+                                (-half_x, half_y))]
+
+    polygon = base_types_pb2.PolygonWithHoles()
+    polygon.outline.closed = True
+
+    for x, y in corners:
+        point = polygon.outline.nodes.add().point
+        point.x_nm = pad.position.x_nm + round(x)
+        point.y_nm = pad.position.y_nm + round(y)
+
+    return polygon
+
+class FakeKiCad(RepServer):
+    """A fake KiCad with one open board, whose items are kept in memory.
+
+    Items can be added through the API (for example with :meth:`kipy.board.Board.create_items`)
+    or directly with :meth:`add_items`, which is much faster for building large boards.
+
+    :param board_filename: The file name reported for the open board
+
+    .. attribute:: zone_fill_seconds
+
+        How long a RefillZones request keeps the fake busy; like KiCad, it answers every request
+        with AS_BUSY until the fill is done
+    """
+    def __init__(self, socket_path: Optional[str] = None, workers: int = 4,
+                 board_filename: str = "fake.kicad_pcb"):
+        super().__init__(socket_path, workers)
+        self.board_filename = board_filename
+        self.kicad_token = "fake-kicad"
+        self.version = base_types_pb2.KiCadVersion(major=9, minor=0, patch=0,
+                                                   full_version="9.0.0 (fake)")
+        self.nets: Dict[int, str] = {0: ""}
+        self.zone_fill_seconds = 0.0
+        self._busy_until = 0.0
+        self._items: Dict[str, Any] = {}
+        self._commits: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._handlers: Dict[str, Callable[[Any], Message]] = {
+            base_commands_pb2.Ping.DESCRIPTOR.full_name: self._ping,
+            base_commands_pb2.GetVersion.DESCRIPTOR.full_name: self._get_version,
+            editor_commands_pb2.GetOpenDocuments.DESCRIPTOR.full_name: self._get_open_documents,
+            editor_commands_pb2.BeginCommit.DESCRIPTOR.full_name: self._begin_commit,
+            editor_commands_pb2.EndCommit.DESCRIPTOR.full_name: self._end_commit,
+            editor_commands_pb2.GetItems.DESCRIPTOR.full_name: self._get_items,
+            board_commands_pb2.GetItemsByNet.DESCRIPTOR.full_name: self._get_items_by_net,
+            editor_commands_pb2.CreateItems.DESCRIPTOR.full_name: self._create_items,
+            editor_commands_pb2.UpdateItems.DESCRIPTOR.full_name: self._update_items,
+            editor_commands_pb2.DeleteItems.DESCRIPTOR.full_name: self._delete_items,
+            editor_commands_pb2.HitTest.DESCRIPTOR.full_name: self._hit_test,
+            editor_commands_pb2.GetBoundingBox.DESCRIPTOR.full_name: self._get_bounding_box,
+            board_commands_pb2.GetNets.DESCRIPTOR.full_name: self._get_nets,
+            board_commands_pb2.GetPadShapeAsPolygon.DESCRIPTOR.full_name: self._get_pad_shapes,
+            board_commands_pb2.RefillZones.DESCRIPTOR.full_name: self._refill_zones,
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add_items(self, items: Iterable[Union[Wrapper, Message]]):
+        """Adds items to the board without going through the API.  Items without an ID are given
+        a new one, and items with the ID of an existing item replace it."""
+        with self._lock:
+            for item in items:
+                proto = item.proto if isinstance(item, Wrapper) else item
+                self._store(proto)
+
+    def get_item(self, item_id: str) -> Optional[Message]:
+        """Returns the stored proto of the item with the given ID, if there is one"""
+        with self._lock:
+            item = self._items.get(item_id)
+        return unpack_any(item) if item is not None else None
+
+    def handle(self, request_data: bytes) -> bytes:
+        request = ApiRequest()
+        request.ParseFromString(request_data)
+
+        reply = ApiResponse()
+        reply.header.kicad_token = self.kicad_token
+        handler = self._handlers.get(request.message.type_url.rpartition('/')[2])
+
+        if handler is None:
+            reply.status.status = ApiStatusCode.AS_UNHANDLED
+            reply.status.error_message = f"{request.message.type_url} is not handled by FakeKiCad"
+            return reply.SerializeToString()
+
+        if time.monotonic() < self._busy_until:
+            reply.status.status = ApiStatusCode.AS_BUSY
+            reply.status.error_message = "KiCad is busy filling zones"
+            return reply.SerializeToString()
+
+        try:
+            with self._lock:
+                response = handler(request.message)
+        except _RequestFailed as e:
+            reply.status.status = e.code
+            reply.status.error_message = str(e)
+            return reply.SerializeToString()
+
+        reply.status.status = ApiStatusCode.AS_OK
+        reply.message.Pack(response)
+        return reply.SerializeToString()
+
+    def _store(self, proto: Message) -> Any:
+        if not proto.id.value:
+            proto.id.value = str(uuid.uuid4())
+
+        packed = pack_any(proto)
+        self._items[proto.id.value] = packed
+
+        net = getattr(proto, 'net', None)
+        if net is not None and net.code.value not in self.nets:
+            self.nets[net.code.value] = net.name
+
+        return packed
+
+    def _check_document(self, header: base_types_pb2.ItemHeader) -> bool:
+        return header.document.board_filename in ("", self.board_filename)
+
+    def _ping(self, message: Any) -> Message:
+        return Empty()
+
+    def _get_version(self, message: Any) -> Message:
+        return base_commands_pb2.GetVersionResponse(version=self.version)
+
+    def _get_open_documents(self, message: Any) -> Message:
+        command = editor_commands_pb2.GetOpenDocuments()
+        message.Unpack(command)
+        response = editor_commands_pb2.GetOpenDocumentsResponse()
+
+        if command.type == DocumentType.DOCTYPE_PCB:
+            document = response.documents.add()
+            document.type = DocumentType.DOCTYPE_PCB
+            document.board_filename = self.board_filename
+
+        return response
+
+    def _begin_commit(self, message: Any) -> Message:
+        response = editor_commands_pb2.BeginCommitResponse()
+        response.id.value = str(uuid.uuid4())
+        # Items are replaced rather than modified in place, so a shallow copy is a snapshot
+        self._commits[response.id.value] = dict(self._items)
+        return response
+
+    def _end_commit(self, message: Any) -> Message:
+        command = editor_commands_pb2.EndCommit()
+        message.Unpack(command)
+        snapshot = self._commits.pop(command.id.value, None)
+
+        if snapshot is None:
+            raise _RequestFailed(ApiStatusCode.AS_BAD_REQUEST,
+                                 f"no commit is open with ID {command.id.value}")
+
+        if command.action == editor_commands_pb2.CMA_DROP:
+            self._items = snapshot
+
+        return editor_commands_pb2.EndCommitResponse()
+
+    def _get_items(self, message: Any) -> Message:
+        command = editor_commands_pb2.GetItems()
+        message.Unpack(command)
+        response = editor_commands_pb2.GetItemsResponse()
+        response.header.CopyFrom(command.header)
+
+        if not self._check_document(command.header):
+            response.status = base_types_pb2.IRS_DOCUMENT_NOT_FOUND
+            return response
+
+        types = set(command.types)
+        response.items.extend(
+            item for item in self._items.values() if _object_type(item) in types
+        )
+        response.status = base_types_pb2.IRS_OK
+        return response
+
+    def _get_items_by_net(self, message: Any) -> Message:
+        command = board_commands_pb2.GetItemsByNet()
+        message.Unpack(command)
+        response = editor_commands_pb2.GetItemsResponse()
+        response.header.CopyFrom(command.header)
+
+        if not self._check_document(command.header):
+            response.status = base_types_pb2.IRS_DOCUMENT_NOT_FOUND
+            return response
+
+        types = set(command.types)
+        codes = {net_code.value for net_code in command.net_codes}
+
+        for item in self._items.values():
+            if _object_type(item) not in types:
+                continue
+
+            net = getattr(unpack_any(item), 'net', None)
+
+            if net is not None and net.code.value in codes:
+                response.items.append(item)
+
+        response.status = base_types_pb2.IRS_OK
+        return response
+
+    def _create_items(self, message: Any) -> Message:
+        command = editor_commands_pb2.CreateItems()
+        message.Unpack(command)
+        response = editor_commands_pb2.CreateItemsResponse()
+        response.header.CopyFrom(command.header)
+
+        if not self._check_document(command.header):
+            response.status = base_types_pb2.IRS_DOCUMENT_NOT_FOUND
+            return response
+
+        for item in command.items:
+            result = response.created_items.add()
+
+            if _object_type(item) is None:
+                result.status.code = editor_commands_pb2.ISC_INVALID_TYPE
+                result.status.error_message = f"cannot create {item.type_url}"
+                continue
+
+            proto = unpack_any(item)
+
+            if proto.id.value in self._items:
+                result.status.code = editor_commands_pb2.ISC_EXISTING
+                continue
+
+            result.item.CopyFrom(self._store(proto))
+            result.status.code = editor_commands_pb2.ISC_OK
+
+        response.status = base_types_pb2.IRS_OK
+        return response
+
+    def _update_items(self, message: Any) -> Message:
+        command = editor_commands_pb2.UpdateItems()
+        message.Unpack(command)
+        response = editor_commands_pb2.UpdateItemsResponse()
+        response.header.CopyFrom(command.header)
+
+        if not self._check_document(command.header):
+            response.status = base_types_pb2.IRS_DOCUMENT_NOT_FOUND
+            return response
+
+        for item in command.items:
+            result = response.updated_items.add()
+            proto = unpack_any(item)
+
+            if proto.id.value not in self._items:
+                result.status.code = editor_commands_pb2.ISC_NONEXISTENT
+                continue
+
+            result.item.CopyFrom(self._store(proto))
+            result.status.code = editor_commands_pb2.ISC_OK
+
+        response.status = base_types_pb2.IRS_OK
+        return response
+
+    def _delete_items(self, message: Any) -> Message:
+        command = editor_commands_pb2.DeleteItems()
+        message.Unpack(command)
+        response = editor_commands_pb2.DeleteItemsResponse()
+        response.header.CopyFrom(command.header)
+
+        if not self._check_document(command.header):
+            response.status = base_types_pb2.IRS_DOCUMENT_NOT_FOUND
+            return response
+
+        for item_id in command.item_ids:
+            result = response.deleted_items.add()
+            result.id.CopyFrom(item_id)
+            removed = self._items.pop(item_id.value, None)
+            result.status = (
+                editor_commands_pb2.IDS_OK if removed is not None
+                else editor_commands_pb2.IDS_NONEXISTENT
+            )
+
+        response.status = base_types_pb2.IRS_OK
+        return response
+
+    def _hit_test(self, message: Any) -> Message:
+        command = editor_commands_pb2.HitTest()
+        message.Unpack(command)
+        item = self._items.get(command.id.value)
+
+        if item is None:
+            raise _RequestFailed(ApiStatusCode.AS_BAD_REQUEST,
+                                 f"no item found with ID {command.id.value}")
+
+        hit = _hit(unpack_any(item), command.position.x_nm, command.position.y_nm,
+                   command.tolerance)
+        return editor_commands_pb2.HitTestResponse(
+            result=editor_commands_pb2.HTR_HIT if hit else editor_commands_pb2.HTR_NO_HIT
+        )
+
+    def _get_bounding_box(self, message: Any) -> Message:
+        # Only tracks, arcs, vias and pads have a box; the text mode is ignored
+        command = editor_commands_pb2.GetBoundingBox()
+        message.Unpack(command)
+        response = editor_commands_pb2.GetBoundingBoxResponse()
+
+        for item_id in command.items:
+            item = self._items.get(item_id.value)
+            box = _bounding_box(unpack_any(item)) if item is not None else None
+
+            if box is None:
+                continue
+
+            response.items.add().value = item_id.value
+            proto = response.boxes.add()
+            proto.position.x_nm, proto.position.y_nm = box[0], box[1]
+            proto.size.x_nm, proto.size.y_nm = box[2] - box[0], box[3] - box[1]
+
+        return response
+
+    def _get_pad_shapes(self, message: Any) -> Message:
+        # Every pad is given the shape of its first copper layer, whichever layer is asked for
+        command = board_commands_pb2.GetPadShapeAsPolygon()
+        message.Unpack(command)
+        response = board_commands_pb2.PadShapeAsPolygonResponse()
+
+        for pad_id in command.pads:
+            item = self._items.get(pad_id.value)
+            pad = unpack_any(item) if item is not None else None
+            polygon = _pad_polygon(pad) if isinstance(pad, board_types_pb2.Pad) else None
+
+            if polygon is not None:
+                response.pads.add().value = pad_id.value
+                response.polygons.add().CopyFrom(polygon)
+
+        return response
+
+    def _refill_zones(self, message: Any) -> Message:
+        self._busy_until = time.monotonic() + self.zone_fill_seconds
+        return Empty()
+
+    def _get_nets(self, message: Any) -> Message:
+        # Net classes are not modelled, so the filter is ignored
+        response = board_commands_pb2.NetsResponse()
+
+        for code, name in sorted(self.nets.items()):
+            net = response.nets.add()
+            net.code.value = code
+            net.name = name
+
+        return response
+
+def synthetic_tracks(count: int, net_count: int = 64, segments_per_chain: int = 16,
+                     seed: int = 0) -> List[board_types_pb2.Track]:
+    """Generates `count` tracks as chains of connected segments spread over `net_count` nets,
+    for building large boards with :meth:`FakeKiCad.add_items`.  The output is deterministic for
+    a given seed."""
+    rng = random.Random(seed)
+    tracks = []
+    x = y = 0
+
+    for i in range(count):
+        if i % segments_per_chain == 0:
+            x = rng.randrange(0, 300_000_000, 100_000)
+            y = rng.randrange(0, 200_000_000, 100_000)
+
+        net = (i // segments_per_chain) % net_count + 1
+        end_x = x + rng.choice((-1, 0, 1)) * 1_000_000
+        end_y = y + rng.choice((-1, 1)) * 1_000_000
+
+        track = board_types_pb2.Track()
+        track.id.value = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        track.start.x_nm = x
+        track.start.y_nm = y
+        track.end.x_nm = end_x
+        track.end.y_nm = end_y
+        track.width.value_nm = 200_000
+        track.layer = board_types_pb2.BL_F_Cu if net % 2 else board_types_pb2.BL_B_Cu
+        track.net.code.value = net
+        track.net.name = f"Net-{net}"
+        tracks.append(track)
+        x, y = end_x, end_y
+
+    return tracks
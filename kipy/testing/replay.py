@@ -0,0 +1,253 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Recording and replaying KiCad API sessions.
+
+A :class:`RecordingProxy` sits between a client and a running KiCad, forwarding requests and
+saving each request/reply pair to a :class:`Recording`.  A :class:`ReplayServer` later serves the
+recorded replies back to the same workload, so kipy's own request and reply handling can be
+benchmarked reproducibly on machines without KiCad::
+
+    # With KiCad running
+    with RecordingProxy() as proxy:
+        run_workload(KiCad(socket_path=proxy.socket_path))
+    proxy.recording.save('workload.kipyrec')
+
+    # Anywhere
+    with ReplayServer(Recording.load('workload.kipyrec')) as server:
+        run_workload(KiCad(socket_path=server.socket_path))
+
+The same can be done from the command line with ``python -m kipy.testing``.
+
+.. versionadded:: 0.6.0
+"""
+
+import argparse
+import gzip
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+from typing import IO, Deque, Dict, List, Optional, Tuple
+
+import pynng
+
+from kipy.proto.common import ApiRequest, ApiStatusCode
+from kipy.testing.server import RepServer
+
+_MAGIC = b'KIPYREC1'
+_LENGTHS = struct.Struct('<II')
+
+def request_key(request_data: bytes) -> Tuple[str, bytes]:
+    """Returns the part of a serialized ApiRequest that identifies it for replay: the command's
+    type URL and payload.  The header is ignored, since the client name and token vary between
+    sessions."""
+    request = ApiRequest()
+    request.ParseFromString(request_data)
+    return request.message.type_url, request.message.value
+
+class Recording:
+    """An ordered list of (request, reply) pairs of serialized ApiRequest/ApiResponse messages.
+
+    Saved recordings are a short header followed by length-prefixed messages, and are
+    gzip-compressed when the file name ends in ``.gz``.
+    """
+    def __init__(self, exchanges: Optional[List[Tuple[bytes, bytes]]] = None):
+        self.exchanges: List[Tuple[bytes, bytes]] = exchanges if exchanges is not None else []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    def add(self, request_data: bytes, reply_data: bytes):
+        with self._lock:
+            self.exchanges.append((request_data, reply_data))
+
+    @staticmethod
+    def _open(path: str, mode: str) -> IO[bytes]:
+        if path.endswith('.gz'):
+            return gzip.open(path, mode)  # type: ignore[return-value]
+        return open(path, mode)
+
+    def save(self, path: str):
+        with self._lock, Recording._open(path, 'wb') as f:
+            f.write(_MAGIC)
+            for request_data, reply_data in self.exchanges:
+                f.write(_LENGTHS.pack(len(request_data), len(reply_data)))
+                f.write(request_data)
+                f.write(reply_data)
+
+    @staticmethod
+    def load(path: str) -> 'Recording':
+        with Recording._open(path, 'rb') as f:
+            data = f.read()
+
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path} is not a kipy recording")
+
+        exchanges = []
+        offset = len(_MAGIC)
+
+        while offset < len(data):
+            request_len, reply_len = _LENGTHS.unpack_from(data, offset)
+            offset += _LENGTHS.size
+            request_data = data[offset:offset + request_len]
+            offset += request_len
+            reply_data = data[offset:offset + reply_len]
+            offset += reply_len
+
+            if len(reply_data) != reply_len:
+                raise ValueError(f"{path} is truncated")
+
+            exchanges.append((request_data, reply_data))
+
+        return Recording(exchanges)
+
+class RecordingProxy(RepServer):
+    """Forwards requests to KiCad, recording each exchange.
+
+    :param upstream_path: The socket path of the KiCad instance to forward to; by default the
+        same path that :class:`kipy.KiCad` would connect to
+    :param socket_path: The path to listen on, by default a temporary one
+    :param timeout_ms: How long to wait for KiCad to answer each request
+    """
+    def __init__(self, upstream_path: Optional[str] = None, socket_path: Optional[str] = None,
+                 timeout_ms: int = 2000, workers: int = 4):
+        super().__init__(socket_path, workers)
+
+        if upstream_path is None:
+            from kipy.kicad import _default_socket_path
+            upstream_path = _default_socket_path()
+
+        self.upstream_path = upstream_path
+        self.recording = Recording()
+        self._timeout_ms = timeout_ms
+        self._upstream: Optional[pynng.Req0] = None
+        self._local = threading.local()
+
+    def start(self):
+        if self._upstream is None:
+            self._upstream = pynng.Req0(dial=self.upstream_path, block_on_dial=True,
+                                        send_timeout=self._timeout_ms,
+                                        recv_timeout=self._timeout_ms)
+        super().start()
+
+    def close(self):
+        super().close()
+        if self._upstream is not None:
+            self._upstream.close()
+            self._upstream = None
+
+    def _serve(self):
+        assert self._upstream is not None
+        self._local.ctx = self._upstream.new_context()
+        try:
+            super()._serve()
+        finally:
+            self._local.ctx.close()
+
+    def handle(self, request_data: bytes) -> bytes:
+        ctx = self._local.ctx
+
+        try:
+            ctx.send(request_data)
+            reply_data = ctx.recv()
+        except pynng.exceptions.NNGException as e:
+            # Not recorded: a replay should not reproduce a problem with the recording setup
+            return self.error_reply(ApiStatusCode.AS_UNKNOWN, f"Forwarding to KiCad failed: {e}")
+
+        self.recording.add(request_data, reply_data)
+        return reply_data
+
+class ReplayServer(RepServer):
+    """Answers requests with the replies from a :class:`Recording`.
+
+    Each request is matched to the recorded exchanges with the same command (see
+    :func:`request_key`), and their replies are served in recorded order, so a workload that reads
+    the board, changes it, and reads it again sees the same sequence of results.  Once the
+    recorded replies for a command run out, the last one is repeated, so a workload can be run
+    in a loop.  Commands that were never recorded get an AS_UNHANDLED error.
+
+    :param latency_ms: An optional delay before each reply, to simulate KiCad's processing time
+    """
+    def __init__(self, recording: Recording, socket_path: Optional[str] = None, workers: int = 4,
+                 latency_ms: float = 0):
+        super().__init__(socket_path, workers)
+        self._latency_s = latency_ms / 1000
+        self._lock = threading.Lock()
+        self._replies: Dict[Tuple[str, bytes], Deque[bytes]] = defaultdict(deque)
+
+        for request_data, reply_data in recording.exchanges:
+            self._replies[request_key(request_data)].append(reply_data)
+
+    def handle(self, request_data: bytes) -> bytes:
+        key = request_key(request_data)
+
+        with self._lock:
+            replies = self._replies.get(key)
+
+            if not replies:
+                return self.error_reply(ApiStatusCode.AS_UNHANDLED,
+                                        f"No recorded reply for {key[0]}")
+
+            reply_data = replies.popleft() if len(replies) > 1 else replies[0]
+
+        if self._latency_s:
+            time.sleep(self._latency_s)
+
+        return reply_data
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m kipy.testing",
+                                     description="Records or replays KiCad API sessions")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Forward requests to KiCad, recording them")
+    record.add_argument('output', help="The recording to write (.gz to compress)")
+    record.add_argument('--listen', help="The socket path to listen on")
+    record.add_argument('--upstream', help="The socket path of the running KiCad")
+
+    replay = commands.add_parser('replay', help="Serve a recording")
+    replay.add_argument('recording', help="The recording to serve")
+    replay.add_argument('--listen', help="The socket path to listen on")
+    replay.add_argument('--latency-ms', type=float, default=0)
+
+    args = parser.parse_args()
+    server: RepServer
+
+    if args.command == 'record':
+        server = RecordingProxy(args.upstream, args.listen)
+    else:
+        server = ReplayServer(Recording.load(args.recording), args.listen,
+                              latency_ms=args.latency_ms)
+
+    with server:
+        print(f"Listening on {server.socket_path}; press Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+    if isinstance(server, RecordingProxy):
+        server.recording.save(args.output)
+        print(f"Saved {len(server.recording)} exchanges to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import random
+import string
+import threading
+from abc import ABC, abstractmethod
+from tempfile import gettempdir
+from typing import List, Optional
+
+import pynng
+
+from kipy.proto.common import ApiResponse, ApiStatusCode
+
+def temporary_socket_path() -> str:
+    """Returns a unique ipc:// address in the temporary directory"""
+    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f'ipc://{os.path.join(gettempdir(), f"kipy-{suffix}.sock")}'
+
+class RepServer(ABC):
+    """A local nng REP socket answering requests in the same way as KiCad's API server.
+    Subclasses implement :meth:`handle`.
+
+    Requests are served by `workers` threads, each with its own socket context, so clients can
+    keep that many requests in flight (see :meth:`kipy.client.KiCadClient.send_pipelined` and
+    :class:`kipy.client.AsyncKiCadClient`).  Use the server as a context manager, or call
+    :meth:`start` and :meth:`close`.
+
+    .. versionadded:: 0.6.0
+    """
+    def __init__(self, socket_path: Optional[str] = None, workers: int = 4):
+        self.socket_path = socket_path if socket_path is not None else temporary_socket_path()
+        self._workers = workers
+        self._socket: Optional[pynng.Rep0] = None
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @abstractmethod
+    def handle(self, request_data: bytes) -> bytes:
+        """Returns the serialized ApiResponse for a serialized ApiRequest"""
+
+    @staticmethod
+    def error_reply(code: ApiStatusCode.ValueType, message: str) -> bytes:
+        """Returns a serialized ApiResponse reporting an error"""
+        reply = ApiResponse()
+        reply.status.status = code
+        reply.status.error_message = message
+        return reply.SerializeToString()
+
+    def start(self):
+        if self._socket is not None:
+            return
+
+        self._stopping.clear()
+        self._socket = pynng.Rep0(listen=self.socket_path, recv_timeout=50)
+        self._threads = [
+            threading.Thread(target=self._serve, daemon=True) for _ in range(self._workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def close(self):
+        if self._socket is None:
+            return
+
+        # nng does not cope well with a socket being closed while one of its contexts is busy,
+        # so the workers are stopped first
+        self._stopping.set()
+        for t in self._threads:
+            t.join()
+        self._threads.clear()
+        self._socket.close()
+        self._socket = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _serve(self):
+        assert self._socket is not None
+        ctx = self._socket.new_context()
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    request_data = ctx.recv()
+                except pynng.exceptions.Timeout:
+                    continue
+
+                try:
+                    reply_data = self.handle(request_data)
+                except Exception as e:
+                    reply_data = self.error_reply(ApiStatusCode.AS_UNKNOWN,
+                                                  f"{type(self).__name__} failed: {e!r}")
+
+                ctx.send(reply_data)
+        except pynng.exceptions.NNGException:
+            pass
+        finally:
+            ctx.close()
@@ -25,6 +25,8 @@ from google.protobuf.message import Message
 from kipy.proto.common.types.base_types_pb2 import KIID
 
 class Wrapper(ABC):
+    __slots__ = ()
+
     def __init__(self, proto: Optional[Message] = None, proto_ref: Optional[Message] = None):
         pass
 
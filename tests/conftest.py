@@ -0,0 +1,122 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Fixtures shared by the tests that talk to a FakeKiCad, and factories for the board items they
+use.  Lengths are in nanometres."""
+
+from typing import Iterator, Tuple
+
+import pytest
+
+from kipy import KiCad
+from kipy.board_types import BoardLayer, Pad, Track, Via
+from kipy.geometry import Vector2
+from kipy.metrics import MetricsCollector
+from kipy.proto.board import board_types_pb2
+from kipy.testing import FakeKiCad
+
+
+def _set_net(item, net: int):
+    # Net 0 is the unconnected net, whose name is empty
+    item.proto.net.code.value = net
+    item.proto.net.name = f"Net-{net}" if net else ""
+
+
+def _make_track(x1: int, y1: int, x2: int, y2: int, width: int = 200_000,
+                layer: BoardLayer.ValueType = BoardLayer.BL_F_Cu, net: int = 0) -> Track:
+    track = Track()
+    track.start = Vector2.from_xy(x1, y1)
+    track.end = Vector2.from_xy(x2, y2)
+    track.width = width
+    track.layer = layer
+    _set_net(track, net)
+    return track
+
+
+def _make_tracks(count: int) -> Iterator[Track]:
+    """Yields `count` parallel vertical tracks, 1 nm apart, on no net"""
+    for i in range(count):
+        yield _make_track(i, 0, i, 1_000_000)
+
+
+def _make_pad(x: int, y: int, shape: board_types_pb2.PadStackShape.ValueType =
+              board_types_pb2.PSS_RECTANGLE, size: Tuple[int, int] = (1_000_000, 600_000),
+              angle: float = 0, net: int = 0) -> Pad:
+    """Returns an SMD pad on F.Cu, identified by its position"""
+    pad = Pad()
+    pad.proto.id.value = f"pad-{x}-{y}"
+    pad.position = Vector2.from_xy(x, y)
+    pad.pad_type = board_types_pb2.PT_SMD
+    pad.padstack.layers = [BoardLayer.BL_F_Cu]
+    pad.proto.pad_stack.angle.value_degrees = angle
+    layer = pad.padstack.copper_layers[0]
+    layer.shape = shape
+    layer.size = Vector2.from_xy(*size)
+    _set_net(pad, net)
+    return pad
+
+
+def _make_via(x: int, y: int, diameter: int = 600_000, net: int = 0) -> Via:
+    """Returns a through via, identified by its position"""
+    via = Via()
+    via.proto.id.value = f"via-{x}-{y}"
+    via.position = Vector2.from_xy(x, y)
+    via.diameter = diameter
+    _set_net(via, net)
+    return via
+
+
+@pytest.fixture
+def make_track():
+    return _make_track
+
+
+@pytest.fixture
+def make_tracks():
+    return _make_tracks
+
+
+@pytest.fixture
+def make_pad():
+    return _make_pad
+
+
+@pytest.fixture
+def make_via():
+    return _make_via
+
+
+@pytest.fixture
+def fake():
+    with FakeKiCad() as server:
+        yield server
+
+
+@pytest.fixture
+def kicad(fake):
+    kicad = KiCad(socket_path=fake.socket_path)
+    kicad.metrics = MetricsCollector()
+    yield kicad
+    kicad.close()
+
+
+@pytest.fixture
+def board(kicad):
+    return kicad.get_board()
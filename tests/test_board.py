@@ -0,0 +1,319 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import time
+
+import pytest
+
+from kipy import AsyncKiCad
+from kipy.board import BoardLayer
+from kipy.geometry import Box2, Vector2
+from kipy.proto.common.types import KiCadObjectType
+from kipy.testing import synthetic_tracks
+
+
+def test_large_edits_are_sent_in_batches(kicad, make_tracks):
+    board = kicad.get_board()
+    board.max_batch_items = 4
+
+    created = board.create_items(make_tracks(10))
+    assert [t.start.x for t in created] == list(range(10))
+    assert kicad.metrics.stats()["CreateItems"].count == 3
+
+    for track in created:
+        track.width = 300_000
+    updated = board.update_items(iter(created))
+    assert [t.id for t in updated] == [t.id for t in created]
+    assert kicad.metrics.stats()["UpdateItems"].count == 3
+
+    board.remove_items(created[:5])
+    board.remove_items_by_id([t.id for t in created[5:]])
+    assert board.get_tracks() == []
+    assert kicad.metrics.stats()["DeleteItems"].count == 4
+
+
+def test_batches_respect_the_byte_limit(kicad, make_tracks):
+    board = kicad.get_board()
+    board.max_batch_bytes = 200
+
+    assert len(board.create_items(make_tracks(10))) == 10
+    assert kicad.metrics.stats()["CreateItems"].count > 1
+
+
+def test_empty_edits_send_nothing(kicad):
+    board = kicad.get_board()
+
+    assert board.create_items([]) == []
+    assert board.update_items([]) == []
+    board.remove_items([])
+    assert set(kicad.metrics.stats()) == {"GetOpenDocuments"}
+
+    with pytest.raises(ValueError):
+        board.max_batch_items = 0
+
+
+
+def test_refill_zones_returns_soon_after_the_fill(fake, kicad):
+    board = kicad.get_board()
+    fake.zone_fill_seconds = 0.05
+
+    start = time.monotonic()
+    board.refill_zones()
+    elapsed = time.monotonic() - start
+
+    assert fake.zone_fill_seconds <= elapsed < 0.3
+    assert kicad.metrics.stats()["Ping"].errors > 0
+    kicad.ping()
+
+
+def test_refill_zones_in_the_background(fake, kicad):
+    board = kicad.get_board()
+    fake.zone_fill_seconds = 0.1
+
+    future = board.begin_refill_zones()
+    assert not future.done()
+    assert future.result(timeout=2) is None
+    kicad.ping()
+
+
+def test_refill_zones_stops_polling_at_the_limit(fake, kicad):
+    board = kicad.get_board()
+    fake.zone_fill_seconds = 10
+
+    start = time.monotonic()
+    board.refill_zones(max_poll_seconds=0.1)
+    assert time.monotonic() - start < 0.5
+
+
+def test_async_refill_zones(fake):
+    fake.zone_fill_seconds = 0.05
+
+    async def refill():
+        kicad = AsyncKiCad(socket_path=fake.socket_path)
+        board = await kicad.get_board()
+        await board.refill_zones()
+        await kicad.ping()
+        kicad.close()
+
+    asyncio.run(refill())
+
+
+def test_cache_serves_repeat_queries(fake, kicad, make_tracks):
+    board = kicad.get_board()
+    board.create_items(make_tracks(3))
+    board.enable_cache()
+
+    tracks = board.get_tracks()
+    assert len(tracks) == 3
+    tracks[0].width = 1
+    assert [t.proto for t in board.get_tracks()] == [t.proto for t in board.get_tracks()]
+    assert board.get_tracks()[0].width != 1
+    assert kicad.metrics.stats()["GetItems"].count == 1
+
+    # Types that are not cached yet are fetched on their own
+    assert board.get_vias() == []
+    board.get_items([KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_VIA])
+    assert kicad.metrics.stats()["GetItems"].count == 2
+
+
+def test_cache_follows_our_edits(fake, kicad, make_tracks):
+    board = kicad.get_board()
+    cache = board.enable_cache()
+    board.get_tracks()
+
+    created = board.create_items(make_tracks(4))
+    assert {t.id.value for t in board.get_tracks()} == {t.id.value for t in created}
+
+    created[0].width = 123_456
+    board.update_items(created[0])
+    board.remove_items(created[1])
+    board.remove_items_by_id(created[2].id)
+
+    tracks = {t.id.value: t for t in board.get_tracks()}
+    assert set(tracks) == {created[0].id.value, created[3].id.value}
+    assert tracks[created[0].id.value].width == 123_456
+
+    commit = board.begin_commit()
+    board.remove_items(created[3])
+    board.get_vias()
+    assert len(board.get_tracks()) == 1
+    board.drop_commit(commit)
+    assert len(board.get_tracks()) == 2
+    assert cache.cached_types == [KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC]
+
+    assert kicad.metrics.stats()["GetItems"].count == 2
+
+    board.refill_zones(block=False)
+    assert cache.cached_types == []
+
+
+def test_cache_refresh_sees_external_edits(fake, kicad, make_tracks):
+    board = kicad.get_board()
+    cache = board.enable_cache()
+    assert board.get_tracks() == []
+
+    fake.add_items(make_tracks(2))
+    assert board.get_tracks() == []
+    cache.refresh()
+    assert len(board.get_tracks()) == 2
+
+    board.disable_cache()
+    fake.add_items(make_tracks(1))
+    assert len(board.get_tracks()) == 3
+
+
+def test_items_filtered_by_net(fake, kicad):
+    fake.add_items(synthetic_tracks(256, net_count=8, segments_per_chain=4))
+    board = kicad.get_board()
+    everything = board.get_tracks()
+
+    expected = {t.id.value for t in everything if t.net.name in ("Net-3", "Net-5")}
+    net_5 = next(t.net for t in everything if t.net.name == "Net-5")
+    by_name = board.get_tracks(net=["Net-3", net_5])
+    assert {t.id.value for t in by_name} == expected
+    assert {t.id.value for t in board.get_tracks(net=[3, 5])} == expected
+    assert board.get_tracks(net="No-Such-Net") == []
+
+    stats = kicad.metrics.stats()
+    assert stats["GetItems"].count == 1
+    assert stats["GetItemsByNet"].count == 2
+    assert stats["GetNets"].count == 2
+
+    # Nets read from KiCad are selected by code, without looking up their names
+    net_3 = next(t.net for t in everything if t.net.name == "Net-3")
+    assert {t.id.value for t in board.get_tracks(net=[net_3, net_5])} == expected
+    assert kicad.metrics.stats()["GetNets"].count == 2
+
+    board.enable_cache()
+    assert {t.id.value for t in board.get_tracks(net=["Net-3", 5])} == expected
+
+
+def test_items_filtered_by_layer_and_region(fake, kicad):
+    fake.add_items(synthetic_tracks(256, net_count=8, segments_per_chain=4))
+    board = kicad.get_board()
+    everything = board.get_tracks()
+
+    front = board.get_tracks(layers=[BoardLayer.BL_F_Cu, BoardLayer.BL_In1_Cu])
+    assert {t.id.value for t in front} == {
+        t.id.value for t in everything if t.layer == BoardLayer.BL_F_Cu
+    }
+
+    region = Box2.from_xywh(0, 0, 150_000_000, 100_000_000)
+    inside = board.get_tracks(net="Net-2", region=region)
+    assert 0 < len(inside) < len(board.get_tracks(net="Net-2"))
+
+    for track in inside:
+        assert min(track.start.x, track.end.x) - 100_000 <= 150_000_000
+        assert min(track.start.y, track.end.y) - 100_000 <= 100_000_000
+
+    # Track bounding boxes are calculated locally
+    assert "GetBoundingBox" not in kicad.metrics.stats()
+
+
+def test_index_lookups(fake, kicad):
+    fake.add_items(synthetic_tracks(64, net_count=4, segments_per_chain=4))
+    board = kicad.get_board()
+    index = board.build_index()
+    everything = board.get_tracks()
+
+    assert len(index) == 64
+    assert sorted(index.nets) == ["Net-1", "Net-2", "Net-3", "Net-4"]
+    assert {t.id.value for t in index.get_tracks_on_net("Net-2")} == {
+        t.id.value for t in everything if t.net.name == "Net-2"
+    }
+    assert index.get_vias_on_net("Net-2") == []
+    assert {t.id.value for t in index.get_items_on_layer(BoardLayer.BL_B_Cu)} == {
+        t.id.value for t in everything if t.layer == BoardLayer.BL_B_Cu
+    }
+    assert index.get_item(everything[0].id).id == everything[0].id
+    assert kicad.metrics.stats()["GetItems"].count == 2
+
+
+def test_index_follows_our_edits(fake, kicad, make_tracks):
+    fake.add_items(synthetic_tracks(16, net_count=2, segments_per_chain=4))
+    board = kicad.get_board()
+    index = board.build_index()
+
+    moved = index.get_tracks_on_net("Net-1")[0]
+    moved.net = index.get_tracks_on_net("Net-2")[0].net
+    moved.layer = BoardLayer.BL_In1_Cu
+    board.update_items(moved)
+    assert len(index.get_tracks_on_net("Net-1")) == 7
+    assert len(index.get_tracks_on_net("Net-2")) == 9
+    assert [t.id for t in index.get_items_on_layer(BoardLayer.BL_In1_Cu)] == [moved.id]
+
+    commit = board.begin_commit()
+    created = board.create_items(make_tracks(2))
+    board.remove_items(index.get_tracks_on_net("Net-2"))
+    assert len(index) == 9
+    assert created[0].id in index
+    board.drop_commit(commit)
+    assert len(index) == 16
+    assert created[0].id not in index
+    assert len(index.get_tracks_on_net("Net-2")) == 9
+
+    board.remove_edit_listener(index)
+    fake.add_items(make_tracks(1))
+    assert len(index) == 16
+    index.refresh()
+    assert len(index) == 17
+
+
+def test_index_restores_items_edited_in_a_dropped_commit(fake, kicad, make_tracks):
+    fake.add_items(make_tracks(2))
+    board = kicad.get_board()
+    index = board.build_index()
+    track = index.get_tracks_on_net("")[0]
+    width = track.width
+    fetches = kicad.metrics.stats()["GetItems"].count
+
+    # Dropping a commit without edits leaves the index as it is
+    board.drop_commit(board.begin_commit())
+    assert len(index) == 2
+    assert kicad.metrics.stats()["GetItems"].count == fetches
+
+    commit = board.begin_commit()
+    track.width = 212_345
+    board.update_items(track)
+    board.drop_commit(commit)
+
+    assert next(t for t in board.get_tracks() if t.id == track.id).width == width
+    assert index.get_item(track.id).width == width
+
+
+def test_hit_test_many(fake, kicad):
+    fake.add_items(synthetic_tracks(32, segments_per_chain=8))
+    board = kicad.get_board()
+    tracks = board.get_tracks()
+    tests = [(t, t.start) for t in tracks] + [(t, Vector2.from_xy(-1, -1)) for t in tracks]
+
+    assert board.hit_test_many(tests, tolerance=10) == [True] * 32 + [False] * 32
+    assert board.hit_test_many([]) == []
+    assert kicad.metrics.stats()["HitTest"].count == 64
+
+    async def hit_test_many():
+        async_kicad = AsyncKiCad(socket_path=fake.socket_path)
+        async_board = await async_kicad.get_board()
+        results = await async_board.hit_test_many(tests)
+        async_kicad.close()
+        return results
+
+    assert asyncio.run(hit_test_many()) == [True] * 32 + [False] * 32
@@ -0,0 +1,419 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pynng
+import pytest
+from google.protobuf.empty_pb2 import Empty
+
+from kipy.client import AsyncKiCadClient, KiCadClient, PooledKiCadClient, RetryPolicy
+from kipy.errors import ApiError, ConnectionError
+from kipy.kicad import AsyncKiCad
+from kipy.metrics import MetricsCollector
+from kipy.proto.common import ApiRequest, ApiResponse, ApiStatusCode
+from kipy.proto.board import board_commands_pb2
+from kipy.proto.common.commands import base_commands_pb2
+from kipy.testing import FakeKiCad
+
+
+def _reply_to(request_data: bytes) -> bytes:
+    """Answers GetVersion with a fixed version, echoes GetKiCadBinaryPath, and refuses everything
+    else"""
+    request = ApiRequest()
+    request.ParseFromString(request_data)
+
+    reply = ApiResponse()
+    reply.header.kicad_token = "stand-in"
+
+    if request.message.Is(base_commands_pb2.GetVersion.DESCRIPTOR):
+        version = base_commands_pb2.GetVersionResponse()
+        version.version.major = 9
+        version.version.full_version = request.header.client_name
+        reply.message.Pack(version)
+        reply.status.status = ApiStatusCode.AS_OK
+    elif request.message.Is(base_commands_pb2.GetKiCadBinaryPath.DESCRIPTOR):
+        command = base_commands_pb2.GetKiCadBinaryPath()
+        request.message.Unpack(command)
+        reply.message.Pack(base_commands_pb2.PathResponse(path=command.binary_name))
+        reply.status.status = ApiStatusCode.AS_OK
+    else:
+        reply.status.status = ApiStatusCode.AS_UNHANDLED
+        reply.status.error_message = "not handled by the stand-in"
+
+    return reply.SerializeToString()
+
+
+class RepStandIn:
+    """A local nng REP socket standing in for KiCad.  Each of its `workers` contexts waits at a
+    barrier after receiving a request, so it only replies once that many requests are in flight.
+    The first `drop` requests are never answered"""
+    def __init__(self, socket_path: str, workers: int = 1, drop: int = 0):
+        self._socket = pynng.Rep0(listen=socket_path, recv_timeout=50, send_timeout=2000)
+        self._barrier = threading.Barrier(workers, timeout=2)
+        self._drop = drop
+        self._drop_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads = [threading.Thread(target=self._serve, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def _serve(self):
+        ctx = self._socket.new_context()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    data = ctx.recv()
+                except pynng.exceptions.Timeout:
+                    continue
+                with self._drop_lock:
+                    dropped = self._drop > 0
+                    self._drop -= dropped
+                if dropped:
+                    continue
+                self._barrier.wait()
+                ctx.send(_reply_to(data))
+        except (pynng.exceptions.NNGException, threading.BrokenBarrierError):
+            pass
+        finally:
+            ctx.close()
+
+    def close(self):
+        # nng does not cope with closing the socket under an active context, so let the workers
+        # wind down first
+        self._stopping.set()
+        self._barrier.abort()
+        for t in self._threads:
+            t.join()
+        self._socket.close()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return f"ipc://{tmp_path}/api.sock"
+
+
+def test_sync_round_trip(socket_path):
+    server = RepStandIn(socket_path)
+    try:
+        client = KiCadClient(socket_path, "sync-client", "", 2000)
+        response = client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        assert response.version.full_version == "sync-client"
+        assert client._kicad_token == "stand-in"
+
+        with pytest.raises(ApiError) as e:
+            client.send(base_commands_pb2.Ping(), Empty)
+        assert e.value.code == ApiStatusCode.AS_UNHANDLED
+        client.close()
+    finally:
+        server.close()
+
+
+def test_async_requests_are_in_flight_concurrently(socket_path):
+    # The stand-in only answers once all four requests have arrived, so this would time out if
+    # the async client serialized its requests
+    server = RepStandIn(socket_path, workers=4)
+
+    async def run():
+        client = AsyncKiCadClient(socket_path, "async-client", "", 2000)
+        try:
+            return await asyncio.gather(*[
+                client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+                for _ in range(4)
+            ])
+        finally:
+            client.close()
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        server.close()
+
+    assert [r.version.full_version for r in responses] == ["async-client"] * 4
+
+
+def test_async_kicad_facade(socket_path):
+    server = RepStandIn(socket_path)
+
+    async def run():
+        kicad = AsyncKiCad(socket_path=socket_path, client_name="facade")
+        try:
+            version = await kicad.get_version()
+            with pytest.raises(ApiError):
+                await kicad.ping()
+            return version
+        finally:
+            kicad.close()
+
+    try:
+        version = asyncio.run(run())
+    finally:
+        server.close()
+
+    assert version.major == 9
+
+
+def _binary_path_commands(count: int):
+    return (base_commands_pb2.GetKiCadBinaryPath(binary_name=f"tool{i}") for i in range(count))
+
+
+def test_pipelined_requests_fill_the_window(socket_path):
+    # As above, the stand-in needs four requests in flight before it replies to any of them
+    server = RepStandIn(socket_path, workers=4)
+    try:
+        client = KiCadClient(socket_path, "pipelined", "", 2000, pipeline_window=4)
+        responses = client.send_pipelined(_binary_path_commands(8), base_commands_pb2.PathResponse)
+        client.close()
+    finally:
+        server.close()
+
+    assert [r.path for r in responses] == [f"tool{i}" for i in range(8)]
+
+
+def test_pipelined_errors_are_raised_after_the_batch(socket_path):
+    server = RepStandIn(socket_path)
+    try:
+        client = KiCadClient(socket_path, "pipelined", "", 2000)
+        commands = [base_commands_pb2.GetVersion(), base_commands_pb2.Ping()]
+
+        with pytest.raises(ApiError):
+            client.send_pipelined(commands, [base_commands_pb2.GetVersionResponse, Empty])
+
+        # The client is still usable once the batch has been drained
+        response = client.send_pipelined(_binary_path_commands(3), base_commands_pb2.PathResponse,
+                                         window=2)
+        assert [r.path for r in response] == ["tool0", "tool1", "tool2"]
+        client.close()
+    finally:
+        server.close()
+
+
+def test_pipelined_timeouts_are_retried_under_the_policy(socket_path):
+    server = RepStandIn(socket_path, drop=1)
+    try:
+        client = KiCadClient(socket_path, "pipelined", "", 200)
+        client.metrics = MetricsCollector()
+        with pytest.raises(ConnectionError):
+            client.send_pipelined(_binary_path_commands(4), base_commands_pb2.PathResponse,
+                                  window=2)
+
+        server._drop = 1
+        client.retry_policy = RetryPolicy(max_attempts=3, initial_delay_s=0.001,
+                                          retry_on_timeout=True)
+        responses = client.send_pipelined(_binary_path_commands(4),
+                                          base_commands_pb2.PathResponse, window=2)
+        assert [r.path for r in responses] == [f"tool{i}" for i in range(4)]
+        assert client.metrics.stats()["GetKiCadBinaryPath"].retries >= 1
+        client.close()
+    finally:
+        server.close()
+
+
+def test_pool_serves_threads_concurrently(socket_path):
+    # Four threads must each hold their own connection for the stand-in to answer at all
+    server = RepStandIn(socket_path, workers=4)
+    client = PooledKiCadClient(socket_path, "pooled", "", 2000, max_connections=4)
+
+    def get_path(i: int) -> str:
+        command = base_commands_pb2.GetKiCadBinaryPath(binary_name=f"tool{i}")
+        return client.send(command, base_commands_pb2.PathResponse).path
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            paths = list(executor.map(get_path, range(16)))
+        assert client._open_count == 4
+        client.close()
+        assert not client.connected
+    finally:
+        server.close()
+
+    assert paths == [f"tool{i}" for i in range(16)]
+
+
+def test_pool_closes_connections_returned_after_close(socket_path):
+    server = RepStandIn(socket_path)
+    client = PooledKiCadClient(socket_path, "pooled", "", 2000, max_connections=2)
+    try:
+        pooled = client._checkout()
+        client.close()
+        client._checkin(pooled)
+        assert not client.connected
+        assert len(client._idle) == 0
+
+        # The pool opens a new connection for the next request
+        command = base_commands_pb2.GetKiCadBinaryPath(binary_name="tool")
+        assert client.send(command, base_commands_pb2.PathResponse).path == "tool"
+        assert client._idle[0] is not pooled
+        client.close()
+    finally:
+        server.close()
+
+
+def test_pool_health_checks_idle_connections(socket_path):
+    server = RepStandIn(socket_path)
+    client = PooledKiCadClient(socket_path, "pooled", "", 500, max_connections=2,
+                               health_check_after_s=0)
+    try:
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        # An error reply still proves that the connection is alive, so it is reused
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        assert client._open_count == 1
+    finally:
+        server.close()
+
+    # With the server gone, the health check fails and the stale connection is dropped
+    with pytest.raises(ConnectionError):
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+    client.close()
+
+
+@pytest.mark.parametrize("command", [
+    base_commands_pb2.GetVersion(),
+    base_commands_pb2.GetKiCadBinaryPath(binary_name="kicad-cli"),
+    base_commands_pb2.GetKiCadBinaryPath(binary_name="x" * 300),
+])
+@pytest.mark.parametrize("token", ["", "a-token"])
+def test_packed_requests_match_protobuf_serialization(command, token):
+    client = KiCadClient("ipc://unused", "test-client", token, 100)
+
+    reference = ApiRequest()
+    reference.message.Pack(command)
+    reference.header.kicad_token = token
+    reference.header.client_name = "test-client"
+
+    assert client._pack_request(command) == reference.SerializeToString()
+    # The second call is served from the cached header and type URL
+    assert client._pack_request(command) == reference.SerializeToString()
+
+
+def test_learned_token_replaces_cached_header(socket_path):
+    server = RepStandIn(socket_path)
+    client = KiCadClient(socket_path, "test-client", "", 2000)
+    try:
+        client._pack_request(base_commands_pb2.GetVersion())
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+
+        request = ApiRequest()
+        request.ParseFromString(client._pack_request(base_commands_pb2.GetVersion()))
+        assert request.header.kicad_token == "stand-in"
+    finally:
+        client.close()
+        server.close()
+
+
+def test_metrics_record_each_request(socket_path):
+    server = RepStandIn(socket_path)
+    client = KiCadClient(socket_path, "test-client", "", 2000)
+    client.metrics = MetricsCollector()
+    samples = []
+    client.metrics.add_listener(samples.append)
+    try:
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        with pytest.raises(ApiError):
+            client.send(base_commands_pb2.Ping(), Empty)
+        client.send_pipelined([base_commands_pb2.GetVersion()] * 3,
+                              base_commands_pb2.GetVersionResponse, window=1)
+    finally:
+        client.close()
+        server.close()
+
+    stats = client.metrics.stats()
+    assert stats["GetVersion"].count == 5
+    assert stats["GetVersion"].errors == 0
+    assert stats["Ping"].errors == 1
+    assert sum(stats["GetVersion"].histogram) == 5
+    assert stats["GetVersion"].response_bytes > 0
+
+    assert len(samples) == 6
+    for sample in samples:
+        assert sample.started <= sample.packed <= sample.sent <= sample.received <= sample.finished
+        assert sample.request_bytes > 0
+    assert sample.total_ns == sample.pack_ns + sample.send_ns + sample.wait_ns + sample.unpack_ns
+
+    summary = client.metrics.summary()
+    assert "GetVersion" in summary and "Ping" in summary
+
+
+def test_metrics_summary_with_only_retries():
+    metrics = MetricsCollector()
+    metrics.record_retry(base_commands_pb2.Ping())
+
+    assert metrics.stats()["Ping"].count == 0
+    assert "Ping" in metrics.summary()
+
+
+def _start_zone_fill(client: KiCadClient, fake: FakeKiCad, seconds: float):
+    fake.zone_fill_seconds = seconds
+    client.send(board_commands_pb2.RefillZones(), Empty)
+
+
+def test_busy_requests_are_retried():
+    with FakeKiCad() as fake:
+        client = KiCadClient(fake.socket_path, "test-client", "", 2000)
+        client.metrics = MetricsCollector()
+
+        _start_zone_fill(client, fake, 0.05)
+        with pytest.raises(ApiError) as e:
+            client.send(base_commands_pb2.Ping(), Empty)
+        assert e.value.code == ApiStatusCode.AS_BUSY
+
+        client.retry_policy = RetryPolicy(max_attempts=20, initial_delay_s=0.005,
+                                          max_delay_s=0.02)
+        client.send(base_commands_pb2.Ping(), Empty)
+        assert client.metrics.stats()["Ping"].retries > 0
+
+        _start_zone_fill(client, fake, 0.05)
+        responses = client.send_pipelined([base_commands_pb2.GetVersion()] * 6,
+                                          base_commands_pb2.GetVersionResponse)
+        assert all(r.version.major == 9 for r in responses)
+        assert client.metrics.stats()["GetVersion"].retries >= 6
+
+        # Errors that are not in retryable_codes are raised straight away
+        with pytest.raises(ApiError):
+            client.send(base_commands_pb2.GetKiCadBinaryPath(), base_commands_pb2.PathResponse)
+        assert "GetKiCadBinaryPath" not in {
+            name for name, stats in client.metrics.stats().items() if stats.retries
+        }
+        client.close()
+
+
+def test_retries_give_up_after_max_attempts():
+    with FakeKiCad() as fake:
+        client = KiCadClient(fake.socket_path, "test-client", "", 2000)
+        client.retry_policy = RetryPolicy(max_attempts=3, initial_delay_s=0.001)
+
+        _start_zone_fill(client, fake, 10)
+        with pytest.raises(ApiError) as e:
+            client.send(base_commands_pb2.Ping(), Empty)
+        assert e.value.code == ApiStatusCode.AS_BUSY
+        client.close()
+
+
+def test_retry_delays_grow_with_jitter():
+    policy = RetryPolicy(max_attempts=6, initial_delay_s=0.01, max_delay_s=0.05, jitter=0.5)
+    delays = list(policy.delays())
+    caps = [0.01, 0.02, 0.04, 0.05, 0.05]
+
+    assert len(delays) == 5
+    assert all(cap / 2 <= d <= cap for d, cap in zip(delays, caps))
+    assert list(RetryPolicy(max_attempts=1).delays()) == []
@@ -0,0 +1,131 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import functools
+
+import pytest
+
+from kipy.board_types import BoardLayer, Track
+from kipy.connectivity import ConnectivityGraph, build_connectivity, match_endpoints
+from kipy.geometry import Vector2
+from kipy.testing import synthetic_tracks
+
+
+# The items here are drawn at a small scale, and are on net 1 unless given another
+@pytest.fixture
+def make_track(make_track):
+    return functools.partial(make_track, width=200, net=1)
+
+
+@pytest.fixture
+def make_pad(make_pad):
+    return functools.partial(make_pad, size=(1000, 600), net=1)
+
+
+@pytest.fixture
+def make_via(make_via):
+    return functools.partial(make_via, diameter=600, net=1)
+
+
+def test_graph_topology(make_track, make_pad, make_via):
+    # Pad 1 -- F.Cu, with a T junction and a stub -- via -- B.Cu -- pad 2, which is on F.Cu and
+    # so only reached through a second via
+    pad1, pad2 = make_pad(0, 0), make_pad(20_000, 0)
+    via1, via2 = make_via(10_000, 0), make_via(20_000, 5_000)
+    tracks = [
+        make_track(300, 0, 10_000, 0),
+        make_track(5_000, 0, 5_000, 3_000),
+        make_track(10_005, 0, 20_000, 5_000, layer=BoardLayer.BL_B_Cu),
+        make_track(20_000, 5_000, 20_000, 200),
+        make_track(30_000, 0, 31_000, 0),
+    ]
+    graph = ConnectivityGraph([pad1, pad2, via1, via2, *tracks])
+
+    components = graph.components()
+    assert [len(component) for component in components] == [8, 1]
+    assert components[1] == [tracks[4]]
+
+    dangling = graph.dangling_ends()
+    assert [(track, point) for track, point in dangling] == [
+        (tracks[1], Vector2.from_xy(5_000, 3_000)),
+        (tracks[4], Vector2.from_xy(30_000, 0)),
+        (tracks[4], Vector2.from_xy(31_000, 0)),
+    ]
+
+    junction = graph.node_at(Vector2.from_xy(5_000, 0), BoardLayer.BL_F_Cu)
+    assert junction is not None and junction.degree == 3
+    assert graph.junctions() == [junction]
+
+    b_cu = tracks[2]
+    assert graph.routed_length(pad1, pad2) == pytest.approx(
+        9_700 + b_cu.length() + 4_800, abs=1)
+    assert graph.route(pad1, pad2) == [tracks[0], tracks[2], tracks[3]]
+    assert graph.routed_length(pad1, make_pad(40_000, 0)) is None
+
+
+def test_zero_length_track_is_not_a_tee(make_track):
+    # The second track starts on the copper of the first, which has no length
+    dot = make_track(0, 0, 0, 0)
+    dot.width = 200_000
+    tracks = [dot, make_track(50_000, 0, 100_000, 0)]
+    graph = ConnectivityGraph(tracks)
+
+    assert len(graph.components()) == 2
+
+
+def test_build_connectivity_from_board(fake, board, make_track, make_pad):
+    fake.add_items([
+        make_pad(0, 0), make_pad(10_000, 0), make_track(0, 0, 10_000, 0),
+        make_pad(0, 5_000, net=2), make_track(0, 5_000, 4_000, 5_000, net=2),
+    ])
+
+    graphs = build_connectivity(board)
+    assert sorted(graphs) == ["Net-1", "Net-2"]
+    assert len(graphs["Net-1"].components()) == 1
+    assert len(graphs["Net-2"].dangling_ends()) == 1
+
+    assert list(build_connectivity(board, nets="Net-2")) == ["Net-2"]
+
+
+def test_match_endpoints(make_track):
+    a = make_track(0, 0, 1_000, 0)
+    b = make_track(1_005, 3, 1_000, 1_000)
+    c = make_track(1_000, 0, 2_000, 0, layer=BoardLayer.BL_B_Cu)
+    d = make_track(0, 0, 0, 0)
+
+    assert match_endpoints([a, b, c, d]) == [
+        (Vector2.from_xy(0, 0), [(a, True), (d, True), (d, False)]),
+        (Vector2.from_xy(1_000, 0), [(a, False), (b, True)]),
+    ]
+    assert match_endpoints([a, b], tolerance=0) == []
+
+
+def test_match_endpoints_agrees_with_pairwise_comparison():
+    tracks = [Track(proto) for proto in synthetic_tracks(300, net_count=1, seed=11)]
+    expected = set()
+
+    for i, t1 in enumerate(tracks):
+        for t2 in tracks[i + 1:]:
+            for point in (t2.start, t2.end):
+                if point in (t1.start, t1.end):
+                    expected.add((point.x, point.y))
+
+    found = match_endpoints(tracks, tolerance=0)
+    assert {(point.x, point.y) for point, _ in found} == expected
@@ -0,0 +1,83 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from kipy.errors import ApiError
+from kipy.geometry import Vector2
+from kipy.testing import synthetic_tracks
+
+
+def test_items_round_trip_through_board(fake, board, make_track):
+    assert board.name == fake.board_filename
+
+    created = board.create_items([make_track(0, 0, 1_000_000, 0, net=1),
+                                  make_track(0, 0, 0, 1_000_000, net=2)])
+    assert len(created) == 2 and all(item.id.value for item in created)
+    assert len(fake) == 2
+
+    tracks = board.get_tracks()
+    assert {t.id.value for t in tracks} == {c.id.value for c in created}
+    assert board.get_vias() == []
+
+    moved = tracks[0]
+    moved.end = Vector2.from_xy(5_000_000, 0)
+    board.update_items(moved)
+    assert fake.get_item(moved.id.value).end.x_nm == 5_000_000
+
+    board.remove_items(tracks[1])
+    assert [t.id.value for t in board.get_tracks()] == [moved.id.value]
+
+    assert [net.name for net in board.get_nets()] == ["", "Net-1", "Net-2"]
+
+
+def test_dropped_commit_restores_items(fake, board, make_track):
+    board.create_items(make_track(0, 0, 1_000_000, 0))
+
+    commit = board.begin_commit()
+    board.create_items(make_track(0, 0, 2_000_000, 0))
+    board.remove_items(board.get_tracks()[0])
+    board.drop_commit(commit)
+    assert len(fake) == 1
+
+    commit = board.begin_commit()
+    board.create_items(make_track(0, 0, 2_000_000, 0))
+    board.push_commit(commit, "add a track")
+    assert len(fake) == 2
+
+    with pytest.raises(ApiError):
+        board.push_commit(commit)
+
+
+def test_hit_test(fake, board, make_track):
+    track = board.create_items(make_track(0, 0, 1_000_000, 0))[0]
+
+    assert board.hit_test(track, Vector2.from_xy(500_000, 50_000))
+    assert not board.hit_test(track, Vector2.from_xy(500_000, 200_000))
+    assert board.hit_test(track, Vector2.from_xy(500_000, 200_000), tolerance=150_000)
+
+
+def test_synthetic_board(fake, board):
+    fake.add_items(synthetic_tracks(5_000))
+    tracks = board.get_tracks()
+    assert len(tracks) == 5_000
+    assert synthetic_tracks(10) == synthetic_tracks(10)
+    # Consecutive segments in a chain share an endpoint
+    assert tracks[0].end == tracks[1].start
@@ -20,7 +20,13 @@
 
 import pytest
 import math
-from kipy.geometry import Box2, Vector2, arc_center, arc_angle, normalize_angle_pi_radians
+from kipy.board_types import ArcTrack, BoardBezier, Track
+from kipy.common_types import Bezier, Segment
+from kipy.geometry import (
+    Angle, ArcStartMidEnd, Box2, PointArray, PolygonWithHoles, PolyLine, PolyLineNode, Vector2,
+    arc_center, arc_angle, arc_points, bezier_points, normalize_angle_pi_radians, _arc_points
+)
+from kipy.proto.common.types import base_types_pb2
 
 def test_arc_center_circle():
     start = Vector2.from_xy(0, 0)
@@ -125,3 +131,209 @@ def test_normalize_angle_pi_radians():
     assert normalize_angle_pi_radians(-math.pi / 2) == -math.pi / 2
     assert normalize_angle_pi_radians(3 * math.pi / 2) == -math.pi / 2
     assert normalize_angle_pi_radians(-3 * math.pi / 2) == math.pi / 2
+
+def test_vector2_from_xy_rejects_floats():
+    with pytest.raises(TypeError):
+        Vector2.from_xy(1.5, 2)
+
+    with pytest.raises(TypeError):
+        Vector2.from_xy(1, 2.0)
+
+    assert Vector2.from_xy(1, -2).proto.y_nm == -2
+
+def test_box2_intersects():
+    """Test overlap of boxes, including boxes that only touch"""
+    box = Box2.from_xywh(0, 0, 100, 100)
+    assert box.intersects(Box2.from_xywh(50, 50, 100, 100))
+    assert box.intersects(Box2.from_xywh(100, 0, 10, 10))
+    assert box.intersects(Box2.from_xywh(10, 10, 10, 10))
+    assert not box.intersects(Box2.from_xywh(101, 0, 10, 10))
+    assert not box.intersects(Box2.from_xywh(0, -20, 10, 10))
+
+def test_arc_bounding_box_includes_extremes():
+    # Three quarters of a circle of radius 1000 around (5000, 5000), passing through the top
+    arc = ArcStartMidEnd()
+    arc.start = Vector2.from_xy(6000, 5000)
+    arc.mid = Vector2.from_xy(5000, 4000)
+    arc.end = Vector2.from_xy(5000, 6000)
+    box = arc.bounding_box()
+    assert (box.pos.x, box.pos.y, box.size.x, box.size.y) == (4000, 4000, 2000, 2000)
+
+def test_shape_bounding_boxes_away_from_origin():
+    segment = Segment(base_types_pb2.GraphicShape(segment=base_types_pb2.GraphicSegmentAttributes(
+        start=Vector2.from_xy(1000, 3000).proto, end=Vector2.from_xy(2000, 2000).proto)))
+    box = segment.bounding_box()
+    assert (box.pos.x, box.pos.y, box.size.x, box.size.y) == (1000, 2000, 1000, 1000)
+
+    bezier = Bezier(base_types_pb2.GraphicShape(bezier=base_types_pb2.GraphicBezierAttributes(
+        start=Vector2.from_xy(0, 1000).proto, control1=Vector2.from_xy(0, 0).proto,
+        control2=Vector2.from_xy(1000, 0).proto, end=Vector2.from_xy(1000, 1000).proto)))
+    box = bezier.bounding_box()
+    # The curve turns at its midpoint, a quarter of the way to the control points
+    assert (box.pos.x, box.pos.y, box.size.x, box.size.y) == (0, 250, 1000, 750)
+
+def test_vector2_is_independent_of_its_proto():
+    proto = Vector2.from_xy(3, -4).proto
+    vector = Vector2(proto)
+    proto.x_nm = 100
+    assert vector == Vector2.from_xy(3, -4)
+
+    vector.proto.y_nm = 100
+    assert vector.y == -4
+    assert (vector + Vector2.from_xy(1, 1), -vector, vector * 2) == (
+        Vector2.from_xy(4, -3), Vector2.from_xy(-3, 4), Vector2.from_xy(6, -8))
+    assert vector.length() == 5
+    assert not hasattr(vector, '__dict__')
+
+def _polygon_with_arc() -> PolygonWithHoles:
+    outline = PolyLine()
+    outline.append(PolyLineNode.from_xy(0, 0))
+    arc = ArcStartMidEnd()
+    arc.start = Vector2.from_xy(1000, 0)
+    arc.mid = Vector2.from_xy(1707, 293)
+    arc.end = Vector2.from_xy(2000, 1000)
+    node = PolyLineNode()
+    node.arc = arc
+    outline.append(node)
+    outline.append(PolyLineNode.from_xy(0, 1000))
+    outline.closed = True
+
+    polygon = PolygonWithHoles()
+    polygon.outline = outline
+    hole = PolyLine()
+    for x, y in ((100, 100), (200, 100), (200, 200)):
+        hole.append(PolyLineNode.from_xy(x, y))
+    polygon.add_hole(hole)
+    return polygon
+
+def test_polygon_move_and_rotate_arc_nodes():
+    polygon = _polygon_with_arc()
+    polygon.move(Vector2.from_xy(10, 20))
+    arc = polygon.outline[1].arc
+    assert (arc.start, arc.mid, arc.end) == (
+        Vector2.from_xy(1010, 20), Vector2.from_xy(1717, 313), Vector2.from_xy(2010, 1020))
+    assert polygon.holes[0][0].point == Vector2.from_xy(110, 120)
+
+    center = Vector2.from_xy(10, 20)
+    polygon.rotate(Angle.from_degrees(90), center)
+    arc = polygon.outline[1].arc
+    assert arc.start == Vector2.from_xy(1010, 20).rotate(Angle.from_degrees(90), center)
+    assert arc.end == Vector2.from_xy(2010, 1020).rotate(Angle.from_degrees(90), center)
+    assert polygon.holes[0][2].point == Vector2.from_xy(210, 220).rotate(
+        Angle.from_degrees(90), center)
+
+def test_point_array_matches_vector2():
+    pytest.importorskip("numpy")
+    polygon = _polygon_with_arc()
+    points = PointArray.from_polygon(polygon)
+    assert len(points) == 8
+    assert points[1] == Vector2.from_xy(1000, 0)
+
+    angle = Angle.from_degrees(37.5)
+    center = Vector2.from_xy(-12345, 678)
+    vectors = points.to_vectors()
+    assert points.rotate(angle, center).to_vectors() == [v.rotate(angle, center) for v in vectors]
+    assert points.scale(0.3).to_vectors() == [v * 0.3 for v in points.to_vectors()]
+    assert points.translate(Vector2.from_xy(5, -5))[0] == Vector2.from_xy(5, -5)
+
+    box = points.bounding_box()
+    assert (box.pos.x, box.pos.y, box.size.x, box.size.y) == (0, 0, 2000, 1000)
+    assert PointArray().bounding_box().size == Vector2()
+
+    rotated = points.rotate(angle, center)
+    rotated.write_polygon(polygon)
+    assert PointArray.from_polygon(polygon).allclose(rotated)
+    assert not points.allclose(rotated, tolerance=10)
+    assert points.rotate(Angle.from_degrees(360), center).allclose(points, tolerance=1)
+
+def test_point_array_track_ends():
+    pytest.importorskip("numpy")
+    tracks = [Track(), Track()]
+    for i, track in enumerate(tracks):
+        track.start = Vector2.from_xy(i, 0)
+        track.end = Vector2.from_xy(i, 1000)
+
+    ends = PointArray.from_track_ends(tracks)
+    assert ends.array.tolist() == [[0, 0], [0, 1000], [1, 0], [1, 1000]]
+    assert ends.distances_to(Vector2.from_xy(0, 1000)).tolist() == pytest.approx(
+        [1000, 0, math.hypot(1, 1000), 1])
+    assert ends.isclose(Vector2.from_xy(0, 0), tolerance=1).tolist() == [True, False, True, False]
+
+    ends.scale(2, Vector2.from_xy(0, 500)).write_track_ends(tracks)
+    assert (tracks[1].start, tracks[1].end) == (Vector2.from_xy(2, -500), Vector2.from_xy(2, 1500))
+
+    with pytest.raises(ValueError):
+        ends.write_track_ends(tracks[:1])
+    with pytest.raises(ValueError):
+        PointArray([1, 2, 3])
+
+def test_arc_tessellation_within_max_error():
+    pytest.importorskip("numpy")
+    arc = ArcStartMidEnd()
+    arc.start = Vector2.from_xy(6000, 5000)
+    arc.mid = Vector2.from_xy(5000, 4000)
+    arc.end = Vector2.from_xy(5000, 6000)
+
+    points = arc.tessellate(max_error=10)
+    assert points[0] == arc.start
+    assert points[len(points) - 1] == arc.end
+    assert points.distances_to(Vector2.from_xy(5000, 5000)).tolist() == pytest.approx(
+        [1000] * len(points), abs=1)
+    # Each chord's middle is within max_error of the circle, plus rounding of the points
+    middles = (points.array[1:] + points.array[:-1]) / 2
+    assert all(1000 - math.hypot(x - 5000, y - 5000) <= 11 for x, y in middles.tolist())
+    assert len(arc.tessellate(max_error=1)) > len(points)
+
+    track = ArcTrack()
+    track.start, track.mid, track.end = arc.start, arc.mid, arc.end
+    assert track.tessellate(max_error=10).allclose(points)
+
+    # Degenerate arcs are their chord
+    assert arc_points(Vector2.from_xy(0, 0), Vector2.from_xy(500, 500),
+                      Vector2.from_xy(1000, 1000)).array.tolist() == [[0, 0], [1000, 1000]]
+    with pytest.raises(ValueError):
+        arc.tessellate(max_error=0)
+
+def test_tessellation_is_cached():
+    pytest.importorskip("numpy")
+    start, mid, end = Vector2.from_xy(0, 0), Vector2.from_xy(1000, 1000), Vector2.from_xy(2000, 0)
+    _arc_points.cache_clear()
+    first = arc_points(start, mid, end, 5)
+    second = arc_points(start, mid, end, 5)
+    assert _arc_points.cache_info().hits == 1
+    # Changing one array does not change the cached points
+    first.array[1] = (0, 0)
+    assert arc_points(start, mid, end, 5).allclose(second)
+
+def test_bezier_tessellation_within_max_error():
+    pytest.importorskip("numpy")
+    start, control1, control2, end = (Vector2.from_xy(0, 1000), Vector2.from_xy(0, 0),
+                                      Vector2.from_xy(1000, 0), Vector2.from_xy(1000, 1000))
+    points = bezier_points(start, control1, control2, end, max_error=2)
+    assert points[0] == start
+    assert points[len(points) - 1] == end
+
+    # Every point of the curve is within max_error of the chords
+    chords = [(points.array[i], points.array[i + 1]) for i in range(len(points) - 1)]
+    for step in range(201):
+        t = step / 200
+        u = 1 - t
+        x = 3 * u * t * t * 1000 + t * t * t * 1000
+        y = u * u * u * 1000 + t * t * t * 1000
+        assert min(_distance_to_segment(x, y, a, b) for a, b in chords) <= 2 + 1
+
+    shape = BoardBezier()
+    shape.start, shape.control1, shape.control2, shape.end = start, control1, control2, end
+    assert shape.tessellate(max_error=2).allclose(points)
+    assert len(shape.tessellate()) < len(points)
+
+    # A straight curve is a single chord
+    assert bezier_points(start, Vector2.from_xy(300, 1000), Vector2.from_xy(600, 1000),
+                         Vector2.from_xy(900, 1000), max_error=1).array.tolist() == [
+                             [0, 1000], [900, 1000]]
+
+def _distance_to_segment(x: float, y: float, a, b) -> float:
+    (ax, ay), (bx, by) = a.tolist(), b.tolist()
+    dx, dy = bx - ax, by - ay
+    t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(x - ax - t * dx, y - ay - t * dy)
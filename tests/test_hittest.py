@@ -0,0 +1,101 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from kipy.board_types import ArcTrack
+from kipy.geometry import Vector2
+from kipy.hittest import HitTester
+from kipy.testing import synthetic_tracks
+
+
+@pytest.fixture
+def kicad(fake, kicad, make_pad, make_via):
+    fake.add_items(synthetic_tracks(8, segments_per_chain=8, seed=5))
+    fake.add_items([make_pad(10_000_000 * i, 5_000_000) for i in range(10)])
+    fake.add_items([make_via(10_000_000 * i, 9_000_000) for i in range(10)])
+    return kicad
+
+
+def test_local_results_agree_with_kicad(kicad):
+    board = kicad.get_board()
+    items = [*board.get_tracks(), *board.get_pads(), *board.get_vias()]
+    hits = HitTester(board, cross_check=True)
+
+    tests = []
+    for item in items:
+        center = item.position if not hasattr(item, 'start') else item.start
+        for dx in range(-800_000, 800_001, 100_000):
+            for dy in range(-800_000, 800_001, 150_000):
+                tests.append((item, Vector2.from_xy(center.x + dx, center.y + dy)))
+
+    results = hits.hit_test_many(tests, tolerance=50_000)
+    assert hits.mismatches == []
+    assert any(results) and not all(results)
+
+
+def test_pad_shapes_are_fetched_once(kicad):
+    board = kicad.get_board()
+    pads = board.get_pads()
+    hits = HitTester(board)
+
+    points = [Vector2.from_xy(p.position.x + 400_000, p.position.y + 250_000) for p in pads]
+    assert hits.hit_test_many(zip(pads, points)) == [True] * len(pads)
+    assert hits.hit_test_points(pads[0], [points[0], points[1]]) == [True, False]
+    assert not hits.hit_test(pads[0], Vector2.from_xy(pads[0].position.x, 5_400_000))
+    assert hits.hit_test(pads[0], Vector2.from_xy(pads[0].position.x, 5_400_000), 100_000)
+
+    stats = kicad.metrics.stats()
+    assert stats["GetPadShapeAsPolygon"].count == 1
+    assert "HitTest" not in stats
+
+    board.update_items(pads[0])
+    hits.hit_test(pads[0], points[0])
+    assert kicad.metrics.stats()["GetPadShapeAsPolygon"].count == 2
+
+
+def test_pads_without_a_shape_are_tested_by_kicad(fake, kicad, make_pad):
+    pad = make_pad(0, 20_000_000)
+    pad.proto.pad_stack.ClearField("copper_layers")
+    fake.add_items([pad])
+
+    board = kicad.get_board()
+    hits = HitTester(board)
+    expected = board.hit_test(pad, pad.position)
+    assert hits.hit_test(pad, pad.position) == expected
+    assert hits.hit_test_many([(pad, pad.position)]) == [expected]
+    assert kicad.metrics.stats()["HitTest"].count == 3
+
+
+def test_arc_hits(kicad):
+    arc = ArcTrack()
+    arc.start = Vector2.from_xy(1_000_000, 0)
+    arc.mid = Vector2.from_xy(0, -1_000_000)
+    arc.end = Vector2.from_xy(-1_000_000, 0)
+    arc.width = 100_000
+
+    hits = HitTester(kicad.get_board())
+    assert hits.hit_test_points(arc, [
+        Vector2.from_xy(0, -1_040_000),
+        Vector2.from_xy(707_107, -707_107),
+        Vector2.from_xy(0, 1_000_000),
+        Vector2.from_xy(0, 0),
+    ]) == [True, True, False, False]
+    assert "HitTest" not in kicad.metrics.stats()
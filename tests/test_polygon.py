@@ -0,0 +1,242 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import random
+
+import pytest
+
+from kipy.geometry import (
+    ArcStartMidEnd, PointArray, PolygonWithHoles, PolyLine, PolyLineNode, Vector2
+)
+from kipy.hittest import _PolygonShape
+
+np = pytest.importorskip("numpy")
+
+from kipy.polygon import (  # noqa: E402
+    Polygon, _winding, difference, intersection, offset, union, xor
+)
+
+
+def _square_with_hole() -> Polygon:
+    return Polygon([(0, 0), (1000, 0), (1000, 1000), (0, 1000)],
+                   [[(400, 400), (600, 400), (600, 600), (400, 600)]])
+
+def _circle(radius: int) -> PolygonWithHoles:
+    outline = PolyLine()
+    for start, mid, end in (((radius, 0), (0, radius), (-radius, 0)),
+                            ((-radius, 0), (0, -radius), (radius, 0))):
+        arc = ArcStartMidEnd()
+        arc.start = Vector2.from_xy(*start)
+        arc.mid = Vector2.from_xy(*mid)
+        arc.end = Vector2.from_xy(*end)
+        node = PolyLineNode()
+        node.arc = arc
+        outline.append(node)
+    outline.closed = True
+
+    polygon = PolygonWithHoles()
+    polygon.outline = outline
+    return polygon
+
+def _square(x: int, y: int, size: int) -> Polygon:
+    return Polygon([(x, y), (x + size, y), (x + size, y + size), (x, y + size)])
+
+def _total_area(polygons) -> int:
+    return sum(polygon.area() for polygon in polygons)
+
+def _distance_to_ring(points: np.ndarray, ring: np.ndarray) -> np.ndarray:
+    starts = ring[None].astype(float)
+    direction = np.roll(ring, -1, axis=0)[None] - starts
+    offset = points[:, None].astype(float) - starts
+    along = np.clip(np.sum(offset * direction, axis=2)
+                    / np.maximum(np.sum(direction * direction, axis=2), 1), 0, 1)
+    return np.hypot(*np.moveaxis(offset - along[..., None] * direction, 2, 0)).min(axis=1)
+
+def test_area_and_perimeter():
+    polygon = _square_with_hole()
+    assert polygon.area() == 1000 * 1000 - 200 * 200
+    assert polygon.signed_area() == polygon.area()
+    assert Polygon(polygon.outline[::-1], polygon.holes).signed_area() == -polygon.area()
+    assert polygon.perimeter() == 4 * 1000 + 4 * 200
+
+def test_arcs_are_flattened_within_max_error():
+    radius = 1_000_000
+    polygon = Polygon.from_proto(_circle(radius), max_error=1000)
+    assert len(polygon.holes) == 0
+    # Every vertex is on the circle and the chords are at most 1000 nm inside it
+    assert np.hypot(polygon.outline[:, 0], polygon.outline[:, 1]) == pytest.approx(radius, abs=1)
+    assert math.pi * (radius - 1000) ** 2 < polygon.area() < math.pi * radius ** 2
+    assert 2 * math.pi * (radius - 1000) < polygon.perimeter() < 2 * math.pi * radius
+
+    finer = Polygon.from_proto(_circle(radius), max_error=10)
+    assert len(finer.outline) > len(polygon.outline)
+
+def test_contains_matches_ray_casting():
+    rng = random.Random(7)
+    polygon = Polygon([(rng.randrange(0, 10_000) * 2 + 1, rng.randrange(0, 10_000) * 2 + 1)
+                       for _ in range(50)],
+                      [[(8001, 8001), (12001, 8001), (12001, 12001), (8001, 12001)]])
+    points = PointArray([(rng.randrange(-2000, 22_000) * 2, rng.randrange(-2000, 22_000) * 2)
+                         for _ in range(2000)])
+
+    shape = _PolygonShape(polygon.to_proto()._proto)
+    assert polygon.contains(points).tolist() == [
+        shape.hit(x, y, 0) for x, y in points.array.tolist()]
+
+def test_contains_edges_and_tolerance():
+    polygon = _square_with_hole()
+    points = [Vector2.from_xy(x, y) for x, y in
+              ((100, 100), (500, 500), (1000, 500), (400, 500), (1001, 0), (1005, 1005))]
+    assert polygon.contains(points).tolist() == [True, False, True, True, False, False]
+    assert polygon.contains(points, tolerance=10).tolist() == [
+        True, False, True, True, True, True]
+    assert polygon.contains_point(Vector2.from_xy(450, 450), tolerance=50)
+    assert not polygon.contains_point(Vector2.from_xy(450, 450), tolerance=49)
+
+def test_inflate():
+    square = Polygon([(0, 0), (1000, 0), (1000, 1000), (0, 1000)])
+    grown = square.inflate(100, max_error=1)
+    # Rounded corners, their chords slightly inside the true arcs
+    exact = 1200 ** 2 - (4 - math.pi) * 100 ** 2
+    assert exact - 500 < grown.area() < exact
+    assert square.inflate(-100).outline.tolist() == [
+        [100, 100], [900, 100], [900, 900], [100, 900]]
+    assert square.inflate(-600).area() == 0
+
+    polygon = _square_with_hole()
+    assert polygon.inflate(-50, max_error=1).holes[0].min(axis=0).tolist() == [350, 350]
+    # Growing the polygon by more than half the hole's width fills the hole
+    assert len(polygon.inflate(150).holes) == 0
+    assert polygon.inflate(150).outline.min(axis=0).tolist() == [-150, -150]
+
+def test_proto_round_trip():
+    polygon = _square_with_hole()
+    proto = polygon.to_proto()
+    assert proto.outline.closed
+    assert [node.point for node in proto.holes[0]][1] == Vector2.from_xy(600, 400)
+
+    again = Polygon.from_proto(proto)
+    assert [ring.tolist() for ring in again.rings] == [ring.tolist() for ring in polygon.rings]
+    assert again.bounding_box().size == Vector2.from_xy(1000, 1000)
+
+def test_boolean_operations_of_squares():
+    a = [_square(0, 0, 100)]
+    b = [_square(50, 50, 100)]
+
+    assert _total_area(union(a, b)) == 17500
+    assert _total_area(intersection(a, b)) == 2500
+    assert intersection(a, b)[0].outline.tolist() == [[50, 50], [100, 50], [100, 100], [50, 100]]
+    assert _total_area(difference(a, b)) == 7500
+    assert _total_area(difference(b, a)) == 7500
+    assert _total_area(xor(a, b)) == 15000
+    assert len(xor(a, b)) == 2
+
+    # The union merges overlapping polygons within one set and drops repeated vertices
+    merged = union(a + b + [_square(0, 0, 100)])
+    assert len(merged) == 1
+    assert len(merged[0].outline) == 8
+    assert merged[0].signed_area() == 17500
+
+def test_boolean_operations_holes_and_empty_sets():
+    frame = difference([_square(0, 0, 300)], [_square(100, 100, 100)])
+    assert len(frame) == 1
+    assert frame[0].holes[0].min(axis=0).tolist() == [100, 100]
+    assert frame[0].area() == 80000
+
+    # Filling the hole again merges it away, and squares sharing only a corner stay apart
+    assert [len(p.holes) for p in union(frame, [_square(100, 100, 100)])] == [0]
+    assert len(union([_square(0, 0, 100), _square(100, 100, 100)])) == 2
+
+    assert union([]) == []
+    assert intersection([_square(0, 0, 100)], []) == []
+    assert _total_area(difference([_square(0, 0, 100)], [])) == 10000
+    assert intersection([_square(0, 0, 100)], [_square(200, 0, 100)]) == []
+
+def test_boolean_operations_accept_protos():
+    square = _square_with_hole()
+    proto = square.to_proto()
+    result = intersection([proto], [_circle(2000)])
+    assert len(result) == 1
+    assert result[0].area() == square.area()
+
+    # The result converts back to a PolygonWithHoles
+    assert isinstance(result[0].to_proto(), PolygonWithHoles)
+    assert len(result[0].to_proto().holes) == 1
+
+def test_boolean_operations_match_winding():
+    rng = random.Random(11)
+    points = np.array([(rng.randrange(0, 1000), rng.randrange(0, 1000)) for _ in range(2000)])
+
+    def star() -> Polygon:
+        count = rng.randrange(5, 30)
+        return Polygon([(rng.randrange(0, 1000), rng.randrange(0, 1000)) for _ in range(count)])
+
+    def inside(polygons) -> np.ndarray:
+        # Self-intersecting polygons cover the points they wind around, counted with the
+        # polygon turned counter-clockwise
+        winding = np.zeros(len(points), dtype=np.int64)
+        for polygon in polygons:
+            ring = polygon.outline if polygon.signed_area() > 0 else polygon.outline[::-1]
+            winding += _winding(points, ring, np.roll(ring, -1, axis=0))
+        return winding > 0
+
+    def covered(polygons) -> np.ndarray:
+        result = np.zeros(len(points), dtype=bool)
+        for polygon in polygons:
+            result |= polygon.contains(points)
+        return result
+
+    for _ in range(10):
+        a = [star(), star()]
+        b = [star()]
+        in_a = inside(a)
+        in_b = inside(b)
+
+        # Crossings are rounded to whole nanometers, so points close to an edge may go either way
+        near = np.zeros(len(points), dtype=bool)
+        for polygon in a + b:
+            near |= _distance_to_ring(points, polygon.outline) <= 2
+
+        for operation, expected in ((union, in_a | in_b), (intersection, in_a & in_b),
+                                    (difference, in_a & ~in_b), (xor, in_a ^ in_b)):
+            mismatch = covered(operation(a, b)) != expected
+            assert not np.any(mismatch & ~near)
+
+def test_offset():
+    square = _square(0, 0, 1000)
+    grown = offset([square], 100, max_error=1)
+    exact = 1200 ** 2 - (4 - math.pi) * 100 ** 2
+    assert len(grown) == 1
+    assert exact - 500 < grown[0].area() < exact
+    assert offset([square], -100)[0].outline.tolist() == [
+        [100, 100], [900, 100], [900, 900], [100, 900]]
+    assert offset([square], -600) == []
+
+    # Growing two nearby squares merges them
+    assert len(offset([square, _square(1100, 0, 1000)], 60)) == 1
+    assert len(offset([square, _square(1100, 0, 1000)], 40)) == 2
+
+    # Shrinking a dumbbell cuts its handle, leaving two polygons
+    dumbbell = Polygon([(0, 0), (1000, 0), (1000, 450), (2000, 450), (2000, 0), (3000, 0),
+                        (3000, 1000), (2000, 1000), (2000, 550), (1000, 550), (1000, 1000),
+                        (0, 1000)])
+    assert len(offset([dumbbell], -100)) == 2
+    assert len(dumbbell.inflate(-100).rings) == 1
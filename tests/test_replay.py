@@ -0,0 +1,109 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+from google.protobuf.empty_pb2 import Empty
+
+from kipy.client import KiCadClient
+from kipy.errors import ApiError
+from kipy.proto.common import ApiRequest, ApiResponse, ApiStatusCode
+from kipy.proto.common.commands import base_commands_pb2
+from kipy.testing import Recording, RecordingProxy, ReplayServer, RepServer
+
+
+class CountingKiCad(RepServer):
+    """Answers GetVersion with an increasing minor version and GetKiCadBinaryPath by echoing the
+    binary name, so replies to repeated requests can be told apart"""
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, workers=1)
+        self.calls = 0
+
+    def handle(self, request_data: bytes) -> bytes:
+        request = ApiRequest()
+        request.ParseFromString(request_data)
+        reply = ApiResponse()
+        reply.status.status = ApiStatusCode.AS_OK
+
+        if request.message.Is(base_commands_pb2.GetVersion.DESCRIPTOR):
+            self.calls += 1
+            version = base_commands_pb2.GetVersionResponse()
+            version.version.minor = self.calls
+            reply.message.Pack(version)
+        else:
+            command = base_commands_pb2.GetKiCadBinaryPath()
+            request.message.Unpack(command)
+            reply.message.Pack(base_commands_pb2.PathResponse(path=command.binary_name))
+
+        return reply.SerializeToString()
+
+
+def test_rep_server_requires_handle():
+    with pytest.raises(TypeError):
+        RepServer()  # type: ignore[abstract]
+
+
+def _workload(client: KiCadClient):
+    minors = [
+        client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        .version.minor for _ in range(3)
+    ]
+    paths = client.send_pipelined(
+        [base_commands_pb2.GetKiCadBinaryPath(binary_name=name) for name in ("a", "b", "c")],
+        base_commands_pb2.PathResponse
+    )
+    return minors, [p.path for p in paths]
+
+
+@pytest.mark.parametrize("file_name", ["session.kipyrec", "session.kipyrec.gz"])
+def test_recorded_session_replays_identically(tmp_path, file_name):
+    with CountingKiCad(f"ipc://{tmp_path}/kicad.sock") as kicad:
+        with RecordingProxy(kicad.socket_path) as proxy:
+            client = KiCadClient(proxy.socket_path, "recorder", "", 2000)
+            recorded = _workload(client)
+            client.close()
+
+    assert recorded == ([1, 2, 3], ["a", "b", "c"])
+    assert len(proxy.recording) == 6
+
+    path = str(tmp_path / file_name)
+    proxy.recording.save(path)
+    recording = Recording.load(path)
+    assert recording.exchanges == proxy.recording.exchanges
+
+    with ReplayServer(recording) as server:
+        client = KiCadClient(server.socket_path, "a-different-client", "", 2000)
+        assert _workload(client) == recorded
+
+        # Replies for a command that has run out are repeated
+        response = client.send(base_commands_pb2.GetVersion(), base_commands_pb2.GetVersionResponse)
+        assert response.version.minor == 3
+
+        with pytest.raises(ApiError) as e:
+            client.send(base_commands_pb2.Ping(), Empty)
+        assert e.value.code == ApiStatusCode.AS_UNHANDLED
+        client.close()
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-recording"
+    path.write_bytes(b"hello")
+
+    with pytest.raises(ValueError):
+        Recording.load(str(path))
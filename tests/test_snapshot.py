@@ -0,0 +1,74 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from kipy.board_types import ArcTrack, BoardCircle, Track
+from kipy.geometry import Vector2
+from kipy.proto.common.types import KiCadObjectType
+from kipy.testing import synthetic_tracks
+
+
+def test_refresh_reports_changes(fake, board):
+    fake.add_items(synthetic_tracks(20))
+    snapshot = board.snapshot([KiCadObjectType.KOT_PCB_TRACE, KiCadObjectType.KOT_PCB_ARC])
+    items = snapshot.items
+    assert len(snapshot) == 20
+
+    assert not snapshot.refresh()
+
+    tracks = board.get_tracks()
+    unchanged = snapshot[tracks[2].id]
+    tracks[0].width = 1_000
+    board.update_items(tracks[0])
+    board.remove_items(tracks[1])
+    arc = ArcTrack()
+    arc.start = Vector2.from_xy(0, 0)
+    arc.mid = Vector2.from_xy(500, 500)
+    arc.end = Vector2.from_xy(1_000, 0)
+    fake.add_items([arc])
+
+    diff = snapshot.refresh()
+    assert len(diff) == 3
+    assert [t.id for t in diff.modified] == [tracks[0].id]
+    assert diff.modified[0].width == 1_000
+    assert [t.id for t in diff.removed] == [tracks[1].id]
+    assert isinstance(diff.added[0], ArcTrack)
+
+    # The mirror is updated in place, and unchanged items are not wrapped again
+    assert snapshot.items is items
+    assert len(items) == 20
+    assert tracks[1].id not in snapshot
+    assert snapshot[tracks[2].id] is unchanged
+
+
+def test_items_without_a_leading_id_are_tracked(fake, board):
+    circle = BoardCircle()
+    circle.center = Vector2.from_xy(0, 0)
+    circle.radius_point = Vector2.from_xy(1_000, 0)
+    board.create_items([circle, Track()])
+
+    snapshot = board.snapshot([KiCadObjectType.KOT_PCB_SHAPE, KiCadObjectType.KOT_PCB_TRACE])
+    assert len(snapshot) == 2
+
+    shape = board.get_shapes()[0]
+    shape.radius_point = Vector2.from_xy(2_000, 0)
+    board.update_items(shape)
+    diff = snapshot.refresh()
+    assert [item.id for item in diff.modified] == [shape.id]
+    assert not diff.added and not diff.removed
@@ -0,0 +1,204 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import random
+
+import pytest
+
+from kipy.board_types import ArcTrack, BoardSegment, FootprintInstance, Track, Via
+from kipy.geometry import Box2, Vector2
+from kipy.proto.board import board_types_pb2
+from kipy.spatial import PackedRTree, SpatialIndex, item_bounds, item_bounds_many
+from kipy.testing import synthetic_tracks
+
+
+def _random_boxes(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        x = rng.randrange(0, 1_000_000)
+        y = rng.randrange(0, 1_000_000)
+        boxes.append((x, y, x + rng.randrange(0, 20_000), y + rng.randrange(0, 20_000)))
+    return boxes
+
+
+def _overlaps(box, window):
+    return box[0] <= window[2] and box[1] <= window[3] and box[2] >= window[0] \
+        and box[3] >= window[1]
+
+
+@pytest.mark.parametrize("count", [0, 1, 16, 17, 1000])
+def test_packed_rtree_search_matches_a_scan(count):
+    boxes = _random_boxes(count)
+    tree = PackedRTree(boxes, node_size=8)
+
+    for window in _random_boxes(20, seed=1):
+        window = (window[0], window[1], window[2] + 100_000, window[3] + 100_000)
+        expected = {i for i, box in enumerate(boxes) if _overlaps(box, window)}
+        assert set(tree.search(*window)) == expected
+
+
+def test_packed_rtree_nearest_is_ordered():
+    boxes = _random_boxes(500)
+    tree = PackedRTree(boxes)
+
+    def box_distance(box, x, y):
+        return math.hypot(max(box[0] - x, 0, x - box[2]), max(box[1] - y, 0, y - box[3]))
+
+    found = list(tree.nearest(500_000, 500_000, max_distance=50_000))
+    expected = sorted(box_distance(box, 500_000, 500_000) for box in boxes)
+    assert [d for d, _ in found] == pytest.approx([d for d in expected if d <= 50_000])
+
+
+def test_item_bounds():
+    track = Track()
+    track.start = Vector2.from_xy(0, 0)
+    track.end = Vector2.from_xy(1000, 500)
+    track.width = 200
+    assert item_bounds(track) == (-100, -100, 1100, 600)
+
+    # A half circle of radius 1000 bulging up from the x axis
+    arc = ArcTrack()
+    arc.start = Vector2.from_xy(1000, 0)
+    arc.mid = Vector2.from_xy(0, -1000)
+    arc.end = Vector2.from_xy(-1000, 0)
+    arc.width = 0
+    assert item_bounds(arc) == (-1000, -1000, 1000, 0)
+
+
+def test_pad_and_shape_bounds(make_pad):
+    def bounds(item):
+        box = item.bounding_box()
+        return box.pos.x, box.pos.y, box.pos.x + box.size.x, box.pos.y + box.size.y
+
+    rectangle = make_pad(0, 0, board_types_pb2.PSS_RECTANGLE, (2000, 1000), angle=90)
+    assert bounds(rectangle) == (-500, -1000, 500, 1000)
+
+    # An oval at 45 degrees: a 1000 nm segment with 500 nm of copper around it
+    oval = make_pad(0, 0, board_types_pb2.PSS_OVAL, (2000, 1000), angle=45)
+    half = round(500 * math.cos(math.pi / 4) + 500)
+    assert bounds(oval) == (-half, -half, half, half)
+
+    circle = make_pad(5000, 5000, board_types_pb2.PSS_CIRCLE, (1000, 1000), angle=30)
+    assert bounds(circle) == (4500, 4500, 5500, 5500)
+
+    segment = BoardSegment()
+    segment.start = Vector2.from_xy(1000, 2000)
+    segment.end = Vector2.from_xy(3000, 1000)
+    segment.attributes.stroke.width = 100
+    assert bounds(segment) == (950, 950, 3050, 2050)
+
+    footprint = FootprintInstance()
+    footprint.definition.add_item(rectangle)
+    footprint.definition.add_item(segment)
+    assert bounds(footprint) == (-500, -1000, 3050, 2050)
+    assert item_bounds_many([rectangle, segment, footprint]) == [
+        (-500, -1000, 500, 1000), (950, 950, 3050, 2050), (-500, -1000, 3050, 2050)
+    ]
+
+
+def test_bounds_agree_with_kicad(fake, kicad, make_pad):
+    fake.add_items(synthetic_tracks(200, seed=7))
+    fake.add_items([make_pad(1_000_000 * i, 0, board_types_pb2.PSS_RECTANGLE, (600_000, 400_000))
+                    for i in range(20)])
+    fake.add_items([make_pad(1_000_000 * i, 5_000_000, board_types_pb2.PSS_CIRCLE,
+                             (500_000, 500_000)) for i in range(20)])
+    board = kicad.get_board()
+    items = [*board.get_tracks(), *board.get_pads()]
+
+    for item, box in zip(items, board.get_item_bounding_box(items)):
+        assert box is not None
+        local = item.bounding_box()
+        assert (local.pos.x, local.pos.y, local.size.x, local.size.y) == (
+            box.pos.x, box.pos.y, box.size.x, box.size.y)
+
+
+@pytest.fixture
+def board(fake, board):
+    fake.add_items(synthetic_tracks(2000, seed=3))
+    return board
+
+
+def test_spatial_index_queries(board):
+    tracks = board.get_tracks()
+    index = SpatialIndex.from_board(board)
+    assert len(index) == len(tracks)
+
+    window = Box2.from_xywh(50_000_000, 50_000_000, 20_000_000, 20_000_000)
+    assert {t.id.value for t in index.in_box(window)} == {
+        t.id.value for t in tracks if window.intersects(Box2.from_xywh(
+            min(t.start.x, t.end.x) - 100_000, min(t.start.y, t.end.y) - 100_000,
+            abs(t.end.x - t.start.x) + 200_000, abs(t.end.y - t.start.y) + 200_000
+        ))
+    }
+
+    point = Vector2.from_xy(150_000_000, 100_000_000)
+    nearest = index.nearest(point, k=5)
+    assert len(nearest) == 5
+    within = index.within_distance(point, 5_000_000)
+    assert [t.id for t in within[:5]] == [t.id for t in nearest[:len(within[:5])]]
+
+    on_track = tracks[10].start
+    assert tracks[10].id in [t.id for t in index.at_point(on_track)]
+    assert index.nearest(on_track)[0].start == on_track or \
+        index.nearest(on_track)[0].end == on_track
+
+
+def test_spatial_index_follows_edits(board):
+    index = SpatialIndex.from_board(board)
+    tracks = board.get_tracks()
+    window = Box2.from_xywh(-10_000_000, -10_000_000, 5_000_000, 5_000_000)
+    assert index.in_box(window) == []
+
+    via = Via()
+    via.position = Vector2.from_xy(-7_000_000, -7_000_000)
+    via.diameter = 500_000
+    created = board.create_items(via)
+    assert [v.id for v in index.in_box(window)] == [created[0].id]
+    assert index.nearest(Vector2.from_xy(-6_000_000, -7_000_000))[0].id == created[0].id
+
+    moved = tracks[0]
+    moved.start = Vector2.from_xy(-8_000_000, -8_000_000)
+    moved.end = Vector2.from_xy(-9_000_000, -8_000_000)
+    commit = board.begin_commit()
+    board.update_items(moved)
+    board.remove_items(tracks[1:200])
+    assert len(index.in_box(window)) == 2
+    assert len(index) == 1802
+    board.drop_commit(commit)
+    assert len(index) == 2001
+
+def test_spatial_index_restores_items_edited_in_a_dropped_commit(board):
+    index = SpatialIndex.from_board(board)
+    track = board.get_tracks()[0]
+    indexed = next(t for t in index.at_point(track.start) if t.id == track.id)
+    window = Box2.from_xywh(-10_000_000, -10_000_000, 5_000_000, 5_000_000)
+
+    commit = board.begin_commit()
+    indexed.start = Vector2.from_xy(-8_000_000, -8_000_000)
+    indexed.end = Vector2.from_xy(-9_000_000, -8_000_000)
+    board.update_items(indexed)
+    assert [t.id for t in index.in_box(window)] == [track.id]
+    board.drop_commit(commit)
+
+    assert index.in_box(window) == []
+    restored = next(t for t in index.at_point(track.start) if t.id == track.id)
+    assert (restored.start, restored.end) == (track.start, track.end)
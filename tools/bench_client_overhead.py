@@ -0,0 +1,84 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Measures the per-call cost of building request envelopes and parsing replies in KiCadClient,
+comparing the cached-header fast path with building a fresh ApiRequest for every call.
+
+No KiCad instance is needed; run with `python -m tools.bench_client_overhead`.
+"""
+
+import argparse
+import timeit
+
+from google.protobuf.message import Message
+
+from kipy.client import KiCadClient
+from kipy.proto.common.commands import HitTest, HitTestResponse
+from kipy.proto.common import ApiRequest, ApiResponse, ApiStatusCode
+from kipy.proto.common.types import KIID
+
+def _pack_per_call(client: KiCadClient, command: Message) -> bytes:
+    envelope = ApiRequest()
+    envelope.message.Pack(command)
+    envelope.header.kicad_token = client._kicad_token
+    envelope.header.client_name = client._client_name
+    return envelope.SerializeToString()
+
+def _unpack_per_call(reply_data: bytes) -> HitTestResponse:
+    reply = ApiResponse()
+    reply.ParseFromString(reply_data)
+    if reply.status.status != ApiStatusCode.AS_OK:
+        raise RuntimeError(reply.status.error_message)
+    response = HitTestResponse()
+    reply.message.Unpack(response)
+    return response
+
+def _report(label: str, seconds: float, calls: int):
+    print(f"{label:<32} {seconds / calls * 1e6:8.3f} us/call")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    client = KiCadClient("ipc://unused", "bench", "0123456789abcdef", 1000)
+    command = HitTest(id=KIID(value="00000000-0000-0000-0000-000000000001"), tolerance=10)
+    command.position.x_nm = 1_000_000
+    command.position.y_nm = 2_000_000
+
+    reply = ApiResponse()
+    reply.status.status = ApiStatusCode.AS_OK
+    reply.message.Pack(HitTestResponse())
+    reply_data = reply.SerializeToString()
+
+    assert client._pack_request(command) == _pack_per_call(client, command)
+
+    n = args.calls
+    _report("pack: ApiRequest per call", timeit.timeit(
+        lambda: _pack_per_call(client, command), number=n), n)
+    _report("pack: cached header", timeit.timeit(
+        lambda: client._pack_request(command), number=n), n)
+    _report("unpack: Any.Unpack per call", timeit.timeit(
+        lambda: _unpack_per_call(reply_data), number=n), n)
+    _report("unpack: cached type URL", timeit.timeit(
+        lambda: client._unpack_reply(reply_data, command, HitTestResponse), number=n), n)
+
+if __name__ == "__main__":
+    main()
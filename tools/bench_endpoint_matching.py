@@ -0,0 +1,77 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Compares kipy.connectivity.match_endpoints with the pairwise loop that the round_tracks example
+used to find shared track endpoints, on one synthetic net.
+
+The pairwise loop is timed on a prefix of the net and extrapolated to the full size, since it
+grows with the square of the number of tracks.  No KiCad instance is needed; run with
+`python -m tools.bench_endpoint_matching`.
+"""
+
+import argparse
+import time
+from typing import List, Set, Tuple
+
+from kipy.board_types import Track
+from kipy.connectivity import match_endpoints
+from kipy.testing import synthetic_tracks
+
+def _pairwise(tracks: List[Track]) -> Set[Tuple[int, int]]:
+    intersections = set()
+    for t1 in range(len(tracks)):
+        for t2 in range(t1 + 1, len(tracks)):
+            if tracks[t1].start == tracks[t2].start or tracks[t1].end == tracks[t2].start:
+                intersections.add((tracks[t2].start.x, tracks[t2].start.y))
+            if tracks[t1].start == tracks[t2].end or tracks[t1].end == tracks[t2].end:
+                intersections.add((tracks[t2].end.x, tracks[t2].end.y))
+    return intersections
+
+def _matched(tracks: List[Track]) -> Set[Tuple[int, int]]:
+    return {(point.x, point.y) for point, _ in match_endpoints(tracks, tolerance=0)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--tracks", type=int, default=50_000)
+    parser.add_argument("--pairwise-tracks", type=int, default=1_000,
+                        help="the number of tracks to time the pairwise loop on")
+    args = parser.parse_args()
+
+    tracks = [Track(proto) for proto in synthetic_tracks(args.tracks, net_count=1)]
+    prefix = tracks[:args.pairwise_tracks]
+
+    start = time.perf_counter()
+    found = match_endpoints(tracks, tolerance=0)
+    matched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _pairwise(prefix)
+    pairwise = time.perf_counter() - start
+
+    assert _matched(prefix) == expected
+    extrapolated = pairwise * (len(tracks) / len(prefix)) ** 2
+
+    print(f"{len(tracks)} tracks, {len(found)} shared endpoints")
+    print(f"match_endpoints: {matched:10.3f} s")
+    print(f"pairwise loop:   {pairwise:10.3f} s for {len(prefix)} tracks, "
+          f"~{extrapolated:.0f} s extrapolated to {len(tracks)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Measures kipy.polygon.Polygon on a zone-like polygon: area and perimeter against a loop over the
+PolyLineNode wrappers, and batched point containment against the per-point ray casting that
+kipy.hittest uses for pad shapes.  Also times the boolean operations between the zone and a grid
+of square pads, and checks their areas against each other.
+
+No KiCad instance is needed; run with `python -m tools.bench_polygon`.
+"""
+
+import argparse
+import math
+import random
+import time
+
+from kipy.geometry import PointArray, PolygonWithHoles, PolyLine, PolyLineNode
+from kipy.hittest import _PolygonShape
+from kipy.polygon import Polygon, difference, intersection, offset, union, xor
+
+def _ring(cx: int, cy: int, radius: int, vertices: int) -> PolyLine:
+    ring = PolyLine()
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        # A wavy outline, as of a fill following pads and tracks
+        r = radius * (0.9 + 0.08 * math.sin(40 * angle))
+        ring.append(PolyLineNode.from_xy(int(cx + r * math.cos(angle)),
+                                         int(cy + r * math.sin(angle))))
+    ring.closed = True
+    return ring
+
+def _zone(vertices: int) -> PolygonWithHoles:
+    polygon = PolygonWithHoles()
+    polygon.outline = _ring(0, 0, 50_000_000, vertices)
+    for x in (-20_000_000, 20_000_000):
+        polygon.add_hole(_ring(x, 0, 5_000_000, vertices // 10))
+    return polygon
+
+def _pads(count: int, size: int) -> list:
+    """A grid of square pads across the zone, some in its holes and some past its edge"""
+    side = max(1, math.isqrt(count))
+    pitch = 110_000_000 // side
+    pads = []
+    for i in range(count):
+        x = -55_000_000 + (i % side) * pitch
+        y = -55_000_000 + (i // side) * pitch
+        pads.append(Polygon([(x, y), (x + size, y), (x + size, y + size), (x, y + size)]))
+    return pads
+
+def _wrapper_area(polygon: PolygonWithHoles) -> float:
+    """The shoelace formula over the node wrappers"""
+    total = 0.0
+    for index, ring in enumerate([polygon.outline] + polygon.holes):
+        points = [node.point for node in ring]
+        twice = sum(a.x * b.y - b.x * a.y for a, b in zip(points, points[1:] + points[:1]))
+        total += abs(twice) / 2 if index == 0 else -abs(twice) / 2
+    return total
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--vertices", type=int, default=5000)
+    parser.add_argument("-p", "--points", type=int, default=2000)
+    parser.add_argument("--pads", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    zone = _zone(args.vertices)
+    probes = PointArray([(rng.randrange(-50_000_000, 50_000_000),
+                          rng.randrange(-50_000_000, 50_000_000)) for _ in range(args.points)])
+
+    polygon, convert = _timed(lambda: Polygon.from_proto(zone))
+    area, array_area = _timed(polygon.area)
+    wrapper, wrapper_area = _timed(lambda: _wrapper_area(zone))
+    assert math.isclose(area, wrapper)
+
+    shape = _PolygonShape(zone._proto)
+    inside, array_contains = _timed(lambda: polygon.contains(probes))
+    expected, loop_contains = _timed(
+        lambda: [shape.hit(x, y, 0) for x, y in probes.array.tolist()])
+    assert inside.tolist() == expected
+
+    pads = _pads(args.pads, 1_000_000)
+    covered, union_time = _timed(lambda: union([polygon], pads))
+    overlap, intersection_time = _timed(lambda: intersection([polygon], pads))
+    uncovered, difference_time = _timed(lambda: difference(pads, [polygon]))
+    either, xor_time = _timed(lambda: xor([polygon], pads))
+    clearance, offset_time = _timed(lambda: offset([polygon], -200_000))
+
+    def total(polygons):
+        return sum(p.area() for p in polygons)
+
+    pad_area = total(pads)
+    assert math.isclose(total(covered) + total(overlap), area + pad_area, rel_tol=1e-9)
+    assert math.isclose(total(uncovered) + total(overlap), pad_area, rel_tol=1e-9)
+    assert math.isclose(total(either) + 2 * total(overlap), area + pad_area, rel_tol=1e-9)
+    assert total(clearance) < area
+
+    print(f"{len(zone.outline)} outline vertices, {len(zone.holes)} holes, "
+          f"{args.points} points, {args.pads} pads")
+    print(f"Polygon.from_proto     {convert * 1e3:10.2f} ms")
+    print(f"area, Polygon          {array_area * 1e3:10.2f} ms")
+    print(f"area, wrappers         {wrapper_area * 1e3:10.2f} ms")
+    print(f"contains, Polygon      {array_contains * 1e3:10.2f} ms")
+    print(f"contains, ray casting  {loop_contains * 1e3:10.2f} ms")
+    print(f"union with pads        {union_time * 1e3:10.2f} ms")
+    print(f"intersection with pads {intersection_time * 1e3:10.2f} ms")
+    print(f"pads less zone         {difference_time * 1e3:10.2f} ms")
+    print(f"xor with pads          {xor_time * 1e3:10.2f} ms")
+    print(f"offset by -0.2 mm      {offset_time * 1e3:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Measures moving and rotating a large polygon: the per-node loop over PolyLineNode wrappers of
+kicad-python 0.5, the loop over node messages that PolygonWithHoles.move and rotate now use, and a
+NumPy PointArray both as a round trip through the messages and on points already in an array.
+
+No KiCad instance is needed; run with `python -m tools.bench_polygon_transforms`.
+"""
+
+import argparse
+import timeit
+
+from kipy.geometry import Angle, PointArray, PolygonWithHoles, PolyLine, PolyLineNode, Vector2
+
+def _wrapper_move(polygon: PolygonWithHoles, delta: Vector2):
+    """PolygonWithHoles.move of kicad-python 0.5, for polygons of point nodes"""
+    for node in polygon.outline:
+        node.point += delta
+
+def _wrapper_rotate(polygon: PolygonWithHoles, angle: Angle, center: Vector2):
+    """PolyLine.rotate of kicad-python 0.5, for polygons of point nodes"""
+    for node in polygon.outline.nodes:
+        node.point = node.point.rotate(angle, center)
+
+def _polygon(nodes: int) -> PolygonWithHoles:
+    outline = PolyLine()
+    for i in range(nodes):
+        outline.append(PolyLineNode.from_xy(i * 7919 % 1_000_003, i * 104_729 % 999_983))
+    outline.closed = True
+    polygon = PolygonWithHoles()
+    polygon.outline = outline
+    return polygon
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--nodes", type=int, default=20_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    polygon = _polygon(args.nodes)
+    delta = Vector2.from_xy(1000, -2000)
+    angle = Angle.from_degrees(30)
+    center = Vector2.from_xy(500_000, 500_000)
+    points = PointArray.from_polygon(polygon)
+    read = timeit.timeit(lambda: PointArray.from_polygon(polygon), number=args.repeat)
+
+    cases = {
+        "move, wrappers": lambda: _wrapper_move(polygon, delta),
+        "move, messages": lambda: polygon.move(delta),
+        "move, write back": lambda: points.translate(delta).write_polygon(polygon),
+        "move, array only": lambda: points.translate(delta),
+        "rotate, wrappers": lambda: _wrapper_rotate(polygon, angle, center),
+        "rotate, messages": lambda: polygon.rotate(angle, center),
+        "rotate, write back": lambda: points.rotate(angle, center).write_polygon(polygon),
+        "rotate, array only": lambda: points.rotate(angle, center),
+    }
+
+    print(f"{args.nodes} nodes; reading a PointArray takes {read / args.repeat * 1e3:.2f} ms")
+    for name, case in cases.items():
+        seconds = timeit.timeit(case, number=args.repeat) / args.repeat
+        print(f"{name:<20} {seconds * 1e3:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Measures the cached flattening of arcs and Bezier curves in kipy.geometry: flattening and
+bounding the same arcs repeatedly, as hit tests, polygon conversions and redraws do, against the
+same calculation without the cache.
+
+No KiCad instance is needed; run with `python -m tools.bench_tessellation`.
+"""
+
+import argparse
+import math
+import random
+import time
+
+from kipy.geometry import DEFAULT_MAX_ERROR, _arc_bounds, _arc_points, _bezier_points
+
+def _arcs(count: int, rng: random.Random) -> list:
+    """Arcs of rounded pad corners and track bends: radii of 0.1 to 2 mm, sweeps up to 180°"""
+    arcs = []
+    for _ in range(count):
+        cx = rng.randrange(0, 100_000_000)
+        cy = rng.randrange(0, 100_000_000)
+        radius = rng.randrange(100_000, 2_000_000)
+        start = rng.uniform(0, 2 * math.pi)
+        sweep = rng.uniform(0.1, math.pi)
+        arcs.append(tuple(
+            round(c + radius * f(start + sweep * k / 2))
+            for k in range(3) for c, f in ((cx, math.cos), (cy, math.sin))))
+    return arcs
+
+def _timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--arcs", type=int, default=5000)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    arcs = _arcs(args.arcs, rng)
+    curves = [arc + (arc[4] + 1_000_000, arc[5]) for arc in arcs]
+
+    uncached_points = _arc_points.__wrapped__
+    uncached_curve = _bezier_points.__wrapped__
+    uncached_bounds = _arc_bounds.__wrapped__
+
+    results = []
+    for name, cached, uncached, items in (
+            ("arc points", _arc_points, uncached_points, arcs),
+            ("bezier points", _bezier_points, uncached_curve, curves),
+            ("arc bounds", _arc_bounds, uncached_bounds, arcs)):
+        extra = (DEFAULT_MAX_ERROR,) if cached is not _arc_bounds else ()
+        cached.cache_clear()
+        for item in items:
+            assert cached(*item, *extra) == uncached(*item, *extra)
+        with_cache = _timed(
+            lambda cached=cached, items=items, extra=extra: [
+                cached(*item, *extra) for item in items
+            ],
+            args.repeat,
+        )
+        without = _timed(
+            lambda uncached=uncached, items=items, extra=extra: [
+                uncached(*item, *extra) for item in items
+            ],
+            args.repeat,
+        )
+        results.append((name, with_cache, without))
+
+    print(f"{args.arcs} arcs and curves, each flattened {args.repeat} times")
+    for name, with_cache, without in results:
+        print(f"{name + ', cached':24}{with_cache * 1e3:10.2f} ms")
+        print(f"{name + ', uncached':24}{without * 1e3:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Measures Vector2 arithmetic, hashing, rotation and conversion to and from protobuf messages,
+alongside a copy of the protobuf-backed Vector2 of kicad-python 0.5 for comparison.
+
+No KiCad instance is needed; run with `python -m tools.bench_vector2`.
+"""
+
+import argparse
+import math
+import timeit
+from typing import Callable, Dict
+
+from kipy.geometry import Angle, Vector2
+from kipy.proto.common import types
+
+class ProtoVector2:
+    """The protobuf-backed Vector2 of kicad-python 0.5"""
+    def __init__(self, proto=None):
+        self._proto = types.Vector2()
+
+        if proto is not None:
+            self._proto.CopyFrom(proto)
+
+    @classmethod
+    def from_xy(cls, x_nm: int, y_nm: int) -> "ProtoVector2":
+        proto = types.Vector2()
+        proto.x_nm = x_nm
+        proto.y_nm = y_nm
+        return cls(proto)
+
+    @property
+    def proto(self):
+        return self._proto
+
+    @property
+    def x(self) -> int:
+        return self._proto.x_nm
+
+    @x.setter
+    def x(self, val: int):
+        self._proto.x_nm = val
+
+    @property
+    def y(self) -> int:
+        return self._proto.y_nm
+
+    @y.setter
+    def y(self, val: int):
+        self._proto.y_nm = val
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __eq__(self, other):
+        return self.x == other.x and self.y == other.y
+
+    def __add__(self, other):
+        r = ProtoVector2(self._proto)
+        r.x += other.x
+        r.y += other.y
+        return r
+
+    def __sub__(self, other):
+        r = ProtoVector2(self._proto)
+        r.x -= other.x
+        r.y -= other.y
+        return r
+
+    def __neg__(self):
+        r = ProtoVector2(self._proto)
+        r.x = -r.x
+        r.y = -r.y
+        return r
+
+    def __mul__(self, scalar: float):
+        r = ProtoVector2(self._proto)
+        r.x = int(float(r.x) * scalar)
+        r.y = int(float(r.y) * scalar)
+        return r
+
+    def length(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y)
+
+    def rotate(self, angle: Angle, center):
+        pt_x = self.x - center.x
+        pt_y = self.y - center.y
+        rotation = angle.to_radians() % (2 * math.pi)
+        sin_angle = math.sin(rotation)
+        cos_angle = math.cos(rotation)
+        self.x = int(pt_y * sin_angle + pt_x * cos_angle) + center.x
+        self.y = int(pt_y * cos_angle - pt_x * sin_angle) + center.y
+        return self
+
+def _cases(cls) -> Dict[str, Callable[[], object]]:
+    a = cls.from_xy(1_000_000, -2_500_000)
+    b = cls.from_xy(-300_000, 750_000)
+    center = cls.from_xy(10_000, 20_000)
+    angle = Angle.from_degrees(30)
+    proto = a.proto
+
+    return {
+        "from_xy": lambda: cls.from_xy(1_000_000, -2_500_000),
+        "from proto": lambda: cls(proto),
+        "to proto": lambda: a.proto,
+        "a + b": lambda: a + b,
+        "a - b": lambda: a - b,
+        "-a": lambda: -a,
+        "a * 0.5": lambda: a * 0.5,
+        "a.length()": lambda: a.length(),
+        "a == b": lambda: a == b,
+        "hash(a)": lambda: hash(a),
+        "a.rotate()": lambda: a.rotate(angle, center),
+        "set of 100 points": lambda: {cls.from_xy(i, i) for i in range(100)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    new_cases = _cases(Vector2)
+    old_cases = _cases(ProtoVector2)
+
+    print(f"{'operation':<20} {'Vector2':>12} {'protobuf':>12} {'speedup':>8}")
+    for name in new_cases:
+        calls = args.calls // 100 if name.startswith("set") else args.calls
+        new = timeit.timeit(new_cases[name], number=calls) / calls * 1e9
+        old = timeit.timeit(old_cases[name], number=calls) / calls * 1e9
+        print(f"{name:<20} {new:9.0f} ns {old:9.0f} ns {old / new:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Copyright The KiCad Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the “Software”), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Compares the bounding boxes calculated locally by the board item types with the bounding boxes
+KiCad calculates, for a random sample of the items of each type on the open board.
+
+Needs a running KiCad with a board open; run with `python -m tools.check_bounding_boxes`.
+"""
+
+import argparse
+import random
+from typing import List, Optional, Sequence, Union
+
+from kipy import KiCad
+from kipy.board import Board
+from kipy.board_types import ArcTrack, BoardShape, FootprintInstance, Pad, Track, Via
+from kipy.geometry import Box2
+
+_BoundedItem = Union[Track, ArcTrack, Via, Pad, BoardShape, FootprintInstance]
+
+def _deviation(local: Box2, remote: Box2) -> int:
+    """The largest distance between corresponding edges of the two boxes"""
+    return max(
+        abs(local.pos.x - remote.pos.x),
+        abs(local.pos.y - remote.pos.y),
+        abs(local.pos.x + local.size.x - remote.pos.x - remote.size.x),
+        abs(local.pos.y + local.size.y - remote.pos.y - remote.size.y),
+    )
+
+def check(board: Board, label: str, items: Sequence[_BoundedItem], sample: int,
+          tolerance: int) -> bool:
+    items = random.sample(list(items), min(sample, len(items)))
+
+    if not items:
+        print(f"{label:<12} no items")
+        return True
+
+    remote: List[Optional[Box2]] = board.get_item_bounding_box(items)
+    worst = 0
+    failures = 0
+
+    for item, remote_box in zip(items, remote):
+        if remote_box is None:
+            continue
+
+        local_box = item.bounding_box()
+        deviation = _deviation(local_box, remote_box)
+        worst = max(worst, deviation)
+
+        if deviation > tolerance:
+            failures += 1
+            print(f"  {item}: local {local_box}, KiCad {remote_box}")
+
+    print(f"{label:<12} {len(items):6d} items, worst deviation {worst:8d} nm, "
+          f"{failures} over tolerance")
+    return failures == 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--sample", type=int, default=200,
+                        help="the number of items of each type to check")
+    parser.add_argument("-t", "--tolerance", type=int, default=1000,
+                        help="the largest acceptable deviation, in nanometers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    board = KiCad().get_board()
+
+    groups = [
+        ("tracks", board.get_tracks()),
+        ("vias", board.get_vias()),
+        ("pads", board.get_pads()),
+        ("shapes", board.get_shapes()),
+        ("footprints", board.get_footprints()),
+    ]
+
+    results = [check(board, label, items, args.sample, args.tolerance)
+               for label, items in groups]
+    raise SystemExit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()